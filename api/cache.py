@@ -0,0 +1,53 @@
+import hashlib
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from core import metrics, versioning
+
+
+class ResponseCache:
+    """
+    Cache of rendered responses scoped to a data version.
+
+    Keys combine a versioning scope, the scope's current generation and a
+    digest of the validated query parameters, so equivalent requests share an
+    entry and any data change in the scope makes its entries unreachable.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def scoped_key(self, scope: str, params: dict) -> str:
+        normalized = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha256(normalized.encode()).hexdigest()
+        generation = versioning.generation(scope)
+        return f'response:{self.namespace}:{scope}:{generation}:{digest}'
+
+    def get(self, key: str):
+        """Return the cached entry for ``key`` or None, recording hit metrics."""
+        started = time.perf_counter()
+        entry = cache.get(key)
+        if entry is None:
+            metrics.increment('response_cache_misses_total')
+            return None
+
+        lookup_ms = (time.perf_counter() - started) * 1000
+        metrics.increment('response_cache_hits_total')
+        metrics.increment('response_cache_saved_milliseconds_total', max(round(entry['cost_ms'] - lookup_ms), 0))
+        return entry
+
+    def set(self, key: str, cost_ms: float, **entry):
+        """Store ``entry`` along with what it cost to compute."""
+        cache.set(key, {**entry, 'cost_ms': cost_ms}, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+
+class ClientResponseCache(ResponseCache):
+    """Response cache scoped to one client's transaction data."""
+
+    def key(self, client_id, params: dict) -> str:
+        return self.scoped_key(versioning.client_scope(client_id), params)
+
+
+transaction_response_cache = ClientResponseCache('client-transactions')
+statistics_response_cache = ResponseCache('statistics')
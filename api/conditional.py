@@ -0,0 +1,24 @@
+import hashlib
+import json
+import uuid
+from core import versioning
+from core.models import Client
+
+
+def _etag(version: str, request) -> str:
+    params = sorted(request.GET.lists())
+    return hashlib.sha256(json.dumps([version, params]).encode()).hexdigest()[:32]
+
+
+def client_transactions_etag(request, client_id):
+    """ETag of a client's transaction listing, from the client's data version and the query params."""
+    try:
+        uuid.UUID(client_id)
+    except ValueError:
+        return None
+    return _etag(versioning.data_version(versioning.client_scope(client_id)), request)
+
+
+def clients_etag(request):
+    """ETag of the client listing, from the client table's data version and the query params."""
+    return _etag(versioning.data_version(versioning.table_scope(Client._meta.db_table)), request)
@@ -1,5 +1,8 @@
 class APIErrorMessages:
     INVALID_CLIENT_ID = 'Invalid client_id'
+    TRANSACTION_NOT_FOUND = 'Transaction not found'
+    STATISTICS_NOT_FOUND = 'No statistics for this client'
+    CLIENT_NOT_FOUND = 'Client not found'
     USER_NOT_FOUND = 'User does not exist'
     INVALID_CREDENTIALS = 'Invalid username or password.'
     INTERNAL_SERVER_ERROR = 'Internal Server Error'
@@ -8,4 +11,10 @@ class APIErrorMessages:
     PASSWORD_TOO_SHORT = 'Password must be at least 8 characters long.'
     INVALID_DATE_FORMAT = 'Invalid date format. Please use YYYY-MM-DD.'
     START_DATE_BEFORE_END_DATE = 'start_date must be before end_date.'
-    INVALID_QUERY_PARAMS = 'Invalid query parameters'
\ No newline at end of file
+    START_BEFORE_END = 'start must be before end.'
+    AT_OR_RANGE = 'Use either at or start/end, not both.'
+    COUNTRY_OR_GROUP_BY = 'Use either country or group_by, not both.'
+    INVALID_QUERY_PARAMS = 'Invalid query parameters'
+    INVALID_CURSOR = 'Invalid pagination cursor'
+    BATCH_TOO_LARGE = 'Too many transactions for a JSON response; use format=ndjson or fewer client_ids.'
+    SEARCH_NOT_PAGINATED = 'Search results cannot be paginated with a cursor.'
\ No newline at end of file
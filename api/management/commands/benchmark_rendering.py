@@ -0,0 +1,79 @@
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from api.serializers import ClientSerializer, FastRenderer, TransactionResponseSerializer
+from core.models import Client, Transaction
+
+
+class Command(BaseCommand):
+    help = 'Compare rows/s of serializer rendering and the FastRenderer path for listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows rendered per run')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the best run is reported')
+
+    def build_transactions(self, rows):
+        now = timezone.now()
+        client_id = str(uuid.uuid4())
+        return [
+            Transaction(
+                transaction_id=str(uuid.uuid4()),
+                client_id=client_id,
+                transaction_type='SELL' if i % 2 else 'BUY',
+                transaction_date=now - timedelta(minutes=i),
+                amount=Decimal(i % 5000) / 7,
+                currency='USD',
+                created_at=now,
+            )
+            for i in range(rows)
+        ]
+
+    def build_clients(self, rows):
+        now = timezone.now()
+        return [
+            Client(
+                client_id=str(uuid.uuid4()),
+                name=f'Client {i}',
+                email=f'client{i}@example.com',
+                date_of_birth=date(1980, 1, 1) + timedelta(days=i % 10000),
+                country='Testland',
+                account_balance=Decimal(i) / 3,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(rows)
+        ]
+
+    def best_of(self, repeat, render):
+        best, content = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, content
+
+    def benchmark(self, label, serializer_class, instances, repeat):
+        renderer = FastRenderer(serializer_class)
+        rows = [tuple(getattr(instance, column) for column in renderer.columns) for instance in instances]
+
+        serializer_time, expected = self.best_of(
+            repeat, lambda: JSONRenderer().render(serializer_class(instances, many=True).data)
+        )
+        fast_time, content = self.best_of(repeat, lambda: renderer.render(rows))
+        if content != expected:
+            raise CommandError(f'{label}: fast path output differs from serializer output')
+
+        self.stdout.write(
+            f'{label}: serializer {len(rows) / serializer_time:,.0f} rows/s, '
+            f'fast {len(rows) / fast_time:,.0f} rows/s ({serializer_time / fast_time:.1f}x)'
+        )
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        self.benchmark('transactions', TransactionResponseSerializer, self.build_transactions(rows), repeat)
+        self.benchmark('clients', ClientSerializer, self.build_clients(rows), repeat)
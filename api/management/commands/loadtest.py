@@ -0,0 +1,234 @@
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from urllib.parse import urlsplit
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from api.services.auth_service import AuthService
+from core.models import Client, Transaction
+
+DEFAULT_MIX = 'clients=4,client-transactions=4,client-statistics=1,client-balance=1,statistics=1,transaction-detail=2'
+
+
+class HTTPConnection:
+    """
+    Minimal keep-alive HTTP/1.1 client over asyncio streams.
+
+    Enough for driving this API (GET, ``Content-Length`` or chunked bodies)
+    without a third-party dependency; the body is read and discarded.
+    """
+
+    def __init__(self, host: str, port: int, use_ssl: bool):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def get(self, path: str, headers: dict):
+        """Return ``(status, body size)`` of ``GET path``."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.use_ssl or None)
+
+        lines = [f'GET {path} HTTP/1.1', f'Host: {self.host}:{self.port}', 'Connection: keep-alive']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by server')
+        status = int(status_line.split()[1])
+
+        response_headers = {}
+        while (line := await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            size = 0
+            while chunk_size := int((await self.reader.readline()).split(b';')[0], 16):
+                await self.reader.readexactly(chunk_size + 2)
+                size += chunk_size
+            await self.reader.readline()
+        elif 'content-length' in response_headers:
+            size = int(response_headers['content-length'])
+            await self.reader.readexactly(size)
+        else:
+            size = len(await self.reader.read())
+            await self.close()
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, size
+
+
+def summarize(samples, elapsed: float) -> dict:
+    """Throughput, latency percentiles and error/throttle rates of ``(status, latency ms)`` samples."""
+    count = len(samples)
+    latencies = sorted(latency for _, latency in samples)
+    statuses = {}
+    for status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    throttled = statuses.get('429', 0)
+    errors = sum(n for status, n in statuses.items() if status == 'error' or int(status) >= 400) - throttled
+
+    summary = {
+        'requests': count,
+        'throughput_rps': round(count / elapsed, 2) if elapsed else 0,
+        'error_rate': round(errors / count, 4) if count else 0,
+        'throttle_rate': round(throttled / count, 4) if count else 0,
+        'status_codes': statuses,
+    }
+    if count >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        summary['latency_ms'] = {
+            'p50': round(cuts[49], 2),
+            'p90': round(cuts[89], 2),
+            'p95': round(cuts[94], 2),
+            'p99': round(cuts[98], 2),
+            'max': round(latencies[-1], 2),
+        }
+    return summary
+
+
+class Command(BaseCommand):
+    help = 'Drive the HTTP API with concurrent requests and report throughput, latency and error rates as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', type=str, default='http://localhost:8000', help='Root URL of the API node')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at any time')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run for')
+        parser.add_argument('--users', type=int, default=10, help='Users registered (one token each) to spread '
+                                                                  'requests over; each has its own rate limit')
+        parser.add_argument('--mix', type=str, default=DEFAULT_MIX,
+                            help='Comma-separated url_name=weight pairs chosen from: '
+                                 'clients, client-transactions, client-statistics, client-balance, '
+                                 'statistics, statistics-top, transaction-detail')
+        parser.add_argument('--timeout', type=float, default=10,
+                            help='Seconds a request may take (connecting included) before it counts as an error')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for a repeatable request sequence')
+        parser.add_argument('--output', type=str, help='Write the JSON report to this file instead of stdout')
+
+    def parse_mix(self, mix: str) -> dict:
+        weights = {}
+        for part in mix.split(','):
+            name, _, weight = part.partition('=')
+            if name.strip() not in self.paths:
+                raise CommandError(f"Unknown endpoint '{name.strip()}' in --mix")
+            weights[name.strip()] = float(weight or 1)
+        return weights
+
+    @property
+    def paths(self) -> dict:
+        """url_name -> function returning a request path for a random record."""
+        client_ids, transaction_ids = self.client_ids, self.transaction_ids
+        return {
+            'clients': lambda: f"{reverse('clients')}?limit={random.choice([10, 50, 100])}",
+            'client-transactions': lambda: reverse('client-transactions', args=[random.choice(client_ids)]),
+            'client-statistics': lambda: reverse('client-statistics', args=[random.choice(client_ids)]),
+            'client-balance': lambda: reverse('client-balance', args=[random.choice(client_ids)]),
+            'statistics': lambda: reverse('statistics'),
+            'statistics-top': lambda: f"{reverse('statistics-top')}?metric=total_spent&limit=10",
+            'transaction-detail': lambda: reverse('transaction-detail', args=[random.choice(transaction_ids)]),
+        }
+
+    def provision_tokens(self, run: str, count: int) -> list:
+        tokens = []
+        for i in range(count):
+            response = AuthService.register({'username': f'loadtest_{run}_{i}', 'password': uuid.uuid4().hex})
+            if response.status_code != 201:
+                raise CommandError(f'Could not register load test user: {response.data}')
+            tokens.append(response.data['token'])
+        return tokens
+
+    async def worker(self, url, deadline, weights, tokens, samples, timeout):
+        connection = HTTPConnection(url.hostname, url.port or (443 if url.scheme == 'https' else 80),
+                                    url.scheme == 'https')
+        names, name_weights = list(weights), list(weights.values())
+        paths = self.paths
+        try:
+            while time.perf_counter() < deadline:
+                name = random.choices(names, name_weights)[0]
+                headers = {'Authorization': f'Token {random.choice(tokens)}'}
+                started = time.perf_counter()
+                try:
+                    status, _ = await asyncio.wait_for(
+                        connection.get(url.path.rstrip('/') + paths[name](), headers), timeout
+                    )
+                except (asyncio.TimeoutError, OSError, ConnectionError, asyncio.IncompleteReadError, ValueError,
+                        IndexError):
+                    # The stream may be mid-response, so the next request needs a fresh connection.
+                    status = 'error'
+                    await connection.close()
+                samples.setdefault(name, []).append((status, (time.perf_counter() - started) * 1000))
+        finally:
+            await connection.close()
+
+    async def run(self, url, duration, concurrency, weights, tokens, timeout):
+        samples = {}
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            self.worker(url, deadline, weights, tokens, samples, timeout) for _ in range(concurrency)
+        ))
+        return samples, time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['base_url'])
+        if url.scheme not in ('http', 'https') or not url.hostname:
+            raise CommandError('--base-url must be an http(s) URL')
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+
+        self.client_ids = list(Client.objects.order_by('?').values_list('client_id', flat=True)[:1000])
+        self.transaction_ids = list(
+            Transaction.objects.order_by('-transaction_date').values_list('transaction_id', flat=True)[:1000]
+        )
+        if not self.client_ids or not self.transaction_ids:
+            raise CommandError('Load the sample data first: the request mix needs clients and transactions')
+        weights = self.parse_mix(options['mix'])
+        run = uuid.uuid4().hex[:8]
+        try:
+            tokens = self.provision_tokens(run, options['users'])
+            samples, elapsed = asyncio.run(
+                self.run(url, options['duration'], options['concurrency'], weights, tokens, options['timeout'])
+            )
+        finally:
+            # Their tokens go with them.
+            get_user_model().objects.filter(username__startswith=f'loadtest_{run}_').delete()
+
+        report = {
+            'base_url': options['base_url'],
+            'concurrency': options['concurrency'],
+            'users': options['users'],
+            'timeout_seconds': options['timeout'],
+            'mix': weights,
+            'duration_seconds': round(elapsed, 2),
+            **summarize([sample for name_samples in samples.values() for sample in name_samples], elapsed),
+            'endpoints': {name: summarize(name_samples, elapsed) for name, name_samples in sorted(samples.items())},
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(
+                f"{report['requests']} requests, {report['throughput_rps']} req/s, "
+                f"error rate {report['error_rate']:.2%}, throttle rate {report['throttle_rate']:.2%} "
+                f"-> {options['output']}"
+            ))
+        else:
+            self.stdout.write(output)
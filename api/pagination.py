@@ -0,0 +1,30 @@
+import base64
+import json
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    payload = json.dumps(values, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor produced by ``encode_cursor``; raises ValueError if malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError('Malformed cursor') from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Malformed cursor')
+    return values
+
+
+def next_link_header(url: str, cursor: str) -> dict:
+    """Build the ``Link`` header pointing at the page after ``cursor``."""
+    return {'Link': f'<{replace_query_param(url, "cursor", cursor)}>; rel="next"'}
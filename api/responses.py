@@ -0,0 +1,33 @@
+import json
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class RenderedJSONResponse(Response):
+    """
+    DRF response around a body that is already rendered JSON.
+
+    Used with ``FastRenderer`` so listings skip serializer and renderer work.
+    ``data`` is decoded lazily for callers (and tests) that still inspect it.
+    """
+
+    def __init__(self, content: bytes, status=None, headers=None):
+        super().__init__(None, status=status, headers=headers, content_type='application/json')
+        self._rendered = content
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = json.loads(self._rendered)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        if not isinstance(getattr(self, 'accepted_renderer', None), JSONRenderer):
+            return super().rendered_content
+        self['Content-Type'] = self.content_type
+        return self._rendered
@@ -1,7 +1,8 @@
 from .user import UserSerializer
 from .transaction import (
     TransactionResponseSerializer,
-    TransactionQuerySerializer
+    TransactionQuerySerializer,
+    TransactionBatchQuerySerializer
 )
 from .response import (
     TokenResponseSerializer,
@@ -11,13 +12,46 @@ from .client import (
     ClientQuerySerializer,
     ClientSerializer
 )
+from .statistics import (
+    TransactionStatisticsSerializer,
+    StatisticsQuerySerializer,
+    LeaderboardQuerySerializer,
+    LeaderboardEntrySerializer
+)
+from .activity import (
+    ActivityQuerySerializer,
+    ActivitySerializer
+)
+from .analytics import (
+    AnalyticsQuerySerializer,
+    AnalyticsSerializer
+)
+from .balance import (
+    BalanceQuerySerializer,
+    BalanceSerializer,
+    BalanceHistorySerializer
+)
+from .fast import FastRenderer
 
 __all__ = [
     'UserSerializer',
     'TransactionResponseSerializer',
     'TransactionQuerySerializer',
+    'TransactionBatchQuerySerializer',
     'TokenResponseSerializer',
     'ErrorResponseSerializer',
     'ClientQuerySerializer',
     'ClientSerializer',
+    'TransactionStatisticsSerializer',
+    'StatisticsQuerySerializer',
+    'LeaderboardQuerySerializer',
+    'LeaderboardEntrySerializer',
+    'ActivityQuerySerializer',
+    'ActivitySerializer',
+    'AnalyticsQuerySerializer',
+    'AnalyticsSerializer',
+    'BalanceQuerySerializer',
+    'BalanceSerializer',
+    'BalanceHistorySerializer',
+    'FastRenderer',
 ]
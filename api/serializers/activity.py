@@ -0,0 +1,58 @@
+import uuid
+from rest_framework import serializers
+from api.errors import APIErrorMessages
+
+class ActivityQuerySerializer(serializers.Serializer):
+    bucket = serializers.ChoiceField(
+        choices=['day', 'month'],
+        required=False,
+        default='day',
+        help_text="Bucket size of the returned totals"
+    )
+    client_id = serializers.CharField(
+        required=False,
+        help_text="Restrict the totals to one client"
+    )
+    currency = serializers.CharField(
+        required=False,
+        max_length=3,
+        help_text="Restrict the totals to one currency"
+    )
+    start = serializers.DateTimeField(
+        required=False,
+        help_text="Inclusive lower bound of transaction_date (date or ISO datetime, UTC by default)"
+    )
+    end = serializers.DateTimeField(
+        required=False,
+        help_text="Exclusive upper bound of transaction_date (date or ISO datetime, UTC by default)"
+    )
+
+    def validate_client_id(self, value):
+        try:
+            uuid.UUID(value)
+        except ValueError:
+            raise serializers.ValidationError(APIErrorMessages.INVALID_CLIENT_ID)
+        return value
+
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError(APIErrorMessages.START_BEFORE_END)
+        return attrs
+
+class ActivitySerializer(serializers.Serializer):
+    period = serializers.DateField(help_text="First day of the bucket")
+    currency = serializers.CharField()
+    transaction_type = serializers.CharField()
+    transaction_count = serializers.IntegerField()
+    total_amount = serializers.DecimalField(max_digits=25, decimal_places=2)
+
+    class Meta:
+        swagger_schema_fields = {
+            "example": {
+                "period": "2024-01-01",
+                "currency": "USD",
+                "transaction_type": "BUY",
+                "transaction_count": 12,
+                "total_amount": "1250.50"
+            }
+        }
@@ -0,0 +1,59 @@
+import uuid
+from rest_framework import serializers
+from api.errors import APIErrorMessages
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    client_id = serializers.CharField(
+        required=False,
+        help_text="Restrict the metrics to one client"
+    )
+    start = serializers.DateField(
+        required=False,
+        help_text="First month to include (any date in the month)"
+    )
+    end = serializers.DateField(
+        required=False,
+        help_text="Last month to include (any date in the month)"
+    )
+
+    def validate_client_id(self, value):
+        try:
+            uuid.UUID(value)
+        except ValueError:
+            raise serializers.ValidationError(APIErrorMessages.INVALID_CLIENT_ID)
+        return value
+
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] > attrs['end']:
+            raise serializers.ValidationError(APIErrorMessages.START_BEFORE_END)
+        return attrs
+
+class AnalyticsSerializer(serializers.Serializer):
+    client_id = serializers.CharField(allow_null=True)
+    start_month = serializers.DateField(allow_null=True)
+    end_month = serializers.DateField(allow_null=True)
+    transaction_count = serializers.IntegerField(help_text="Exact")
+    amount_percentiles = serializers.DictField(
+        child=serializers.FloatField(allow_null=True),
+        help_text="p50/p95/p99 of absolute amounts (KLL sketch)"
+    )
+    distinct_currencies = serializers.IntegerField(help_text="HyperLogLog estimate")
+    distinct_clients = serializers.IntegerField(
+        allow_null=True,
+        help_text="HyperLogLog estimate, only without client_id"
+    )
+    error_bounds = serializers.DictField(help_text="Documented error of the estimates")
+
+    class Meta:
+        swagger_schema_fields = {
+            "example": {
+                "client_id": None,
+                "start_month": "2024-01-01",
+                "end_month": "2024-06-01",
+                "transaction_count": 125000,
+                "amount_percentiles": {"p50": 120.5, "p95": 2300.0, "p99": 8100.25},
+                "distinct_currencies": 12,
+                "distinct_clients": 4980,
+                "error_bounds": {"amount_percentiles_rank_error": 0.0165, "distinct_count_relative_error": 0.01625}
+            }
+        }
@@ -0,0 +1,92 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from api.errors import APIErrorMessages
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
+
+class BalanceQuerySerializer(serializers.Serializer):
+    at = serializers.DateTimeField(
+        required=False,
+        help_text="Return the balance at this time (inclusive, defaults to now)"
+    )
+    start = serializers.DateTimeField(
+        required=False,
+        help_text="Inclusive lower bound of the balance history"
+    )
+    end = serializers.DateTimeField(
+        required=False,
+        help_text="Exclusive upper bound of the balance history"
+    )
+    page_size = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_PAGE_SIZE,
+        default=DEFAULT_PAGE_SIZE,
+        help_text="Number of ledger entries per page"
+    )
+    cursor = serializers.CharField(
+        required=False,
+        help_text="Opaque cursor from the next link of the previous page"
+    )
+
+    def validate(self, attrs):
+        if 'at' in attrs and ('start' in attrs or 'end' in attrs):
+            raise serializers.ValidationError(APIErrorMessages.AT_OR_RANGE)
+        if attrs.get('start') and attrs.get('end') and attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError(APIErrorMessages.START_BEFORE_END)
+        if 'cursor' in attrs:
+            try:
+                transaction_date, transaction_id = decode_cursor(attrs['cursor'], 2)
+                transaction_date = parse_datetime(transaction_date)
+                if transaction_date is None:
+                    raise ValueError('Malformed cursor')
+                attrs['cursor'] = (transaction_date, str(transaction_id))
+            except (TypeError, ValueError):
+                raise serializers.ValidationError({'cursor': [APIErrorMessages.INVALID_CURSOR]})
+        return attrs
+
+class BalanceEntrySerializer(serializers.Serializer):
+    transaction_id = serializers.CharField()
+    transaction_date = serializers.DateTimeField()
+    amount = serializers.DecimalField(max_digits=15, decimal_places=2)
+    balance = serializers.DecimalField(max_digits=25, decimal_places=2)
+
+class BalanceSerializer(serializers.Serializer):
+    client_id = serializers.CharField()
+    at = serializers.DateTimeField()
+    balance = serializers.DecimalField(max_digits=25, decimal_places=2)
+
+    class Meta:
+        swagger_schema_fields = {
+            "example": {
+                "client_id": "98765432-e89b-12d3-a456-426614174000",
+                "at": "2024-06-30T23:59:59Z",
+                "balance": "10250.50"
+            }
+        }
+
+class BalanceHistorySerializer(serializers.Serializer):
+    client_id = serializers.CharField()
+    start = serializers.DateTimeField(allow_null=True)
+    end = serializers.DateTimeField(allow_null=True)
+    opening_balance = serializers.DecimalField(max_digits=25, decimal_places=2, help_text="Balance just before start")
+    closing_balance = serializers.DecimalField(max_digits=25, decimal_places=2, help_text="Balance just before end, or after the last entry without end")
+    results = BalanceEntrySerializer(many=True)
+
+    class Meta:
+        swagger_schema_fields = {
+            "example": {
+                "client_id": "98765432-e89b-12d3-a456-426614174000",
+                "start": "2024-01-01T00:00:00Z",
+                "end": "2024-02-01T00:00:00Z",
+                "opening_balance": "1000.00",
+                "closing_balance": "760.00",
+                "results": [
+                    {
+                        "transaction_id": "123e4567-e89b-12d3-a456-426614174000",
+                        "transaction_date": "2024-01-15T10:30:00Z",
+                        "amount": "240.00",
+                        "balance": "760.00"
+                    }
+                ]
+            }
+        }
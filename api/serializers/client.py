@@ -1,5 +1,7 @@
 from core.models.client import Client
 from rest_framework import serializers
+from api.errors import APIErrorMessages
+from api.pagination import decode_cursor
 
 class ClientQuerySerializer(serializers.Serializer):
     name = serializers.CharField(required=False)
@@ -10,6 +12,21 @@ class ClientQuerySerializer(serializers.Serializer):
     created_after = serializers.DateTimeField(required=False)
     created_before = serializers.DateTimeField(required=False)
     limit = serializers.IntegerField(max_value=999, required=False)
+    search = serializers.CharField(required=False)
+    cursor = serializers.CharField(required=False)
+
+    def validate_cursor(self, value):
+        try:
+            client_id, = decode_cursor(value, 1)
+            return str(client_id)
+        except ValueError:
+            raise serializers.ValidationError(APIErrorMessages.INVALID_CURSOR)
+
+    def validate(self, attrs):
+        # Search results are ordered by rank, which the client_id cursor can't resume.
+        if attrs.get('search') and attrs.get('cursor'):
+            raise serializers.ValidationError(APIErrorMessages.SEARCH_NOT_PAGINATED)
+        return attrs
 
 class ClientSerializer(serializers.ModelSerializer):
     class Meta:
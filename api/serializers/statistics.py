@@ -0,0 +1,102 @@
+from decimal import Decimal, InvalidOperation
+from rest_framework import serializers
+from api.errors import APIErrorMessages
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
+from core.models import TransactionStatistics
+
+STATISTICS_SORTS = ['client_id', 'total_spent', '-total_spent', 'total_gained', '-total_gained']
+LEADERBOARD_METRICS = ['total_spent', 'total_gained']
+MAX_LEADERBOARD_SIZE = 100
+
+class TransactionStatisticsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TransactionStatistics
+        fields = ['client_id', 'total_transactions', 'total_spent', 'total_gained']
+        swagger_schema_fields = {
+            "example": {
+                "client_id": "98765432-e89b-12d3-a456-426614174000",
+                "total_transactions": 42,
+                "total_spent": "15250.50",
+                "total_gained": "3120.00"
+            }
+        }
+
+class StatisticsQuerySerializer(serializers.Serializer):
+    sort = serializers.ChoiceField(
+        choices=STATISTICS_SORTS,
+        required=False,
+        default='client_id',
+        help_text="Sort key; prefix with '-' for descending"
+    )
+    page_size = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_PAGE_SIZE,
+        default=DEFAULT_PAGE_SIZE,
+        help_text="Number of clients per page"
+    )
+    cursor = serializers.CharField(
+        required=False,
+        help_text="Opaque cursor from the next link of the previous page"
+    )
+
+    def validate(self, attrs):
+        # The cursor holds the sort value of the last row, so it is only
+        # meaningful together with the sort it was issued for.
+        if 'cursor' in attrs:
+            try:
+                sort, value, client_id = decode_cursor(attrs['cursor'], 3)
+                if sort != attrs['sort']:
+                    raise ValueError('Cursor issued for another sort')
+                if sort != 'client_id':
+                    value = Decimal(value)
+                attrs['cursor'] = (value, str(client_id))
+            except (TypeError, ValueError, InvalidOperation):
+                raise serializers.ValidationError({'cursor': [APIErrorMessages.INVALID_CURSOR]})
+        return attrs
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    metric = serializers.ChoiceField(
+        choices=LEADERBOARD_METRICS,
+        required=False,
+        default='total_spent',
+        help_text="Total to rank clients by, highest first"
+    )
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_LEADERBOARD_SIZE,
+        default=10,
+        help_text="Number of clients per group"
+    )
+    country = serializers.CharField(
+        required=False,
+        help_text="Only rank clients of this country"
+    )
+    group_by = serializers.ChoiceField(
+        choices=['country'],
+        required=False,
+        help_text="Return the top clients of every country"
+    )
+
+    def validate(self, attrs):
+        if 'country' in attrs and 'group_by' in attrs:
+            raise serializers.ValidationError(APIErrorMessages.COUNTRY_OR_GROUP_BY)
+        return attrs
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    rank = serializers.IntegerField(help_text="1-based position within the group")
+
+    class Meta:
+        model = TransactionStatistics
+        fields = ['rank', 'client_id', 'country', 'total_transactions', 'total_spent', 'total_gained']
+        swagger_schema_fields = {
+            "example": {
+                "rank": 1,
+                "client_id": "98765432-e89b-12d3-a456-426614174000",
+                "country": "USA",
+                "total_transactions": 42,
+                "total_spent": "15250.50",
+                "total_gained": "3120.00"
+            }
+        }
@@ -1,6 +1,12 @@
+import uuid
+from datetime import datetime
 from rest_framework import serializers
+from api.errors import APIErrorMessages
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
 from core.models.transaction import Transaction
 
+MAX_BATCH_CLIENTS = 5000
+
 class TransactionResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
@@ -34,6 +40,29 @@ class TransactionQuerySerializer(serializers.Serializer):
         required=False,
         help_text="End date for filtering transactions"
     )
+    page_size = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_PAGE_SIZE,
+        default=DEFAULT_PAGE_SIZE,
+        help_text="Number of transactions per page"
+    )
+    cursor = serializers.CharField(
+        required=False,
+        help_text="Opaque cursor from the next link of the previous page"
+    )
+    stream = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Stream every matching transaction as one JSON array instead of paginating"
+    )
+
+    def validate_cursor(self, value):
+        try:
+            transaction_date, transaction_id = decode_cursor(value, 2)
+            return datetime.fromisoformat(transaction_date), str(transaction_id)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError(APIErrorMessages.INVALID_CURSOR)
 
     def validate(self, attrs):
         start_date = attrs.get('start_date')
@@ -42,4 +71,34 @@ class TransactionQuerySerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 "Start date must be before end date"
             )
-        return attrs
\ No newline at end of file
+        return attrs
+
+class TransactionBatchQuerySerializer(serializers.Serializer):
+    client_ids = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=MAX_BATCH_CLIENTS,
+        help_text=f"Client ids to fetch transactions for (at most {MAX_BATCH_CLIENTS})"
+    )
+    start_date = serializers.DateField(
+        required=False,
+        help_text="Start date for filtering transactions"
+    )
+    end_date = serializers.DateField(
+        required=False,
+        help_text="End date for filtering transactions"
+    )
+    format = serializers.ChoiceField(
+        choices=['json', 'ndjson'],
+        default='json',
+        help_text="json: one object keyed by client id, for batches of limited size; "
+                  "ndjson: one transaction per line, streamed"
+    )
+
+    def validate_client_ids(self, value):
+        for client_id in value:
+            try:
+                uuid.UUID(client_id)
+            except ValueError:
+                raise serializers.ValidationError(APIErrorMessages.INVALID_CLIENT_ID)
+        return list(dict.fromkeys(value))
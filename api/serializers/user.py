@@ -47,13 +47,20 @@ class UserSerializer(serializers.ModelSerializer):
         return attrs
 
     def validate_login(self, attrs):
-        username = attrs.get('username')
-        if not User.objects.filter(username=username).exists():
-            raise serializers.ValidationError(APIErrorMessages.INVALID_CREDENTIALS)
+        """
+        Check the credentials with one user query and one password hash.
 
+        Unknown usernames still hash the password once, so response times do
+        not reveal which usernames exist. The user is returned in ``attrs``.
+        """
         password = attrs.get('password')
-        user = User.objects.filter(username=username).first()
-        if user and not user.check_password(password):
+        user = User._default_manager.filter(username=attrs.get('username')).first()
+        if user is None:
+            User().set_password(password)
             raise serializers.ValidationError(APIErrorMessages.INVALID_CREDENTIALS)
 
-        return attrs
\ No newline at end of file
+        if not user.check_password(password) or not user.is_active:
+            raise serializers.ValidationError(APIErrorMessages.INVALID_CREDENTIALS)
+
+        attrs['user'] = user
+        return attrs
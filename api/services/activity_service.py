@@ -0,0 +1,156 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import Trunc, TruncMonth
+from rest_framework import status
+from rest_framework.response import Response
+from api.serializers.activity import ActivityQuerySerializer, ActivitySerializer
+from core.models import Transaction, TransactionDailyRollup, TransactionMonthlyRollup
+from core.partitioning import partition_year
+from core.logging import logger
+
+
+def _midnight(day):
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def _first_full_day(moment):
+    day = moment.astimezone(dt_timezone.utc).date()
+    return day if _midnight(day) == moment else day + timedelta(days=1)
+
+
+def _first_full_month(day):
+    if day.day == 1:
+        return day
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+class ActivityService:
+    @staticmethod
+    def get_activity(query_params):
+        """
+        Get transaction counts and totals per day or month, currency and type.
+
+        The range is answered from the rollup tables: whole months from the
+        monthly rollup, whole days from the daily rollup, and only the partial
+        days at the edges of ``start``/``end`` from ``core_transaction``
+        (pruned to their partitions).
+
+        Parameters:
+        - query_params: Dict
+            - bucket: 'day' (default) or 'month'
+            - client_id: UUID (optional)
+            - currency: String (optional)
+            - start: Datetime (optional, inclusive)
+            - end: Datetime (optional, exclusive)
+
+        Returns:
+        - Response object with one row per (period, currency, transaction_type), or error
+        """
+        logger.info("Activity query initiated", extra={
+            'component': 'activity_service',
+            'action': 'query_start',
+            'query_params': query_params
+        })
+
+        query_serializer = ActivityQuerySerializer(data=query_params)
+        if not query_serializer.is_valid():
+            return Response(
+                {'error': query_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = query_serializer.validated_data
+        bucket = validated_data['bucket']
+        filters = {
+            key: validated_data[key] for key in ('client_id', 'currency') if validated_data.get(key)
+        }
+
+        totals = {}
+        for source, low, high in ActivityService.plan(bucket, validated_data.get('start'), validated_data.get('end')):
+            if source == 'raw':
+                rows = ActivityService.raw_totals(bucket, low, high, filters)
+            else:
+                model = TransactionDailyRollup if source == 'day' else TransactionMonthlyRollup
+                rows = ActivityService.rollup_totals(model, bucket, low, high, filters)
+            for row in rows:
+                key = (row['period'], row['currency'], row['transaction_type'])
+                count, amount = totals.get(key, (0, 0))
+                totals[key] = (count + row['transaction_count'], amount + row['total_amount'])
+
+        results = [
+            {
+                'period': period,
+                'currency': currency,
+                'transaction_type': transaction_type,
+                'transaction_count': count,
+                'total_amount': amount,
+            }
+            for (period, currency, transaction_type), (count, amount) in sorted(totals.items())
+        ]
+
+        logger.info("Activity results serialized", extra={
+            'component': 'activity_service',
+            'action': 'serialization_complete',
+            'results_count': len(results)
+        })
+
+        return Response(ActivitySerializer(results, many=True).data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def plan(bucket, start, end):
+        """
+        Split [start, end) into the sources that answer it.
+
+        Returns (source, low, high) segments where source is 'raw' (datetime
+        bounds on ``core_transaction``), 'day' or 'month' (date bounds on the
+        rollups); None means unbounded.
+        """
+        first_day = _first_full_day(start) if start else None
+        end_day = end.astimezone(dt_timezone.utc).date() if end else None
+        if first_day and end_day and first_day >= end_day:
+            return [('raw', start, end)]
+
+        segments = []
+        if start and _midnight(first_day) > start:
+            segments.append(('raw', start, _midnight(first_day)))
+        if end and _midnight(end_day) < end:
+            segments.append(('raw', _midnight(end_day), end))
+
+        if bucket == 'day':
+            return segments + [('day', first_day, end_day)]
+
+        first_month = _first_full_month(first_day) if first_day else None
+        end_month = end_day.replace(day=1) if end_day else None
+        if first_month and end_month and first_month >= end_month:
+            return segments + [('day', first_day, end_day)]
+
+        if first_day and first_day < first_month:
+            segments.append(('day', first_day, first_month))
+        if end_day and end_month < end_day:
+            segments.append(('day', end_month, end_day))
+        return segments + [('month', first_month, end_month)]
+
+    @staticmethod
+    def rollup_totals(model, bucket, low, high, filters):
+        field = model.BUCKET_FIELD
+        rollups = model.objects.filter(**filters)
+        if low:
+            rollups = rollups.filter(**{f'{field}__gte': low})
+        if high:
+            rollups = rollups.filter(**{f'{field}__lt': high})
+        period = TruncMonth(field) if bucket == 'month' and field == 'day' else F(field)
+        return rollups.annotate(period=period).values('period', 'currency', 'transaction_type').annotate(
+            transaction_count=Sum('transaction_count'),
+            total_amount=Sum('total_amount')
+        ).order_by()
+
+    @staticmethod
+    def raw_totals(bucket, low, high, filters):
+        transactions = Transaction.objects.filter(
+            transaction_date__gte=low, transaction_date__lt=high, **filters
+        ).in_partition_years(partition_year(low), partition_year(high))
+        period = Trunc('transaction_date', bucket, output_field=DateField(), tzinfo=dt_timezone.utc)
+        return transactions.annotate(period=period).values('period', 'currency', 'transaction_type').annotate(
+            transaction_count=Count('*'),
+            total_amount=Sum('amount')
+        ).order_by()
@@ -0,0 +1,96 @@
+from rest_framework import status
+from rest_framework.response import Response
+from api.serializers.analytics import AnalyticsQuerySerializer, AnalyticsSerializer
+from core.models import TransactionSketch
+from core.models.transaction_sketch import ALL_CLIENTS
+from core.sketches import HLL_RELATIVE_ERROR, KLL_RANK_ERROR, HyperLogLog, KLLSketch
+from core.logging import logger
+
+PERCENTILES = {'p50': 0.5, 'p95': 0.95, 'p99': 0.99}
+
+class AnalyticsService:
+    @staticmethod
+    def get_analytics(query_params):
+        """
+        Get approximate amount percentiles and distinct counts over a range of months.
+
+        Answers come from merging the monthly ``TransactionSketch`` rows of the
+        range, one per month, so the cost does not depend on how many
+        transactions the range holds. Ranges are whole months.
+
+        Error bounds:
+        - percentiles: the returned value's rank is within ``KLL_RANK_ERROR``
+          (1.65% of the transaction count) of the requested rank, with 99%
+          confidence
+        - distinct counts: relative standard error ``HLL_RELATIVE_ERROR``
+          (1.6%); counts below a few hundred are practically exact
+        - transaction_count: exact
+
+        Parameters:
+        - query_params: Dict
+            - client_id: UUID (optional, all clients by default)
+            - start: Date (optional) first month to include
+            - end: Date (optional) last month to include
+
+        Returns:
+        - Response object with the merged metrics, or error
+        """
+        logger.info("Analytics query initiated", extra={
+            'component': 'analytics_service',
+            'action': 'query_start',
+            'query_params': query_params
+        })
+
+        query_serializer = AnalyticsQuerySerializer(data=query_params)
+        if not query_serializer.is_valid():
+            return Response(
+                {'error': query_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = query_serializer.validated_data
+        client_id = validated_data.get('client_id')
+        start_month = validated_data['start'].replace(day=1) if validated_data.get('start') else None
+        end_month = validated_data['end'].replace(day=1) if validated_data.get('end') else None
+
+        sketches = TransactionSketch.objects.filter(client_id=client_id or ALL_CLIENTS)
+        if start_month:
+            sketches = sketches.filter(month__gte=start_month)
+        if end_month:
+            sketches = sketches.filter(month__lte=end_month)
+
+        transaction_count = 0
+        amounts, currencies, clients = KLLSketch(), HyperLogLog(), HyperLogLog()
+        for count, amount_sketch, currency_sketch, client_sketch in sketches.values_list(
+            'transaction_count', 'amounts', 'currencies', 'clients'
+        ):
+            transaction_count += count
+            amounts.merge(KLLSketch.from_bytes(bytes(amount_sketch)))
+            currencies.merge(HyperLogLog.from_bytes(bytes(currency_sketch)))
+            clients.merge(HyperLogLog.from_bytes(bytes(client_sketch)))
+
+        percentiles = amounts.quantiles(PERCENTILES.values())
+        result = {
+            'client_id': client_id,
+            'start_month': start_month,
+            'end_month': end_month,
+            'transaction_count': transaction_count,
+            'amount_percentiles': {
+                name: None if value is None else round(value, 2) for name, value in zip(PERCENTILES, percentiles)
+            },
+            'distinct_currencies': currencies.count(),
+            'distinct_clients': None if client_id else clients.count(),
+            'error_bounds': {
+                'amount_percentiles_rank_error': KLL_RANK_ERROR,
+                'distinct_count_relative_error': round(HLL_RELATIVE_ERROR, 5),
+            },
+        }
+
+        logger.info("Analytics results merged", extra={
+            'component': 'analytics_service',
+            'action': 'merge_complete',
+            'client_id': client_id,
+            'transaction_count': transaction_count
+        })
+
+        return Response(AnalyticsSerializer(result).data, status=status.HTTP_200_OK)
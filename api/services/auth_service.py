@@ -1,5 +1,4 @@
 from rest_framework.authtoken.models import Token
-from django.contrib.auth import authenticate
 from rest_framework import status
 from rest_framework.response import Response
 from api.errors import APIErrorMessages
@@ -40,21 +39,10 @@ class AuthService:
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+        # Credentials were checked during validation: one user query and one
+        # password hash, so there is no second round through authenticate().
         username = serializer.validated_data.get('username')
-        password = serializer.validated_data.get('password')
-
-        user = authenticate(username=username, password=password)
-
-        if not user:
-            logger.warning("Authentication failed", extra={
-                'component': 'auth_service',
-                'action': 'authentication_failed',
-                'username': username
-            })
-            return Response(
-                {'error': APIErrorMessages.INVALID_CREDENTIALS},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        user = serializer.validated_data['user']
 
         token, created = Token.objects.get_or_create(user=user)
 
@@ -0,0 +1,127 @@
+from django.db.models import BooleanField, F
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from api.errors import APIErrorMessages
+from api.pagination import encode_cursor, next_link_header
+from api.serializers.balance import (
+    BalanceHistorySerializer,
+    BalanceQuerySerializer,
+    BalanceSerializer
+)
+from core.models import Client, LedgerEntry
+from core.logging import logger
+import uuid
+
+class BalanceService:
+    @staticmethod
+    def get_balance(client_id, query_params, base_url=None):
+        """
+        Get a client's balance at a point in time, or its history over a range.
+
+        Balances are ``Client.account_balance`` (the opening balance) minus
+        the running total of the client's ledger, so each one is an index seek
+        on ``core_ledgerentry`` rather than a replay of the transactions.
+        Amounts are stored from the client's side of a trade, as the
+        statistics count them: a BUY (positive) spends money and lowers the
+        balance, a SELL (negative) brings money in and raises it.
+
+        Parameters:
+        - client_id: UUID
+            The unique identifier of the client
+        - query_params: Dict
+            - at: Datetime (optional, inclusive) balance after the last
+              transaction at or before this time; defaults to now
+            - start: Datetime (optional, inclusive) and/or end: Datetime
+              (optional, exclusive) return the ledger entries of the range
+              with the balance after each, paginated with a keyset cursor
+            - page_size: Integer (optional, default 100, max 1000)
+            - cursor: String (optional)
+        - base_url: String
+            Absolute URL of the request, used to build the next link
+
+        Returns:
+        - Response object with the balance or the balance history, or error
+        """
+        logger.info("Balance query initiated", extra={
+            'component': 'balance_service',
+            'action': 'query_start',
+            'client_id': client_id,
+            'query_params': query_params
+        })
+
+        try:
+            uuid.UUID(client_id)
+        except ValueError:
+            return Response(
+                {'error': APIErrorMessages.INVALID_CLIENT_ID},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        query_serializer = BalanceQuerySerializer(data=query_params)
+        if not query_serializer.is_valid():
+            return Response(
+                {'error': query_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        opening_balance = Client.objects.filter(client_id=client_id).values_list('account_balance', flat=True).first()
+        if opening_balance is None:
+            return Response(
+                {'error': APIErrorMessages.CLIENT_NOT_FOUND},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        validated_data = query_serializer.validated_data
+        if 'start' not in validated_data and 'end' not in validated_data:
+            at = validated_data.get('at') or timezone.now()
+            return Response(BalanceSerializer({
+                'client_id': client_id,
+                'at': at,
+                'balance': opening_balance - LedgerEntry.total_before(client_id, at, inclusive=True),
+            }).data, status=status.HTTP_200_OK)
+
+        start, end = validated_data.get('start'), validated_data.get('end')
+        page_size = validated_data['page_size']
+        entries = LedgerEntry.objects.filter(client_id=client_id)
+        if start:
+            entries = entries.filter(transaction_date__gte=start)
+        if end:
+            entries = entries.filter(transaction_date__lt=end)
+        cursor = validated_data.get('cursor')
+        if cursor:
+            entries = entries.filter(RawSQL(
+                "(transaction_date, transaction_id) > (%s, %s)",
+                list(cursor),
+                output_field=BooleanField()
+            ))
+        entries = list(entries.order_by('transaction_date', 'transaction_id').values(
+            'transaction_id', 'transaction_date', 'amount',
+            balance=opening_balance - F('running_total')
+        )[:page_size + 1])
+
+        headers = None
+        if len(entries) > page_size:
+            entries = entries[:page_size]
+            last = entries[-1]
+            headers = next_link_header(
+                base_url or '',
+                encode_cursor([last['transaction_date'].isoformat(), last['transaction_id']])
+            )
+
+        logger.info("Balance history serialized", extra={
+            'component': 'balance_service',
+            'action': 'serialization_complete',
+            'client_id': client_id,
+            'results_count': len(entries)
+        })
+
+        return Response(BalanceHistorySerializer({
+            'client_id': client_id,
+            'start': start,
+            'end': end,
+            'opening_balance': opening_balance - (LedgerEntry.total_before(client_id, start) if start else 0),
+            'closing_balance': opening_balance - LedgerEntry.total_before(client_id, end),
+            'results': entries,
+        }).data, status=status.HTTP_200_OK, headers=headers)
@@ -1,16 +1,32 @@
 from api.serializers.client import ClientQuerySerializer, ClientSerializer
+from api.serializers.fast import FastRenderer
+from api.responses import RenderedJSONResponse
 from rest_framework.response import Response
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
 from rest_framework import status
 from core.models.client import Client
 from api.errors import APIErrorMessages
+from api.pagination import encode_cursor, next_link_header
 from core.logging import logger
 
+CLIENT_RENDERER = FastRenderer(ClientSerializer)
+
 class ClientService:
     @staticmethod
-    def get_clients(query_params):
+    def get_clients(query_params, base_url=None):
         """
         Get all clients with filters
 
+        ``name`` and ``email`` are substring matches served by the trigram
+        indexes on ``UPPER(name)`` and ``UPPER(email)``; ``search`` ranks
+        clients by fuzzy similarity to either.
+
+        Otherwise clients are ordered by ``client_id`` and paginated with a
+        keyset cursor: when more rows exist, a ``Link: <...>; rel="next"``
+        header points at the next page of ``limit`` clients.
+
         Returns:
         - List of clients
         """
@@ -20,12 +36,10 @@ class ClientService:
             'query_params': query_params
         })
 
-        try:
-            serializer = ClientQuerySerializer(data=query_params)
-            serializer.is_valid(raise_exception=True)
-            validated_params = serializer.validated_data
-        except Exception as e:
-            return Response(APIErrorMessages.INVALID_QUERY_PARAMS, status=status.HTTP_400_BAD_REQUEST)
+        serializer = ClientQuerySerializer(data=query_params)
+        if not serializer.is_valid():
+            return Response({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        validated_params = serializer.validated_data
 
         limit = validated_params.pop('limit', 10)
         name = validated_params.pop('name', None)
@@ -34,6 +48,8 @@ class ClientService:
         max_balance = validated_params.pop('max_balance', None)
         created_after = validated_params.pop('created_after', None)
         created_before = validated_params.pop('created_before', None)
+        search = validated_params.pop('search', None)
+        cursor = validated_params.pop('cursor', None)
 
         try:
             filter_conditions = {
@@ -48,17 +64,30 @@ class ClientService:
 
             filter_conditions = {k: v for k, v in filter_conditions.items() if v is not None}
 
-            clients = Client.objects.filter(**filter_conditions)[:limit]
+            clients = Client.objects.filter(**filter_conditions)
+            if search:
+                clients = ClientService.rank_by_similarity(clients, search)
+                rows = list(CLIENT_RENDERER.values(clients[:limit]))
+            else:
+                if cursor:
+                    clients = clients.filter(client_id__gt=cursor)
+                rows = list(CLIENT_RENDERER.values(clients.order_by('client_id')[:limit + 1]))
+
+            headers = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = dict(zip(CLIENT_RENDERER.columns, rows[-1]))
+                headers = next_link_header(base_url or '', encode_cursor([last['client_id']]))
 
-            serializer = ClientSerializer(clients, many=True)
+            content = CLIENT_RENDERER.render(rows)
 
             logger.info("Results serialized", extra={
                 'component': 'client_service',
                 'action': 'serialization_complete',
-                'results_count': len(clients)
+                'results_count': len(rows)
             })
 
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return RenderedJSONResponse(content, status=status.HTTP_200_OK, headers=headers)
         except Exception as e:
             logger.error("Error processing client query", extra={
                 'component': 'client_service',
@@ -66,4 +95,25 @@ class ClientService:
                 'filters': filter_conditions if 'filter_conditions' in locals() else None,
                 'error': str(e)
             })
-            return Response(APIErrorMessages.INTERNAL_SERVER_ERROR, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response(APIErrorMessages.INTERNAL_SERVER_ERROR, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def rank_by_similarity(clients, search):
+        """
+        Keep clients whose name or email contains a word similar to ``search``,
+        best matches first.
+
+        Both sides are upper-cased so the lookups match the trigram index
+        expressions.
+        """
+        term = search.upper()
+        return clients.alias(
+            name_upper=Upper('name'),
+            email_upper=Upper('email'),
+            rank=Greatest(
+                TrigramWordSimilarity(term, Upper('name')),
+                TrigramWordSimilarity(term, Upper('email')),
+            ),
+        ).filter(
+            Q(name_upper__trigram_word_similar=term) | Q(email_upper__trigram_word_similar=term)
+        ).order_by('-rank', 'client_id')
@@ -0,0 +1,236 @@
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework import status
+from rest_framework.response import Response
+from api.errors import APIErrorMessages
+from api.cache import statistics_response_cache
+from api.pagination import encode_cursor, next_link_header
+from api.serializers.statistics import (
+    LeaderboardEntrySerializer,
+    LeaderboardQuerySerializer,
+    StatisticsQuerySerializer,
+    TransactionStatisticsSerializer
+)
+from core.models import TransactionStatistics
+from core.logging import logger
+import time
+import uuid
+
+class StatisticsService:
+    @staticmethod
+    def get_client_statistics(client_id):
+        """
+        Get the lifetime totals of one client from the ``transaction_statistics`` view.
+
+        Parameters:
+        - client_id: UUID
+            The unique identifier of the client
+
+        Returns:
+        - Response object with the client's totals and the view's
+          ``refreshed_at`` time, or error
+        """
+        logger.info("Client statistics query initiated", extra={
+            'component': 'statistics_service',
+            'action': 'client_query_start',
+            'client_id': client_id
+        })
+
+        try:
+            uuid.UUID(client_id)
+        except ValueError:
+            return Response(
+                {'error': APIErrorMessages.INVALID_CLIENT_ID},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        statistics = TransactionStatistics.objects.filter(client_id=client_id).first()
+        if statistics is None:
+            logger.warning("Client statistics not found", extra={
+                'component': 'statistics_service',
+                'action': 'client_query_not_found',
+                'client_id': client_id
+            })
+            return Response(
+                {'error': APIErrorMessages.STATISTICS_NOT_FOUND},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({
+            'refreshed_at': TransactionStatistics.last_refreshed_at(),
+            **TransactionStatisticsSerializer(statistics).data
+        }, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def get_statistics(query_params, base_url=None):
+        """
+        List client totals from the ``transaction_statistics`` view.
+
+        Rows are sorted by ``client_id``, ``total_spent`` or ``total_gained``
+        (each backed by an index on the view, with ``client_id`` as tie
+        breaker) and paginated with a keyset cursor; a ``Link: <...>;
+        rel="next"`` header points at the next page.
+
+        Parameters:
+        - query_params: Dict
+            - sort: String (optional, default client_id; '-' prefix for descending)
+            - page_size: Integer (optional, default 100, max 1000)
+            - cursor: String (optional)
+        - base_url: String
+            Absolute URL of the request, used to build the next link
+
+        Returns:
+        - Response object with ``refreshed_at`` and ``results``, or error
+        """
+        logger.info("Statistics query initiated", extra={
+            'component': 'statistics_service',
+            'action': 'query_start',
+            'query_params': query_params
+        })
+
+        query_serializer = StatisticsQuerySerializer(data=query_params)
+        if not query_serializer.is_valid():
+            return Response(
+                {'error': query_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = query_serializer.validated_data
+        sort = validated_data['sort']
+        page_size = validated_data['page_size']
+        column = sort.lstrip('-')
+        descending = sort.startswith('-')
+
+        statistics = TransactionStatistics.objects.all()
+        cursor = validated_data.get('cursor')
+        if cursor:
+            statistics = statistics.filter(RawSQL(
+                f"({column}, client_id) {'<' if descending else '>'} (%s, %s)",
+                list(cursor),
+                output_field=BooleanField()
+            ))
+        ordering = [column] if column == 'client_id' else [column, 'client_id']
+        statistics = list(statistics.order_by(*(f'-{field}' if descending else field for field in ordering))[:page_size + 1])
+
+        headers = None
+        if len(statistics) > page_size:
+            statistics = statistics[:page_size]
+            last = statistics[-1]
+            headers = next_link_header(base_url or '', encode_cursor([sort, getattr(last, column), last.client_id]))
+
+        logger.info("Statistics results serialized", extra={
+            'component': 'statistics_service',
+            'action': 'serialization_complete',
+            'results_count': len(statistics)
+        })
+
+        return Response({
+            'refreshed_at': TransactionStatistics.last_refreshed_at(),
+            'results': TransactionStatisticsSerializer(statistics, many=True).data
+        }, status=status.HTTP_200_OK, headers=headers)
+
+    @staticmethod
+    def get_top(query_params):
+        """
+        Rank clients by ``total_spent`` or ``total_gained``, overall, within a
+        country, or within every country.
+
+        Each group is read from the matching ``(total, client_id)`` or
+        ``(country, total, client_id)`` index of the view, stopping after
+        ``limit`` rows; per-country leaderboards walk the distinct countries
+        through the same index and take the top of each with a LATERAL join.
+        Ties rank the higher ``client_id`` first. Results are cached until
+        the next refresh of the view.
+
+        Parameters:
+        - query_params: Dict
+            - metric: 'total_spent' (default) or 'total_gained'
+            - limit: Integer (optional, default 10, max 100) clients per group
+            - country: String (optional)
+            - group_by: 'country' (optional)
+
+        Returns:
+        - Response object with ``refreshed_at``, ``metric`` and the ranked
+          ``results``, or error
+        """
+        logger.info("Leaderboard query initiated", extra={
+            'component': 'statistics_service',
+            'action': 'top_query_start',
+            'query_params': query_params
+        })
+
+        query_serializer = LeaderboardQuerySerializer(data=query_params)
+        if not query_serializer.is_valid():
+            return Response(
+                {'error': query_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = query_serializer.validated_data
+        cache_key = statistics_response_cache.scoped_key(
+            TransactionStatistics.VERSION_SCOPE, {'top': validated_data}
+        )
+        cached = statistics_response_cache.get(cache_key)
+        if cached is not None:
+            return Response(cached['data'], status=status.HTTP_200_OK)
+
+        started = time.perf_counter()
+        metric, limit = validated_data['metric'], validated_data['limit']
+        grouped = validated_data.get('group_by') == 'country'
+        table = TransactionStatistics._meta.db_table
+        if grouped:
+            # Loose index scan: each step of the recursive CTE seeks the next
+            # country in the (country, ...) index instead of reading the view.
+            sql = f"""
+                WITH RECURSIVE countries AS (
+                    (SELECT country FROM {table} WHERE country IS NOT NULL ORDER BY country LIMIT 1)
+                    UNION ALL
+                    SELECT (
+                        SELECT s.country FROM {table} s
+                        WHERE s.country > countries.country
+                        ORDER BY s.country LIMIT 1
+                    )
+                    FROM countries WHERE countries.country IS NOT NULL
+                )
+                SELECT top.* FROM countries
+                CROSS JOIN LATERAL (
+                    SELECT * FROM {table} s
+                    WHERE s.country = countries.country
+                    ORDER BY s.{metric} DESC, s.client_id DESC
+                    LIMIT %s
+                ) top
+                ORDER BY top.country, top.{metric} DESC, top.client_id DESC
+            """
+            params = [limit]
+        elif 'country' in validated_data:
+            sql = f"""
+                SELECT * FROM {table}
+                WHERE country = %s
+                ORDER BY {metric} DESC, client_id DESC
+                LIMIT %s
+            """
+            params = [validated_data['country'], limit]
+        else:
+            sql = f"SELECT * FROM {table} ORDER BY {metric} DESC, client_id DESC LIMIT %s"
+            params = [limit]
+
+        results = list(TransactionStatistics.objects.raw(sql, params))
+        ranks = {}
+        for entry in results:
+            group = entry.country if grouped else None
+            ranks[group] = entry.rank = ranks.get(group, 0) + 1
+
+        data = {
+            'refreshed_at': TransactionStatistics.last_refreshed_at(),
+            'metric': metric,
+            'results': LeaderboardEntrySerializer(results, many=True).data
+        }
+        statistics_response_cache.set(cache_key, (time.perf_counter() - started) * 1000, data=data)
+
+        logger.info("Leaderboard results serialized", extra={
+            'component': 'statistics_service',
+            'action': 'top_serialization_complete',
+            'results_count': len(results)
+        })
+
+        return Response(data, status=status.HTTP_200_OK)
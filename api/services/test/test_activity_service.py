@@ -0,0 +1,115 @@
+from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from core.models import Client, Transaction
+from api.services.activity_service import ActivityService
+from rest_framework import status
+import uuid
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class TestActivityService(TestCase):
+    def setUp(self):
+        self.client_record = Client.objects.create(
+            client_id=str(uuid.uuid4()),
+            name="John Doe",
+            email="john@example.com",
+            date_of_birth="1990-01-01",
+            country="USA",
+            account_balance=Decimal("1000.00")
+        )
+        self.transactions = []
+        for transaction_date, transaction_type, amount, currency in [
+            (utc(2024, 1, 15, 10), 'BUY', '10.00', 'USD'),
+            (utc(2024, 1, 15, 18), 'BUY', '1.50', 'USD'),
+            (utc(2024, 1, 31, 23), 'BUY', '5.00', 'USD'),
+            (utc(2024, 2, 10, 8), 'BUY', '7.00', 'USD'),
+            (utc(2024, 2, 10, 9), 'BUY', '2.00', 'EUR'),
+            (utc(2024, 3, 1, 12), 'SELL', '-3.00', 'USD'),
+            (utc(2024, 3, 20, 12), 'SELL', '-4.00', 'USD'),
+        ]:
+            self.transactions.append(Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=self.client_record,
+                transaction_type=transaction_type,
+                transaction_date=transaction_date,
+                amount=Decimal(amount),
+                currency=currency
+            ))
+
+    def expected(self, bucket, start=None, end=None):
+        totals = {}
+        for transaction in self.transactions:
+            if (start and transaction.transaction_date < start) or (end and transaction.transaction_date >= end):
+                continue
+            period = transaction.transaction_date.date()
+            if bucket == 'month':
+                period = period.replace(day=1)
+            key = (period.isoformat(), transaction.currency, transaction.transaction_type)
+            count, amount = totals.get(key, (0, Decimal(0)))
+            totals[key] = (count + 1, amount + transaction.amount)
+        return [
+            {
+                'period': period,
+                'currency': currency,
+                'transaction_type': transaction_type,
+                'transaction_count': count,
+                'total_amount': f'{amount:.2f}',
+            }
+            for (period, currency, transaction_type), (count, amount) in sorted(totals.items())
+        ]
+
+    def test_activity_matches_raw_aggregation(self):
+        """Test rollup answers equal aggregating the raw transactions, including partial edges"""
+        ranges = [
+            (None, None),
+            (utc(2024, 1, 15, 12), utc(2024, 3, 1, 13)),
+            (utc(2024, 1, 15), utc(2024, 3, 1)),
+            (utc(2024, 1, 15, 12), utc(2024, 1, 15, 20)),
+            (utc(2024, 2, 1), None),
+        ]
+        for bucket in ('day', 'month'):
+            for start, end in ranges:
+                params = {'bucket': bucket, 'client_id': self.client_record.client_id}
+                if start:
+                    params['start'] = start.isoformat()
+                if end:
+                    params['end'] = end.isoformat()
+                with self.subTest(bucket=bucket, start=start, end=end):
+                    response = ActivityService.get_activity(params)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertEqual([dict(row) for row in response.data], self.expected(bucket, start, end))
+
+    def test_rollups_follow_updates_and_deletes(self):
+        """Test rollups still equal the raw aggregation after transactions change or go away"""
+        moved = self.transactions[3]
+        moved.transaction_date, moved.amount, moved.currency = utc(2024, 1, 31, 20), Decimal('8.00'), 'EUR'
+        moved.save()
+        self.transactions[0].delete()
+        Transaction.objects.filter(transaction_id=self.transactions[5].transaction_id).delete()
+        del self.transactions[5], self.transactions[0]
+
+        for bucket in ('day', 'month'):
+            with self.subTest(bucket=bucket):
+                response = ActivityService.get_activity({'bucket': bucket, 'client_id': self.client_record.client_id})
+                self.assertEqual([dict(row) for row in response.data], self.expected(bucket))
+
+    def test_plan_reads_raw_rows_only_for_partial_days(self):
+        """Test the range is split into raw edges, daily and monthly rollups"""
+        self.assertEqual(ActivityService.plan('month', utc(2024, 1, 15, 12), utc(2024, 3, 1, 13)), [
+            ('raw', utc(2024, 1, 15, 12), utc(2024, 1, 16)),
+            ('raw', utc(2024, 3, 1), utc(2024, 3, 1, 13)),
+            ('day', utc(2024, 1, 16).date(), utc(2024, 2, 1).date()),
+            ('month', utc(2024, 2, 1).date(), utc(2024, 3, 1).date()),
+        ])
+        self.assertEqual(ActivityService.plan('day', utc(2024, 1, 1), utc(2024, 2, 1)), [
+            ('day', utc(2024, 1, 1).date(), utc(2024, 2, 1).date()),
+        ])
+
+    def test_activity_invalid_range(self):
+        """Test start must precede end"""
+        response = ActivityService.get_activity({'start': '2024-02-01', 'end': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,124 @@
+from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from core.models import Client, Transaction, TransactionSketch
+from core.sketches import HyperLogLog, KLLSketch
+from api.services.analytics_service import AnalyticsService
+from rest_framework import status
+import random
+import uuid
+
+
+class TestSketches(TestCase):
+    def test_kll_quantiles_within_rank_error(self):
+        rng = random.Random(7)
+        values = [rng.expovariate(0.01) for _ in range(50000)]
+        left, right = KLLSketch(rng=random.Random(1)), KLLSketch(rng=random.Random(2))
+        for value in values[:25000]:
+            left.update(value)
+        for value in values[25000:]:
+            right.update(value)
+        merged = KLLSketch.from_bytes(left.to_bytes())
+        merged.merge(KLLSketch.from_bytes(right.to_bytes()))
+
+        ordered = sorted(values)
+        for fraction, estimate in zip([0.5, 0.95, 0.99], merged.quantiles([0.5, 0.95, 0.99])):
+            rank = sum(1 for value in ordered if value <= estimate) / len(ordered)
+            self.assertLess(abs(rank - fraction), 0.0165)
+
+    def test_hyperloglog_counts_distinct_values(self):
+        left, right = HyperLogLog(), HyperLogLog()
+        for i in range(20000):
+            (left if i % 2 else right).update(f'client-{i}')
+            left.update(f'client-{i}')
+        merged = HyperLogLog.from_bytes(left.to_bytes())
+        merged.merge(HyperLogLog.from_bytes(right.to_bytes()))
+        self.assertLess(abs(merged.count() - 20000) / 20000, 0.05)
+
+        small = HyperLogLog()
+        for currency in ['USD', 'EUR', 'USD', 'GBP']:
+            small.update(currency)
+        self.assertEqual(HyperLogLog.from_bytes(small.to_bytes()).count(), 3)
+
+
+class TestAnalyticsService(TestCase):
+    def setUp(self):
+        self.clients = [
+            Client.objects.create(
+                client_id=str(uuid.uuid4()),
+                name=f"Client {i}",
+                email=f"client{i}@example.com",
+                date_of_birth="1990-01-01",
+                country="USA",
+                account_balance=Decimal("1000.00")
+            )
+            for i in range(3)
+        ]
+        self.amounts = {}
+        for i in range(60):
+            client = self.clients[i % 3]
+            month = 1 + (i // 3) % 3
+            amount = Decimal(i + 1)
+            Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=client,
+                transaction_type='SELL' if i % 4 == 0 else 'BUY',
+                transaction_date=datetime(2024, month, 10, tzinfo=dt_timezone.utc),
+                amount=-amount if i % 4 == 0 else amount,
+                currency=['USD', 'EUR', 'GBP', 'JPY'][i % 4]
+            )
+            self.amounts.setdefault((client.client_id, month), []).append(float(amount))
+
+    def test_sketches_are_built_per_client_and_globally(self):
+        # Every save appends a client row and an all-clients row ...
+        self.assertEqual(TransactionSketch.objects.count(), 2 * 60)
+        before = AnalyticsService.get_analytics({}).data
+
+        # ... which compaction folds into one row per client and month.
+        self.assertEqual(TransactionSketch.compact(batch_size=2), 2 * 60 - (3 * 3 + 3))
+        self.assertEqual(TransactionSketch.objects.count(), 3 * 3 + 3)
+        self.assertEqual(TransactionSketch.objects.filter(client_id='').count(), 3)
+        self.assertEqual(TransactionSketch.compact(), 0)
+
+        after = AnalyticsService.get_analytics({}).data
+        self.assertEqual(after['transaction_count'], before['transaction_count'])
+        self.assertEqual(after['distinct_currencies'], before['distinct_currencies'])
+        self.assertEqual(after['distinct_clients'], before['distinct_clients'])
+
+    def test_global_analytics(self):
+        response = AnalyticsService.get_analytics({})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['transaction_count'], 60)
+        self.assertEqual(response.data['distinct_currencies'], 4)
+        self.assertEqual(response.data['distinct_clients'], 3)
+        # Small sketches keep every value, so percentiles are exact here
+        self.assertEqual(response.data['amount_percentiles'], {'p50': 30.0, 'p95': 57.0, 'p99': 60.0})
+        self.assertEqual(response.data['error_bounds']['amount_percentiles_rank_error'], 0.0165)
+
+    def test_client_analytics_for_month_range(self):
+        client = self.clients[0]
+        response = AnalyticsService.get_analytics({
+            'client_id': client.client_id,
+            'start': '2024-02-15',
+            'end': '2024-03-01',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        amounts = self.amounts[(client.client_id, 2)] + self.amounts[(client.client_id, 3)]
+        self.assertEqual(response.data['start_month'], '2024-02-01')
+        self.assertEqual(response.data['end_month'], '2024-03-01')
+        self.assertEqual(response.data['transaction_count'], len(amounts))
+        self.assertIsNone(response.data['distinct_clients'])
+        self.assertEqual(response.data['amount_percentiles']['p99'], max(amounts))
+
+    def test_empty_range(self):
+        response = AnalyticsService.get_analytics({'start': '2030-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['transaction_count'], 0)
+        self.assertEqual(response.data['amount_percentiles'], {'p50': None, 'p95': None, 'p99': None})
+        self.assertEqual(response.data['distinct_currencies'], 0)
+
+    def test_invalid_params(self):
+        response = AnalyticsService.get_analytics({'client_id': 'not-a-uuid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = AnalyticsService.get_analytics({'start': '2024-03-01', 'end': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,4 +1,8 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import hashers
+from unittest.mock import patch
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 from rest_framework import status
@@ -162,4 +166,35 @@ class AuthServiceTestCase(TestCase):
         response = AuthService.login(self.valid_user_data)
         new_token = response.data['token']
 
-        self.assertNotEqual(first_token, new_token)
\ No newline at end of file
+        self.assertNotEqual(first_token, new_token)
+
+    def count_hashes(self):
+        return patch('django.contrib.auth.hashers.pbkdf2', wraps=hashers.pbkdf2)
+
+    def test_login_hashes_password_once(self):
+        """Test each login outcome costs one user query and exactly one password hash"""
+        User.objects.create_user(username='inactiveuser', password='inactive123', is_active=False)
+        Token.objects.create(user=self.test_user)
+        for credentials, expected_status, expected_queries in [
+            ({'username': 'existinguser', 'password': 'existing123'}, status.HTTP_200_OK, 2),
+            ({'username': 'existinguser', 'password': 'wrongpass'}, status.HTTP_401_UNAUTHORIZED, 1),
+            ({'username': 'nonexistentuser', 'password': 'somepass123'}, status.HTTP_401_UNAUTHORIZED, 1),
+            ({'username': 'inactiveuser', 'password': 'inactive123'}, status.HTTP_401_UNAUTHORIZED, 1),
+        ]:
+            with self.subTest(username=credentials['username'], password=credentials['password']):
+                with self.count_hashes() as pbkdf2, self.assertNumQueries(expected_queries):
+                    response = AuthService.login(credentials)
+                self.assertEqual(response.status_code, expected_status)
+                self.assertEqual(pbkdf2.call_count, 1)
+
+    def test_login_throughput_budget(self):
+        """Test a burst of logins stays within its hash and query budget"""
+        logins = 20
+        AuthService.login({'username': 'existinguser', 'password': 'existing123'})
+        with self.count_hashes() as pbkdf2, CaptureQueriesContext(connection) as queries:
+            for _ in range(logins):
+                response = AuthService.login({'username': 'existinguser', 'password': 'existing123'})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(pbkdf2.call_count, logins)
+        self.assertEqual(len(queries), 2 * logins)
@@ -0,0 +1,101 @@
+from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from core.models import Client, LedgerEntry, Transaction
+from api.services.balance_service import BalanceService
+from rest_framework import status
+import uuid
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class TestBalanceService(TestCase):
+    def setUp(self):
+        self.client_record = Client.objects.create(
+            client_id=str(uuid.uuid4()),
+            name="John Doe",
+            email="john@example.com",
+            date_of_birth="1990-01-01",
+            country="USA",
+            account_balance=Decimal("1000.00")
+        )
+        # Saved out of date order: the ledger must still accumulate by date
+        for transaction_date, transaction_type, amount in [
+            (utc(2024, 1, 10), 'BUY', '100.00'),
+            (utc(2024, 3, 1), 'SELL', '-30.00'),
+            (utc(2024, 1, 5), 'BUY', '20.00'),
+            (utc(2024, 2, 1), 'BUY', '5.50'),
+        ]:
+            Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=self.client_record,
+                transaction_type=transaction_type,
+                transaction_date=transaction_date,
+                amount=Decimal(amount),
+                currency='USD'
+            )
+
+    def get(self, **params):
+        return BalanceService.get_balance(self.client_record.client_id, params, 'http://testserver/balance/')
+
+    def test_ledger_running_totals(self):
+        entries = LedgerEntry.objects.filter(client_id=self.client_record.client_id).order_by('transaction_date')
+        self.assertEqual(
+            [entry.running_total for entry in entries],
+            [Decimal('20.00'), Decimal('120.00'), Decimal('125.50'), Decimal('95.50')]
+        )
+
+    def test_ledger_follows_updates_and_deletes(self):
+        entries = LedgerEntry.objects.filter(client_id=self.client_record.client_id)
+        ordered_ids = list(entries.order_by('transaction_date').values_list('transaction_id', flat=True))
+        Transaction.objects.get(transaction_id=ordered_ids[0]).delete()
+        moved = Transaction.objects.get(transaction_id=ordered_ids[2])
+        moved.transaction_date = utc(2024, 4, 1)
+        moved.save()
+
+        self.assertEqual(
+            [entry.running_total for entry in entries.order_by('transaction_date')],
+            [Decimal('100.00'), Decimal('70.00'), Decimal('75.50')]
+        )
+        self.client_record.delete()
+        self.assertFalse(entries.exists())
+
+    def test_balance_at(self):
+        response = self.get(at='2024-01-10T00:00:00Z')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['balance'], '880.00')
+
+        self.assertEqual(self.get(at='2023-12-31').data['balance'], '1000.00')
+        self.assertEqual(self.get().data['balance'], '904.50')
+
+    def test_balance_history(self):
+        response = self.get(start='2024-01-06', end='2024-03-01')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['opening_balance'], '980.00')
+        self.assertEqual(response.data['closing_balance'], '874.50')
+        self.assertEqual(
+            [(entry['amount'], entry['balance']) for entry in response.data['results']],
+            [('100.00', '880.00'), ('5.50', '874.50')]
+        )
+
+    def test_balance_history_pagination(self):
+        response = self.get(start='2024-01-01', page_size=3)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['closing_balance'], '904.50')
+        cursor = response['Link'].split('cursor=')[1].split('>')[0]
+
+        response = self.get(start='2024-01-01', page_size=3, cursor=cursor)
+        self.assertEqual([entry['balance'] for entry in response.data['results']], ['904.50'])
+        self.assertNotIn('Link', response)
+
+    def test_invalid_requests(self):
+        self.assertEqual(
+            BalanceService.get_balance('not-a-uuid', {}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            BalanceService.get_balance(str(uuid.uuid4()), {}).status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(self.get(at='2024-01-01', start='2024-01-01').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get(start='2024-01-01', cursor='bogus').status_code, status.HTTP_400_BAD_REQUEST)
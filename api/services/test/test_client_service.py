@@ -1,10 +1,13 @@
 from django.test import TestCase
+from django.db import connection
 from decimal import Decimal
 from datetime import timedelta
 from django.utils import timezone
 from core.models.client import Client
 from api.services.client_service import ClientService
+from api.errors import APIErrorMessages
 from rest_framework import status
+from urllib.parse import parse_qs, urlparse
 import uuid
 
 class TestClientService(TestCase):
@@ -143,4 +146,44 @@ class TestClientService(TestCase):
             'name': 'john'  # Testing case-insensitive search
         })
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
\ No newline at end of file
+        self.assertEqual(len(response.data), 2)
+
+    def test_get_clients_fuzzy_search(self):
+        """Test ranked fuzzy search tolerates typos"""
+        response = ClientService.get_clients({'search': 'Johnn'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({client['name'] for client in response.data}, {'John Doe', 'John Smith'})
+
+        response = ClientService.get_clients({'search': 'jane smth'})
+        self.assertEqual(response.data[0]['name'], 'Jane Smith')
+
+    def test_substring_filters_use_trigram_indexes(self):
+        """Test name and email substring filters can be served by the trigram indexes"""
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = Client.objects.filter(name__icontains='smi', email__icontains='example').explain()
+        self.assertRegex(plan, 'core_client_(name|email)_trgm')
+
+    def test_get_clients_keyset_pagination(self):
+        """Test clients are ordered by client_id and paged with the next cursor"""
+        response = ClientService.get_clients({'limit': 2}, 'http://testserver/api/clients/?limit=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = [client['client_id'] for client in response.data]
+        self.assertEqual(first_page, sorted(first_page))
+
+        cursor = parse_qs(urlparse(response['Link'].split(';')[0].strip('<>')).query)['cursor'][0]
+        response = ClientService.get_clients({'limit': 2, 'cursor': cursor})
+        self.assertEqual(len(response.data), 1)
+        self.assertFalse(response.has_header('Link'))
+        self.assertEqual(
+            first_page + [response.data[0]['client_id']],
+            sorted([self.client1.client_id, self.client2.client_id, self.client3.client_id])
+        )
+
+    def test_get_clients_cursor_with_search(self):
+        """Test ranked search results can't be paged with a cursor"""
+        response = ClientService.get_clients({'limit': 2})
+        cursor = parse_qs(urlparse(response['Link'].split(';')[0].strip('<>')).query)['cursor'][0]
+        response = ClientService.get_clients({'search': 'john', 'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error']['non_field_errors'], [APIErrorMessages.SEARCH_NOT_PAGINATED])
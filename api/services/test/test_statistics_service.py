@@ -0,0 +1,141 @@
+from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from decimal import Decimal
+from django.utils import timezone
+from urllib.parse import parse_qs, urlparse
+from core.models import Client, Transaction, TransactionStatistics
+from api.services.statistics_service import StatisticsService
+from api.errors import APIErrorMessages
+from core.testing import isolated_cache
+from rest_framework import status
+import uuid
+
+@isolated_cache()
+class TestStatisticsService(TestCase):
+    def setUp(self):
+        self.clients = []
+        for i, (spent, gained) in enumerate([(300, 10), (100, 30), (200, 20)]):
+            client = Client.objects.create(
+                client_id=str(uuid.uuid4()),
+                name=f"Client {i}",
+                email=f"client{i}@example.com",
+                date_of_birth="1990-01-01",
+                country="France" if i == 1 else "USA",
+                account_balance=Decimal("1000.00")
+            )
+            Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=client,
+                transaction_type='BUY',
+                transaction_date=timezone.now(),
+                amount=Decimal(spent),
+                currency='USD'
+            )
+            Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=client,
+                transaction_type='SELL',
+                transaction_date=timezone.now(),
+                amount=-Decimal(gained),
+                currency='USD'
+            )
+            self.clients.append(client)
+        TransactionStatistics.refresh()
+        cache.clear()
+
+    def next_cursor(self, response):
+        return parse_qs(urlparse(response['Link'].split(';')[0].strip('<>')).query)['cursor'][0]
+
+    def test_get_client_statistics(self):
+        """Test a client's totals come from the view with its refresh time"""
+        response = StatisticsService.get_client_statistics(self.clients[0].client_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_transactions'], 2)
+        self.assertEqual(response.data['total_spent'], '300.00')
+        self.assertEqual(response.data['total_gained'], '10.00')
+        self.assertEqual(response.data['refreshed_at'], TransactionStatistics.last_refreshed_at())
+
+    def test_get_client_statistics_not_found(self):
+        """Test clients missing from the view"""
+        response = StatisticsService.get_client_statistics(str(uuid.uuid4()))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], APIErrorMessages.STATISTICS_NOT_FOUND)
+
+    def test_get_statistics_sorted_pages(self):
+        """Test sorting by total_spent descending across keyset pages"""
+        response = StatisticsService.get_statistics({'sort': '-total_spent', 'page_size': 2}, 'http://testserver/api/statistics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data['refreshed_at'])
+        self.assertEqual([row['total_spent'] for row in response.data['results']], ['300.00', '200.00'])
+
+        response = StatisticsService.get_statistics({'sort': '-total_spent', 'page_size': 2, 'cursor': self.next_cursor(response)})
+        self.assertEqual([row['total_spent'] for row in response.data['results']], ['100.00'])
+        self.assertFalse(response.has_header('Link'))
+
+    def test_get_statistics_cursor_from_other_sort(self):
+        """Test a cursor is rejected when the sort changes"""
+        response = StatisticsService.get_statistics({'sort': 'total_gained', 'page_size': 1}, 'http://testserver/api/statistics/')
+        self.assertEqual([row['total_gained'] for row in response.data['results']], ['10.00'])
+
+        response = StatisticsService.get_statistics({'sort': 'total_spent', 'cursor': self.next_cursor(response)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_top(self):
+        """Test the top clients overall and for one country, with the denormalized country"""
+        response = StatisticsService.get_top({'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['rank'], row['country'], row['total_spent']) for row in response.data['results']],
+            [(1, 'USA', '300.00'), (2, 'USA', '200.00')]
+        )
+
+        response = StatisticsService.get_top({'metric': 'total_gained', 'country': 'USA'})
+        self.assertEqual([row['total_gained'] for row in response.data['results']], ['20.00', '10.00'])
+
+    def test_get_top_per_country(self):
+        """Test group_by=country ranks clients within each country"""
+        response = StatisticsService.get_top({'group_by': 'country', 'limit': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['rank'], row['country'], row['client_id']) for row in response.data['results']],
+            [(1, 'France', self.clients[1].client_id), (1, 'USA', self.clients[0].client_id)]
+        )
+
+    def test_get_top_cached_until_refresh(self):
+        """Test leaderboards are served from the cache until the view is refreshed"""
+        StatisticsService.get_top({})
+        Transaction.objects.create(
+            transaction_id=str(uuid.uuid4()),
+            client=self.clients[1],
+            transaction_type='BUY',
+            transaction_date=timezone.now(),
+            amount=Decimal(1000),
+            currency='USD'
+        )
+        with self.assertNumQueries(0):
+            response = StatisticsService.get_top({})
+        self.assertEqual(response.data['results'][0]['total_spent'], '300.00')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TransactionStatistics.refresh()
+        response = StatisticsService.get_top({})
+        self.assertEqual(response.data['results'][0]['total_spent'], '1100.00')
+
+    def test_get_top_invalid_params(self):
+        """Test country and group_by are exclusive"""
+        response = StatisticsService.get_top({'country': 'USA', 'group_by': 'country'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_top_uses_indexes(self):
+        """Test per-country leaderboards are index scans"""
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(
+                "EXPLAIN SELECT * FROM transaction_statistics WHERE country = %s "
+                "ORDER BY total_spent DESC, client_id DESC LIMIT 10",
+                ['USA']
+            )
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('transaction_statistics_country_spent_idx', plan)
+        self.assertNotIn('Sort', plan)
@@ -1,23 +1,49 @@
-from api.serializers.transaction import TransactionQuerySerializer, TransactionResponseSerializer
+from api.serializers.transaction import (
+    TransactionBatchQuerySerializer,
+    TransactionQuerySerializer,
+    TransactionResponseSerializer
+)
+from api.serializers.fast import FastRenderer
+from api.responses import RenderedJSONResponse
+from api.cache import transaction_response_cache
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from api.errors import APIErrorMessages
-from core.models import Transaction
+from api.pagination import encode_cursor, next_link_header
+from core.models import Transaction, TransactionLookup
 from rest_framework import status
 from core.logging import logger
+import time
 import uuid
 
+STREAM_CHUNK_SIZE = 2000
+# JSON batch responses are built in memory; larger batches must stream as NDJSON.
+MAX_BATCH_JSON_ROWS = 10000
+TRANSACTION_RENDERER = FastRenderer(TransactionResponseSerializer)
+
 class TransactionService:
     @staticmethod
-    def get_client_transactions(client_id, query_params):
+    def get_client_transactions(client_id, query_params, base_url=None):
         """
         Get transactions for a specific client with optional date filtering.
 
+        Results are ordered by (transaction_date, transaction_id) and paginated
+        with a keyset cursor, so every page costs one index range scan. When
+        more rows exist, a ``Link: <...>; rel="next"`` header points at the
+        next page. Rendered pages are cached per client until the client's
+        data generation is bumped.
+
         Parameters:
         - client_id: UUID
             The unique identifier of the client
         - query_params: Dict
             - start_date: Date (optional)
             - end_date: Date (optional)
+            - page_size: Integer (optional, default 100, max 1000)
+            - cursor: String (optional)
+            - stream: Boolean (optional) stream the full result instead of one page
+        - base_url: String
+            Absolute URL of the request, used to build the next link
 
         Returns:
         - Response object with transactions or error
@@ -61,11 +87,13 @@ class TransactionService:
             )
 
         try:
-            filters = {'client_id': client_id}
-            if start_date := query_serializer.validated_data.get('start_date'):
-                filters['transaction_date__gte'] = start_date
-            if end_date := query_serializer.validated_data.get('end_date'):
-                filters['transaction_date__lte'] = end_date
+            validated_data = query_serializer.validated_data
+            filters = {
+                'client_id': client_id,
+                'start_date': validated_data.get('start_date'),
+                'end_date': validated_data.get('end_date'),
+                'cursor': validated_data.get('cursor'),
+            }
 
             logger.info("Applying transaction filters", extra={
                 'component': 'transaction_service',
@@ -74,17 +102,58 @@ class TransactionService:
                 'filters': filters
             })
 
-            transactions = Transaction.objects.filter(**filters)
-            serializer = TransactionResponseSerializer(transactions, many=True)
+            page_size = validated_data['page_size']
+            transactions = Transaction.objects.filter(client_id=client_id).in_date_range(
+                filters['start_date'], filters['end_date']
+            )
+            if filters['cursor']:
+                transactions = transactions.after(*filters['cursor'])
+            transactions = transactions.order_by('transaction_date', 'transaction_id')
+
+            if validated_data['stream']:
+                logger.info("Streaming transaction results", extra={
+                    'component': 'transaction_service',
+                    'action': 'stream_start',
+                    'client_id': client_id
+                })
+                return StreamingHttpResponse(
+                    TransactionService.stream_transactions(transactions),
+                    content_type='application/json'
+                )
+
+            cache_key = transaction_response_cache.key(client_id, validated_data)
+            cached = transaction_response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Transaction results served from cache", extra={
+                    'component': 'transaction_service',
+                    'action': 'cache_hit',
+                    'client_id': client_id
+                })
+                return TransactionService.page_response(cached['content'], cached['cursor'], base_url)
+
+            started = time.perf_counter()
+            renderer = TRANSACTION_RENDERER
+            rows = list(renderer.values(transactions)[:page_size + 1])
+
+            cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last = dict(zip(renderer.columns, rows[-1]))
+                cursor = encode_cursor([last['transaction_date'].isoformat(), last['transaction_id']])
+
+            content = renderer.render(rows)
+            transaction_response_cache.set(
+                cache_key, (time.perf_counter() - started) * 1000, content=content, cursor=cursor
+            )
 
             logger.info("Transaction results serialized", extra={
                 'component': 'transaction_service',
                 'action': 'serialization_complete',
                 'client_id': client_id,
-                'results_count': len(serializer.data)
+                'results_count': len(rows)
             })
 
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return TransactionService.page_response(content, cursor, base_url)
 
         except Exception as e:
 
@@ -98,4 +167,145 @@ class TransactionService:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    def get_batch_transactions(data):
+        """
+        Get transactions for many clients with one query.
+
+        Clients are matched with ``client_id = ANY(...)`` and the date range
+        prunes partitions, so N per-client requests collapse into a single
+        index scan per partition.
+
+        Parameters:
+        - data: Dict
+            - client_ids: List[UUID]
+            - start_date: Date (optional)
+            - end_date: Date (optional)
+            - format: 'json' (default) or 'ndjson'
+
+        Returns:
+        - Response with ``{client_id: [transactions]}`` (every requested client
+          is present; 400 past ``MAX_BATCH_JSON_ROWS`` transactions), or a
+          streamed NDJSON response with one transaction per line
+        """
+        query_serializer = TransactionBatchQuerySerializer(data=data)
+        if not query_serializer.is_valid():
+            logger.warning("Invalid batch query", extra={
+                'component': 'transaction_service',
+                'action': 'batch_validation_failed',
+                'validation_errors': query_serializer.errors
+            })
+            return Response(
+                {'error': query_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        validated_data = query_serializer.validated_data
+        client_ids = validated_data['client_ids']
+
+        logger.info("Batch transaction query initiated", extra={
+            'component': 'transaction_service',
+            'action': 'batch_query_start',
+            'client_count': len(client_ids),
+            'format': validated_data['format']
+        })
+
+        transactions = Transaction.objects.for_clients(client_ids).in_date_range(
+            validated_data.get('start_date'), validated_data.get('end_date')
+        ).order_by('client_id', 'transaction_date', 'transaction_id')
+        renderer = TRANSACTION_RENDERER
+
+        if validated_data['format'] == 'ndjson':
+            rows = renderer.values(transactions).iterator(chunk_size=STREAM_CHUNK_SIZE)
+            return StreamingHttpResponse(
+                renderer.stream_lines(rows, STREAM_CHUNK_SIZE),
+                content_type='application/x-ndjson'
+            )
+
+        rows = list(renderer.values(transactions[:MAX_BATCH_JSON_ROWS + 1]))
+        if len(rows) > MAX_BATCH_JSON_ROWS:
+            logger.warning("Batch too large for JSON", extra={
+                'component': 'transaction_service',
+                'action': 'batch_too_large',
+                'client_count': len(client_ids),
+                'max_rows': MAX_BATCH_JSON_ROWS
+            })
+            return Response(
+                {'error': APIErrorMessages.BATCH_TOO_LARGE},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        client_column = renderer.columns.index('client_id')
+        groups = {client_id: [] for client_id in client_ids}
+        for row in rows:
+            groups[row[client_column]].append(row)
+
+        logger.info("Batch transaction results serialized", extra={
+            'component': 'transaction_service',
+            'action': 'batch_serialization_complete',
+            'client_count': len(client_ids),
+            'results_count': sum(len(group) for group in groups.values())
+        })
+
+        return RenderedJSONResponse(renderer.render_grouped(groups), status=status.HTTP_200_OK)
+
+    @staticmethod
+    def page_response(content, cursor, base_url):
+        """Wrap a rendered page, linking to the next one when ``cursor`` is set."""
+        headers = next_link_header(base_url or '', cursor) if cursor else None
+        return RenderedJSONResponse(content, status=status.HTTP_200_OK, headers=headers)
+
+    @staticmethod
+    def stream_transactions(transactions, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Render ``transactions`` as a JSON array, one chunk at a time.
+
+        Rows are read through a server-side cursor as ``values_list`` tuples
+        and rendered by ``FastRenderer``, so the joined output is
+        byte-identical to the non-streaming response while memory stays
+        bounded by ``chunk_size``.
+        """
+        rows = TRANSACTION_RENDERER.values(transactions).iterator(chunk_size=chunk_size)
+        return TRANSACTION_RENDERER.stream(rows, chunk_size)
+
+    @staticmethod
+    def get_transaction(transaction_id):
+        """
+        Get a single transaction by id.
+
+        The partition holding the transaction is resolved through the global
+        transaction lookup, so only that partition is queried.
+
+        Parameters:
+        - transaction_id: String
+            The unique identifier of the transaction
+
+        Returns:
+        - Response object with the transaction or error
+        """
+        logger.info("Transaction lookup initiated", extra={
+            'component': 'transaction_service',
+            'action': 'lookup_start',
+            'transaction_id': transaction_id
+        })
+
+        year = TransactionLookup.resolve(transaction_id)
+        transaction = None
+        if year is not None:
+            transaction = Transaction.objects.in_partition_year(year).filter(transaction_id=transaction_id).first()
+
+        if transaction is None:
+            logger.warning("Transaction not found", extra={
+                'component': 'transaction_service',
+                'action': 'lookup_not_found',
+                'transaction_id': transaction_id
+            })
+            return Response(
+                {'error': APIErrorMessages.TRANSACTION_NOT_FOUND},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = TransactionResponseSerializer(transaction)
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,174 @@
+import json
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from core.authentication import local_token_cache
+from core.models import Client, Transaction
+from core.testing import isolated_cache
+
+BASELINES_FILE = Path(__file__).with_name('performance_baselines.json')
+
+# Query budgets are always checked. Latencies depend on the machine, so they
+# are only checked with PERF_TESTS=1, against baselines recorded on the same
+# runner: a measured percentile fails when it exceeds baseline *
+# PERF_TOLERANCE + PERF_SLACK_MS, the slack keeping millisecond-scale
+# endpoints from failing on scheduler noise. UPDATE_PERF_BASELINES=1
+# rewrites the baselines instead.
+PERF_TESTS = os.getenv('PERF_TESTS') == '1'
+PERF_TOLERANCE = float(os.getenv('PERF_TOLERANCE', '2.0'))
+PERF_SLACK_MS = float(os.getenv('PERF_SLACK_MS', '10'))
+UPDATE_BASELINES = os.getenv('UPDATE_PERF_BASELINES') == '1'
+
+CLIENT_COUNT = 200
+TRANSACTIONS_PER_CLIENT = 50
+
+
+def percentiles(samples) -> dict:
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50_ms': round(cuts[49], 2), 'p95_ms': round(cuts[94], 2)}
+
+
+# Throttling is off so the repeated requests measure the endpoints, not 429s.
+@override_settings(THROTTLE_REDIS_URL='')
+@isolated_cache()
+class APIPerformanceTests(APITestCase):
+    """
+    Query budgets and latency baselines for the hot endpoints, against a
+    seeded volume of clients and transactions spread over every partition.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='perfuser', password='perfpass123')
+        cls.token = Token.objects.create(user=cls.user)
+
+        cls.client_ids = [str(uuid.uuid4()) for _ in range(CLIENT_COUNT)]
+        Client.objects.bulk_create([
+            Client(
+                client_id=client_id,
+                name=f'Client {i}',
+                email=f'client{i}@example.com',
+                date_of_birth='1990-01-01',
+                country=['France', 'Germany', 'Spain', 'USA'][i % 4],
+                account_balance=Decimal('1000.00')
+            )
+            for i, client_id in enumerate(cls.client_ids)
+        ])
+
+        start = datetime(2008, 1, 1, tzinfo=dt_timezone.utc)
+        Transaction.objects.bulk_create_in_partitions([
+            {
+                'transaction_id': str(uuid.uuid4()),
+                'client_id': client_id,
+                'transaction_type': 'buy' if j % 3 else 'sell',
+                'transaction_date': start + timedelta(days=97 * j + i),
+                'amount': Decimal('25.00') if j % 3 else Decimal('-10.00'),
+                'currency': 'USD'
+            }
+            for i, client_id in enumerate(cls.client_ids)
+            for j in range(TRANSACTIONS_PER_CLIENT)
+        ])
+
+        with open(BASELINES_FILE) as f:
+            cls.baselines = json.load(f)
+
+    def setUp(self):
+        cache.clear()
+        local_token_cache.clear()
+        self.auth = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+        # Steady state: the token is already cached, as it is for any active user.
+        self.client.get(reverse('clients'), **self.auth)
+
+    def count_queries(self, method, *args, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = method(*args, **kwargs)
+        self.assertLess(response.status_code, 400)
+        return len(queries)
+
+    def assert_query_budget(self, endpoint, small, large):
+        """``small`` and ``large`` issue the same request for a few and for many rows."""
+        budget = self.baselines[endpoint]['queries']
+        small_count = small()
+        large_count = large()
+        self.assertEqual(small_count, large_count, f'{endpoint}: query count grows with the result size (N+1)')
+        self.assertLessEqual(large_count, budget, f'{endpoint}: {large_count} queries, budget is {budget}')
+
+    def assert_latency(self, endpoint, requests):
+        if not (PERF_TESTS or UPDATE_BASELINES):
+            return
+
+        samples = []
+        for request in requests:
+            started = time.perf_counter()
+            response = request()
+            samples.append((time.perf_counter() - started) * 1000)
+            self.assertLess(response.status_code, 400)
+
+        measured = percentiles(samples)
+        if UPDATE_BASELINES:
+            self.update_baseline(endpoint, measured)
+            return
+
+        for name, value in measured.items():
+            limit = self.baselines[endpoint][name] * PERF_TOLERANCE + PERF_SLACK_MS
+            self.assertLessEqual(
+                value, limit,
+                f'{endpoint} {name} is {value} ms, baseline {self.baselines[endpoint][name]} ms'
+            )
+
+    @staticmethod
+    def update_baseline(endpoint, measured):
+        with open(BASELINES_FILE) as f:
+            baselines = json.load(f)
+        baselines[endpoint].update(measured)
+        with open(BASELINES_FILE, 'w') as f:
+            json.dump(baselines, f, indent=2)
+            f.write('\n')
+
+    def test_get_clients(self):
+        url = reverse('clients')
+        self.assert_query_budget(
+            'get_clients',
+            lambda: self.count_queries(self.client.get, url, {'limit': 5}, **self.auth),
+            lambda: self.count_queries(self.client.get, url, {'limit': 200}, **self.auth),
+        )
+        self.assert_latency('get_clients', [
+            lambda limit=limit: self.client.get(url, {'limit': limit}, **self.auth)
+            for limit in [10, 50, 100] * 10
+        ])
+
+    def test_client_transactions(self):
+        url = lambda client_id: reverse('client-transactions', args=[client_id])
+        self.assert_query_budget(
+            'client_transactions',
+            lambda: self.count_queries(self.client.get, url(self.client_ids[0]), {'page_size': 5}, **self.auth),
+            lambda: self.count_queries(self.client.get, url(self.client_ids[1]), {'page_size': 50}, **self.auth),
+        )
+        # A different client per request, so every response is computed rather than cached.
+        self.assert_latency('client_transactions', [
+            lambda client_id=client_id: self.client.get(url(client_id), **self.auth)
+            for client_id in self.client_ids[2:32]
+        ])
+
+    def test_login_user(self):
+        url = reverse('login')
+        credentials = {'username': 'perfuser', 'password': 'perfpass123'}
+        query_count = self.count_queries(self.client.post, url, credentials, format='json')
+        self.assertLessEqual(query_count, self.baselines['login_user']['queries'])
+
+        self.assert_latency('login_user', [
+            lambda: self.client.post(url, credentials, format='json')
+            for _ in range(10)
+        ])
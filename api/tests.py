@@ -1,16 +1,33 @@
 from django.urls import reverse
+from django.core.management import call_command
+from django.test import LiveServerTestCase, override_settings
+from unittest.mock import Mock, patch
+import redis
 from rest_framework import status
 from rest_framework.test import APITestCase
-from django.contrib.auth.models import User
+from django.contrib.auth.models import User, update_last_login
 from rest_framework.authtoken.models import Token
-from core.models import Client, Transaction
+from core.models import Client, SlowQueryPlan, Transaction
+import io
+import json
+import socket
+import tempfile
 import uuid
 from django.utils import timezone
 from api.errors import APIErrorMessages
+from api.serializers import ClientSerializer, TransactionResponseSerializer
+from api.services.transaction_service import TransactionService
+from rest_framework.renderers import JSONRenderer
+from django.core.cache import cache
+from core import metrics
+from core.authentication import CachedTokenAuthentication, _cache_key, local_token_cache
+from core.testing import isolated_cache
 
+@isolated_cache()
 class APITests(APITestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username='testuser', password='testpass123')
         self.token = Token.objects.create(user=self.user)
 
@@ -69,6 +86,300 @@ class APITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, [])
 
+    def test_client_transactions_pagination(self):
+        base_date = timezone.now() - timezone.timedelta(days=10)
+        for day in range(3):
+            Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=self.test_client,
+                transaction_type='sell',
+                transaction_date=base_date + timezone.timedelta(days=day),
+                amount=50.00,
+                currency='EUR'
+            )
+        url = reverse('client-transactions', args=[self.client_id])
+
+        response = self.client.get(url, {'page_size': 3}, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        self.assertIn('rel="next"', response['Link'])
+
+        next_url = response['Link'].split(';')[0].strip('<>')
+        response = self.client.get(next_url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['transaction_id'], self.transaction.transaction_id)
+        self.assertFalse(response.has_header('Link'))
+
+    def test_client_transactions_invalid_cursor(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        response = self.client.get(url, {'cursor': 'not-a-cursor'}, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(APIErrorMessages.INVALID_CURSOR, response.data['error']['cursor'])
+
+    def test_client_transactions_page_size_cap(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        response = self.client.get(url, {'page_size': 1001}, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_client_transactions_stream_matches_serializer_output(self):
+        for day in range(3):
+            Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=self.test_client,
+                transaction_type='sell',
+                transaction_date=timezone.now() - timezone.timedelta(days=day + 1),
+                amount=12.30,
+                currency='EUR'
+            )
+        url = reverse('client-transactions', args=[self.client_id])
+
+        response = self.client.get(url, {'stream': 'true'}, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        transactions = Transaction.objects.filter(client_id=self.client_id).order_by('transaction_date', 'transaction_id')
+        expected = JSONRenderer().render(TransactionResponseSerializer(transactions, many=True).data)
+        self.assertEqual(b''.join(response.streaming_content), expected)
+        self.assertEqual(b''.join(TransactionService.stream_transactions(transactions, chunk_size=1)), expected)
+
+    def test_client_transactions_stream_empty(self):
+        url = reverse('client-transactions', args=[str(uuid.uuid4())])
+        response = self.client.get(url, {'stream': 'true'}, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+    def test_client_transactions_cached_until_generation_bump(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        transaction = Transaction(
+            transaction_id=str(uuid.uuid4()),
+            client=self.test_client,
+            transaction_type='sell',
+            transaction_date=timezone.now() - timezone.timedelta(days=1),
+            amount=10.00,
+            currency='USD'
+        )
+        Transaction.objects.bulk_create([transaction])
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(metrics.snapshot()['response_cache_hits_total'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transaction.save()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(metrics.snapshot()['response_cache_misses_total'], 2)
+        self.assertIn(b'response_cache_hit_ratio 0.333333', self.client.get(reverse('metrics')).content)
+
+    def test_client_transactions_cache_invalidated_by_delete(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        self.assertEqual(len(self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}').data), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.transaction.delete()
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}').data, [])
+
+        Transaction.objects.create(
+            transaction_id=str(uuid.uuid4()),
+            client=self.test_client,
+            transaction_type='sell',
+            transaction_date=timezone.now(),
+            amount=10.00,
+            currency='USD'
+        )
+        self.assertEqual(len(self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}').data), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Transaction.objects.filter(client_id=self.client_id).delete()
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}').data, [])
+
+    def test_client_transactions_cache_invalidated_by_client_change(self):
+        other = Client.objects.create(
+            client_id=str(uuid.uuid4()),
+            name='Other Client',
+            email='other@example.com',
+            date_of_birth='1990-01-01',
+            country='Testland',
+            account_balance=0
+        )
+        url = reverse('client-transactions', args=[self.client_id])
+        self.assertEqual(len(self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}').data), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.transaction.client = other
+            self.transaction.save()
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}').data, [])
+
+    def test_request_metrics(self):
+        response = self.client.get(reverse('clients'), HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        text = self.client.get(reverse('metrics')).content.decode()
+
+        self.assertIn('http_request_duration_seconds_count{method="GET",status="200",view="clients"} 1', text)
+        self.assertIn('http_request_queries_count{method="GET",view="clients"} 1', text)
+        self.assertIn('http_request_query_duration_seconds_count{method="GET",view="clients"} 1', text)
+        self.assertIn('http_response_render_duration_seconds_count{method="GET",view="clients"} 1', text)
+        self.assertIn(f'http_response_size_bytes_sum{{method="GET",view="clients"}} {len(response.content)}.000000', text)
+
+    @override_settings(SLOW_QUERY_PLAN_THRESHOLD_MS=0.001, SLOW_QUERY_PLAN_SAMPLE_RATE=1)
+    def test_slow_query_plans_captured_once_per_fingerprint(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        plans = SlowQueryPlan.objects.filter(endpoint='client-transactions', sql__contains='"core_transaction"')
+        self.assertEqual(plans.count(), 1)
+        plan = plans.get()
+        self.assertNotIn(self.client_id, plan.sql)
+        self.assertTrue(plan.relations_scanned)
+        self.assertTrue(all(name.startswith('transactions_') for name in plan.relations_scanned))
+        self.assertIn('Actual Total Time', plan.plan[0]['Plan'])
+
+        self.client.get(url, {'page_size': 5}, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(plans.count(), 1)
+
+    @override_settings(SLOW_QUERY_PLAN_THRESHOLD_MS=0.001, SLOW_QUERY_PLAN_SAMPLE_RATE=1)
+    def test_slow_query_plans_pruned_after_retention(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        SlowQueryPlan.objects.update(captured_at=timezone.now() - timezone.timedelta(days=30))
+        stale = set(SlowQueryPlan.objects.values_list('id', flat=True))
+        self.assertTrue(stale)
+
+        cache.clear()
+        self.client.get(reverse('clients'), HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertTrue(SlowQueryPlan.objects.exists())
+        self.assertFalse(SlowQueryPlan.objects.filter(id__in=stale).exists())
+
+    def test_client_transactions_etag(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.get(url, {'page_size': 5}, HTTP_AUTHORIZATION=f'Token {self.token.key}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.transaction.save()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_client_transactions_etag_changes_on_delete(self):
+        url = reverse('client-transactions', args=[self.client_id])
+        etag = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.transaction.delete()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data, [])
+
+    def test_get_clients_etag(self):
+        url = reverse('clients')
+        etag = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')['ETag']
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_client.save()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_fast_rendering_matches_serializer_output(self):
+        Transaction.objects.create(
+            transaction_id=str(uuid.uuid4()),
+            client=self.test_client,
+            transaction_type='sell',
+            transaction_date=timezone.now() - timezone.timedelta(days=400),
+            amount=-1234.5,
+            currency='EUR'
+        )
+        url = reverse('client-transactions', args=[self.client_id])
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        transactions = Transaction.objects.filter(client_id=self.client_id).order_by('transaction_date', 'transaction_id')
+        self.assertEqual(response.content, JSONRenderer().render(TransactionResponseSerializer(transactions, many=True).data))
+
+        response = self.client.get(reverse('clients'), HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.content, JSONRenderer().render(ClientSerializer(Client.objects.all(), many=True).data))
+
+    def test_batch_transactions_grouped_by_client(self):
+        other_client = Client.objects.create(
+            client_id=str(uuid.uuid4()),
+            name='Other Client',
+            email='otherclient@example.com',
+            date_of_birth='1990-01-01',
+            country='Testland',
+            account_balance=0
+        )
+        for day in range(2):
+            Transaction.objects.create(
+                transaction_id=str(uuid.uuid4()),
+                client=other_client,
+                transaction_type='sell',
+                transaction_date=timezone.now() - timezone.timedelta(days=day + 1),
+                amount=5.00,
+                currency='EUR'
+            )
+        missing_client_id = str(uuid.uuid4())
+        url = reverse('transactions-batch')
+        body = {'client_ids': [self.client_id, other_client.client_id, missing_client_id]}
+
+        response = self.client.post(url, body, format='json', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), body['client_ids'])
+        self.assertEqual(len(response.data[self.client_id]), 1)
+        self.assertEqual(len(response.data[other_client.client_id]), 2)
+        self.assertEqual(response.data[missing_client_id], [])
+
+        response = self.client.post(url, {**body, 'format': 'ndjson'}, format='json', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+
+        transactions = Transaction.objects.filter(client_id=other_client.client_id).order_by('transaction_date', 'transaction_id')
+        self.assertEqual(
+            lines[1:] if self.client_id < other_client.client_id else lines[:2],
+            [JSONRenderer().render(item).decode() for item in TransactionResponseSerializer(transactions, many=True).data]
+        )
+
+    def test_batch_transactions_json_row_cap(self):
+        url = reverse('transactions-batch')
+        body = {'client_ids': [self.client_id]}
+        with patch('api.services.transaction_service.MAX_BATCH_JSON_ROWS', 0):
+            response = self.client.post(url, body, format='json', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['error'], APIErrorMessages.BATCH_TOO_LARGE)
+
+            response = self.client.post(url, {**body, 'format': 'ndjson'}, format='json',
+                                        HTTP_AUTHORIZATION=f'Token {self.token.key}')
+            self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 1)
+
+    def test_batch_transactions_invalid_client_id(self):
+        url = reverse('transactions-batch')
+        response = self.client.post(url, {'client_ids': ['not-a-uuid']}, format='json', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(APIErrorMessages.INVALID_CLIENT_ID, str(response.data['error']['client_ids']))
+
+    def test_get_transaction_success(self):
+        url = reverse('transaction-detail', args=[self.transaction.transaction_id])
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['transaction_id'], self.transaction.transaction_id)
+        self.assertEqual(response.data['client'], self.client_id)
+
+    def test_get_transaction_not_found(self):
+        url = reverse('transaction-detail', args=[str(uuid.uuid4())])
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], APIErrorMessages.TRANSACTION_NOT_FOUND)
+
     def test_login_user_success(self):
         url = reverse('login')
         response = self.client.post(url, {'username': 'testuser', 'password': 'testpass123'}, format='json')
@@ -93,3 +404,138 @@ class APITests(APITestCase):
         response = self.client.get(url, HTTP_AUTHORIZATION='Token invalid_token')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertEqual('Invalid token.', response.data['detail'])
+
+    def test_cached_token_authentication(self):
+        authentication = CachedTokenAuthentication()
+        user, token = authentication.authenticate_credentials(self.token.key)
+        self.assertEqual((user, token), (self.user, self.token))
+        self.assertEqual(user.password, '')
+        self.assertNotIn('password', str(local_token_cache.get(_cache_key(self.token.key))))
+
+        local_token_cache.clear()
+        with self.assertNumQueries(0):
+            authentication.authenticate_credentials(self.token.key)
+            user, _ = authentication.authenticate_credentials(self.token.key)
+        self.assertEqual(user.username, 'testuser')
+
+    def test_cached_token_invalidated_on_delete_and_deactivation(self):
+        url = reverse('client-statistics', args=[self.client_id])
+        self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        # Logins only update last_login and keep the cached entry.
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            update_last_login(None, self.user)
+        self.assertEqual(callbacks, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = True
+            self.user.save()
+        self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual('Invalid token.', response.data['detail'])
+
+    @override_settings(THROTTLE_RATES={
+        'default': {'anon': '100/day', 'user': '2/minute', 'staff': '120/minute'},
+        'client-transactions': {'user': '1/minute'},
+    })
+    def test_token_bucket_throttle(self):
+        auth = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+        statistics_url = reverse('client-statistics', args=[self.client_id])
+        transactions_url = reverse('client-transactions', args=[self.client_id])
+
+        self.assertNotEqual(self.client.get(statistics_url, **auth).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertNotEqual(self.client.get(statistics_url, **auth).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self.client.get(statistics_url, **auth)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+        # Endpoints with their own rate have their own bucket
+        self.assertEqual(self.client.get(transactions_url, **auth).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(transactions_url, **auth).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(
+        THROTTLE_RATES={'default': {'user': '100/minute'}, 'client-transactions': {'user': '100/minute'}},
+        THROTTLE_DAILY_RATES={'user': '2/day'}
+    )
+    def test_daily_quota_shared_across_endpoints(self):
+        auth = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+        self.assertNotEqual(self.client.get(reverse('client-statistics', args=[self.client_id]), **auth).status_code,
+                            status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(reverse('client-transactions', args=[self.client_id]), **auth).status_code,
+                         status.HTTP_200_OK)
+        response = self.client.get(reverse('client-transactions', args=[self.client_id]), **auth)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response['Retry-After']), 3600)
+
+    @override_settings(THROTTLE_RATES={'default': {'anon': '1/day', 'user': '1/day', 'staff': '1/day'}})
+    def test_token_bucket_throttle_fails_open(self):
+        url = reverse('client-statistics', args=[self.client_id])
+        with patch('core.throttle._token_bucket', return_value=Mock(side_effect=redis.ConnectionError)):
+            for _ in range(3):
+                response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+                self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+@override_settings(THROTTLE_REDIS_URL='')
+@isolated_cache()
+class LoadTestCommandTests(LiveServerTestCase):
+    def setUp(self):
+        client = Client.objects.create(
+            client_id=str(uuid.uuid4()),
+            name='Load Client',
+            email='load@example.com',
+            date_of_birth='1990-01-01',
+            country='Testland',
+            account_balance=1000.00
+        )
+        Transaction.objects.create(
+            transaction_id=str(uuid.uuid4()),
+            client=client,
+            transaction_type='buy',
+            transaction_date=timezone.now() - timezone.timedelta(days=1),
+            amount=100.00,
+            currency='USD'
+        )
+
+    def test_loadtest_report(self):
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'loadtest', base_url=self.live_server_url, duration=1, concurrency=2, users=1,
+                mix='clients=1,client-transactions=1,transaction-detail=1', seed=1, output=output.name,
+                stdout=io.StringIO()
+            )
+            report = json.load(output)
+
+        self.assertGreater(report['requests'], 0)
+        self.assertEqual(report['error_rate'], 0)
+        self.assertEqual(report['throttle_rate'], 0)
+        self.assertEqual(set(report['endpoints']), {'clients', 'client-transactions', 'transaction-detail'})
+        self.assertIn('p95', report['latency_ms'])
+        self.assertEqual(report['requests'], sum(endpoint['requests'] for endpoint in report['endpoints'].values()))
+        self.assertEqual(report['status_codes'], {'200': report['requests']})
+        self.assertFalse(User.objects.filter(username__startswith='loadtest_').exists())
+        self.assertFalse(Token.objects.exists())
+
+    def test_loadtest_counts_timeouts_as_errors(self):
+        # Accepts connections (through the backlog) but never answers.
+        with socket.create_server(('127.0.0.1', 0)) as server, \
+                tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'loadtest', base_url=f'http://127.0.0.1:{server.getsockname()[1]}', duration=0.5, concurrency=2,
+                users=1, mix='clients=1', timeout=0.1, output=output.name, stdout=io.StringIO()
+            )
+            report = json.load(output)
+
+        self.assertGreater(report['requests'], 0)
+        self.assertEqual(report['status_codes'], {'error': report['requests']})
+        self.assertEqual(report['error_rate'], 1)
+        self.assertFalse(User.objects.filter(username__startswith='loadtest_').exists())
@@ -1,5 +1,18 @@
 from django.urls import path, include
-from .views import client_transactions, get_clients, login_user, register_user
+from .views import (
+    batch_transactions,
+    client_balance,
+    client_statistics,
+    client_transactions,
+    get_clients,
+    get_transaction,
+    list_statistics,
+    login_user,
+    register_user,
+    top_statistics,
+    transaction_activity,
+    transaction_analytics,
+)
 
 urlpatterns = [
     path('auth/', include([
@@ -10,5 +23,19 @@ urlpatterns = [
     path('clients/', include([
         path('', get_clients, name='clients'),
         path('<str:client_id>/transactions/', client_transactions, name='client-transactions'),
+        path('<str:client_id>/statistics/', client_statistics, name='client-statistics'),
+        path('<str:client_id>/balance/', client_balance, name='client-balance'),
     ])),
+
+    path('transactions/', include([
+        path('batch/', batch_transactions, name='transactions-batch'),
+        path('<str:transaction_id>/', get_transaction, name='transaction-detail'),
+    ])),
+
+    path('statistics/', include([
+        path('', list_statistics, name='statistics'),
+        path('top/', top_statistics, name='statistics-top'),
+    ])),
+    path('activity/', transaction_activity, name='activity'),
+    path('analytics/', transaction_analytics, name='analytics'),
 ]
@@ -1,15 +1,25 @@
 from rest_framework.decorators import api_view, permission_classes, authentication_classes, throttle_classes
-from api.serializers import UserSerializer, TokenResponseSerializer, ErrorResponseSerializer
+from api.serializers import UserSerializer, TokenResponseSerializer, ErrorResponseSerializer, TransactionBatchQuerySerializer
 from api.serializers.transaction import TransactionResponseSerializer
 from api.services.transaction_service import TransactionService
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from api.serializers.client import ClientSerializer
 from .services.client_service import ClientService
+from api.services.statistics_service import StatisticsService
+from api.services.activity_service import ActivityService
+from api.serializers.activity import ActivitySerializer
+from api.services.analytics_service import AnalyticsService
+from api.serializers.analytics import AnalyticsSerializer
+from api.services.balance_service import BalanceService
+from api.serializers.balance import BalanceHistorySerializer
+from api.serializers.statistics import LeaderboardEntrySerializer, TransactionStatisticsSerializer
 from api.services.auth_service import AuthService
 from drf_yasg.utils import swagger_auto_schema
-from core.throttle import CustomRateThrottle
+from core.authentication import CachedTokenAuthentication
+from core.throttle import TokenBucketThrottle
 from drf_yasg import openapi
+from django.views.decorators.http import condition
+from api.conditional import client_transactions_etag, clients_etag
 
 @swagger_auto_schema(
     method='post',
@@ -38,7 +48,7 @@ def login_user(request):
     operation_description="Register new user endpoint."
 )
 @api_view(['POST'])
-@throttle_classes([CustomRateThrottle])
+@throttle_classes([TokenBucketThrottle])
 def register_user(request):
     """
     Register a new user account.
@@ -70,24 +80,102 @@ def register_user(request):
             description="End date (YYYY-MM-DD)",
             required=False
         ),
+        openapi.Parameter(
+            'page_size',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_INTEGER,
+            description="Number of transactions per page (default 100, max 1000)",
+            required=False
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Opaque cursor taken from the `Link: rel=\"next\"` header of the previous page",
+            required=False
+        ),
+        openapi.Parameter(
+            'stream',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_BOOLEAN,
+            description="Stream every matching transaction as a single JSON array (ignores page_size)",
+            required=False
+        ),
     ],
     responses={
         200: TransactionResponseSerializer(many=True),
+        304: 'Not Modified (If-None-Match matches the current ETag)',
         400: ErrorResponseSerializer,
         401: 'Unauthorized',
         404: ErrorResponseSerializer,
     },
-    operation_description="Get transactions for a specific client with optional date filtering."
+    operation_description="Get transactions for a specific client with optional date filtering, ordered by date and paginated with a cursor."
 )
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
-@throttle_classes([CustomRateThrottle])
+@throttle_classes([TokenBucketThrottle])
+@condition(etag_func=client_transactions_etag)
 def client_transactions(request, client_id):
     """
     Get client transactions with optional date filtering.
     """
-    return TransactionService.get_client_transactions(client_id, request.query_params)
+    return TransactionService.get_client_transactions(client_id, request.query_params, request.build_absolute_uri())
+
+@swagger_auto_schema(
+    method='post',
+    request_body=TransactionBatchQuerySerializer,
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+    ],
+    responses={
+        200: 'Transactions grouped by client id, or NDJSON with one transaction per line',
+        400: ErrorResponseSerializer,
+        401: 'Unauthorized',
+    },
+    operation_description="Get transactions for many clients in one request, optionally filtered by date."
+)
+@api_view(['POST'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def batch_transactions(request):
+    """
+    Get transactions for a list of clients.
+    """
+    return TransactionService.get_batch_transactions(request.data)
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+    ],
+    responses={
+        200: TransactionResponseSerializer,
+        401: 'Unauthorized',
+        404: ErrorResponseSerializer,
+    },
+    operation_description="Get a single transaction by its transaction_id."
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def get_transaction(request, transaction_id):
+    """
+    Get a single transaction by id.
+    """
+    return TransactionService.get_transaction(transaction_id)
 
 @swagger_auto_schema(
     method='get',
@@ -102,7 +190,7 @@ def client_transactions(request, client_id):
             'limit',
             openapi.IN_QUERY,
             type=openapi.TYPE_INTEGER,
-            description="Limit the number of clients returned",
+            description="Number of clients per page (default 10, max 999)",
             required=False
         ),
         openapi.Parameter(
@@ -126,6 +214,20 @@ def client_transactions(request, client_id):
             description="Filter clients by country",
             required=False
         ),
+        openapi.Parameter(
+            'search',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Fuzzy search on name and email, results ranked by similarity (typo tolerant)",
+            required=False
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Opaque cursor taken from the `Link: rel=\"next\"` header of the previous page (not with search)",
+            required=False
+        ),
         openapi.Parameter(
             'min_balance',
             openapi.IN_QUERY,
@@ -157,17 +259,336 @@ def client_transactions(request, client_id):
     ],
     responses={
         200: ClientSerializer(many=True),
+        304: 'Not Modified (If-None-Match matches the current ETag)',
         400: ErrorResponseSerializer,
         401: 'Unauthorized',
     },
-    operation_description="Get all clients with optional filtering."
+    operation_description="Get all clients with optional filtering, ordered by client_id and paginated with a cursor."
 )
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
-@throttle_classes([CustomRateThrottle])
+@throttle_classes([TokenBucketThrottle])
+@condition(etag_func=clients_etag)
 def get_clients(request):
     """
     Get all clients with optional filtering.
     """
-    return ClientService.get_clients(request.query_params)
\ No newline at end of file
+    return ClientService.get_clients(request.query_params, request.build_absolute_uri())
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+        openapi.Parameter(
+            'at',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Balance at this time, inclusive (ISO datetime, defaults to now)",
+            required=False
+        ),
+        openapi.Parameter(
+            'start',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Inclusive start of the balance history (ISO datetime)",
+            required=False
+        ),
+        openapi.Parameter(
+            'end',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Exclusive end of the balance history (ISO datetime)",
+            required=False
+        ),
+        openapi.Parameter(
+            'page_size',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_INTEGER,
+            description="Ledger entries per page (default 100, max 1000)",
+            required=False
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Opaque cursor from the Link header of the previous page",
+            required=False
+        ),
+    ],
+    responses={
+        200: openapi.Response('Balance at a time, or the balance history with start/end', BalanceHistorySerializer),
+        400: ErrorResponseSerializer,
+        401: 'Unauthorized',
+        404: ErrorResponseSerializer,
+    },
+    operation_description=(
+        "Get a client's balance (account_balance minus the running total of its transaction amounts: BUYs spend, "
+        "SELLs bring money in) at a point in time, or every ledger entry of a range with the balance after it."
+    )
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def client_balance(request, client_id):
+    """
+    Get the balance of a client at a time or over a range.
+    """
+    return BalanceService.get_balance(client_id, request.query_params, request.build_absolute_uri())
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+    ],
+    responses={
+        200: TransactionStatisticsSerializer,
+        400: ErrorResponseSerializer,
+        401: 'Unauthorized',
+        404: ErrorResponseSerializer,
+    },
+    operation_description="Get a client's lifetime transaction totals and when they were last refreshed."
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def client_statistics(request, client_id):
+    """
+    Get the transaction statistics of a client.
+    """
+    return StatisticsService.get_client_statistics(client_id)
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+        openapi.Parameter(
+            'sort',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            enum=['client_id', 'total_spent', '-total_spent', 'total_gained', '-total_gained'],
+            description="Sort key, '-' prefix for descending (default client_id)",
+            required=False
+        ),
+        openapi.Parameter(
+            'page_size',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_INTEGER,
+            description="Number of clients per page (default 100, max 1000)",
+            required=False
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Opaque cursor taken from the `Link: rel=\"next\"` header of the previous page",
+            required=False
+        ),
+    ],
+    responses={
+        200: TransactionStatisticsSerializer(many=True),
+        400: ErrorResponseSerializer,
+        401: 'Unauthorized',
+    },
+    operation_description="List client transaction totals, sorted and paginated with a cursor, with the time of the last refresh."
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def list_statistics(request):
+    """
+    List transaction statistics of all clients.
+    """
+    return StatisticsService.get_statistics(request.query_params, request.build_absolute_uri())
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+        openapi.Parameter(
+            'metric',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            enum=['total_spent', 'total_gained'],
+            description="Total to rank clients by, highest first (default total_spent)",
+            required=False
+        ),
+        openapi.Parameter(
+            'limit',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_INTEGER,
+            description="Number of clients per group (default 10, max 100)",
+            required=False
+        ),
+        openapi.Parameter(
+            'country',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Only rank clients of this country",
+            required=False
+        ),
+        openapi.Parameter(
+            'group_by',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            enum=['country'],
+            description="Return the top clients of every country",
+            required=False
+        ),
+    ],
+    responses={
+        200: LeaderboardEntrySerializer(many=True),
+        400: ErrorResponseSerializer,
+        401: 'Unauthorized',
+    },
+    operation_description=(
+        "Top clients by total spent or gained, overall, for one country or per country. "
+        "Answers come from the statistics view and are cached until its next refresh."
+    )
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def top_statistics(request):
+    """
+    Get the top clients by transaction totals.
+    """
+    return StatisticsService.get_top(request.query_params)
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+        openapi.Parameter(
+            'bucket',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            enum=['day', 'month'],
+            description="Bucket size (default day)",
+            required=False
+        ),
+        openapi.Parameter(
+            'client_id',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Restrict to one client",
+            required=False
+        ),
+        openapi.Parameter(
+            'currency',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Restrict to one currency",
+            required=False
+        ),
+        openapi.Parameter(
+            'start',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Inclusive start (YYYY-MM-DD or ISO datetime, UTC by default)",
+            required=False
+        ),
+        openapi.Parameter(
+            'end',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Exclusive end (YYYY-MM-DD or ISO datetime, UTC by default)",
+            required=False
+        ),
+    ],
+    responses={
+        200: ActivitySerializer(many=True),
+        400: ErrorResponseSerializer,
+        401: 'Unauthorized',
+    },
+    operation_description="Transaction counts and totals per day or month, currency and type, served from the rollup tables."
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def transaction_activity(request):
+    """
+    Get bucketed transaction activity.
+    """
+    return ActivityService.get_activity(request.query_params)
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'Authorization',
+            openapi.IN_HEADER,
+            description="Token for authorization. Format: 'Token <your_token_here>'",
+            type=openapi.TYPE_STRING
+        ),
+        openapi.Parameter(
+            'client_id',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Restrict to one client (all clients by default)",
+            required=False
+        ),
+        openapi.Parameter(
+            'start',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="First month to include (YYYY-MM-DD, any day of the month)",
+            required=False
+        ),
+        openapi.Parameter(
+            'end',
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Last month to include (YYYY-MM-DD, any day of the month)",
+            required=False
+        ),
+    ],
+    responses={
+        200: AnalyticsSerializer,
+        400: ErrorResponseSerializer,
+        401: 'Unauthorized',
+    },
+    operation_description=(
+        "Approximate amount percentiles (KLL, rank error 1.65% at 99% confidence) and distinct counts "
+        "(HyperLogLog, 1.6% relative standard error) merged from monthly sketches."
+    )
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([TokenBucketThrottle])
+def transaction_analytics(request):
+    """
+    Get approximate transaction analytics.
+    """
+    return AnalyticsService.get_analytics(request.query_params)
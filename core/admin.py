@@ -2,9 +2,12 @@ from django.contrib import admin
 from django.urls import path
 from django.template.response import TemplateResponse
 from django.db import connection
+from django.utils.html import format_html
+import json
 from core.models.etl_job import ETLJob
 from core.models.view import MaterializedViewRefresh
 from core.models.transaction_statistics_view import TransactionStatistics
+from core.models.slow_query_plan import SlowQueryPlan
 
 @admin.register(ETLJob)
 class ETLJobAdmin(admin.ModelAdmin):
@@ -59,4 +62,31 @@ class TransactionStatisticsAdmin(admin.ModelAdmin):
         return False
 
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+@admin.register(SlowQueryPlan)
+class SlowQueryPlanAdmin(admin.ModelAdmin):
+    list_display = ['endpoint', 'duration_ms', 'partitions', 'short_sql', 'captured_at']
+    list_filter = ['endpoint']
+    search_fields = ['fingerprint', 'sql']
+    ordering = ['-duration_ms']
+    fields = ['endpoint', 'duration_ms', 'captured_at', 'fingerprint', 'relations_scanned', 'sql', 'formatted_plan']
+    readonly_fields = fields
+
+    @admin.display(description='Relations scanned')
+    def partitions(self, obj):
+        return ', '.join(obj.relations_scanned)
+
+    @admin.display(description='SQL')
+    def short_sql(self, obj):
+        return obj.sql if len(obj.sql) <= 120 else f"{obj.sql[:120]}..."
+
+    @admin.display(description='Plan')
+    def formatted_plan(self, obj):
+        return format_html('<pre>{}</pre>', json.dumps(obj.plan, indent=2))
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+TOKEN_CACHE_KEY = 'auth:token:{}'
+
+# User fields kept in the cache: what permissions and throttling read, never
+# the password hash or other personal data.
+CACHED_USER_FIELDS = ('pk', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+class LocalTTLCache:
+    """Thread-safe in-process LRU whose entries also expire after ``timeout`` seconds."""
+
+    def __init__(self, size: int, timeout: float):
+        self.size = size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_token_cache = LocalTTLCache(settings.AUTH_TOKEN_LOCAL_CACHE_SIZE, settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT)
+
+
+def _cache_key(key: str) -> str:
+    # Hashed so raw tokens never appear in the shared cache.
+    return TOKEN_CACHE_KEY.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+def invalidate_tokens(keys):
+    """Drop ``keys`` from this process's cache and from the shared cache."""
+    cache_keys = [_cache_key(key) for key in keys]
+    for cache_key in cache_keys:
+        local_token_cache.delete(cache_key)
+    cache.delete_many(cache_keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that resolves tokens from a two-tier cache.
+
+    Lookups hit an in-process LRU first, then the shared cache (Redis), and
+    only query ``Token`` and ``User`` on a miss, so authenticated requests
+    normally cost no database query. Only ``CACHED_USER_FIELDS`` are cached
+    and unsaved ``User``/``Token`` instances are rebuilt from them per
+    request. Entries are dropped when the token is deleted or its user is
+    saved (deactivated, password changed, ...); other processes may keep
+    serving a revoked token from their local tier for up to
+    ``AUTH_TOKEN_LOCAL_CACHE_TIMEOUT`` seconds.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = _cache_key(key)
+        credentials = local_token_cache.get(cache_key)
+        if credentials is None:
+            credentials = cache.get(cache_key)
+            if credentials is None:
+                user, _ = super().authenticate_credentials(key)
+                credentials = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+                cache.set(cache_key, credentials, timeout=settings.AUTH_TOKEN_CACHE_TIMEOUT)
+            local_token_cache.set(cache_key, credentials)
+
+        if not credentials['is_active']:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        user = get_user_model()(**credentials)
+        return user, Token(key=key, user=user)
@@ -1,36 +1,119 @@
+import atexit
 import logging
 import os
 import json
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from collections.abc import Mapping
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from django.conf import settings
 
-class CustomFormatter(logging.Formatter):
-    def format(self, record):
+# Caps applied to everything a record carries, so formatting cost and line
+# size stay bounded whatever callers pass in ``extra``.
+MAX_STRING_LENGTH = 2000
+MAX_COLLECTION_ITEMS = 20
+MAX_DEPTH = 4
+MAX_LINE_LENGTH = 32 * 1024
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``.
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+def bounded(value, depth=0):
+    """
+    Return a JSON-ready copy of ``value`` within the size caps.
+
+    Long strings are cut with a marker, mappings keep their first
+    ``MAX_COLLECTION_ITEMS`` entries, and larger sequences are replaced by an
+    evenly spaced sample together with their total length. Only the retained
+    items are visited, so the cost does not depend on the input size.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if len(value) <= MAX_STRING_LENGTH:
+            return value
+        return f"{value[:MAX_STRING_LENGTH]}...[{len(value) - MAX_STRING_LENGTH} more chars]"
+    if depth >= MAX_DEPTH:
+        return bounded(str(value), depth)
+
+    if isinstance(value, Mapping):
+        items = dict(
+            (str(key), bounded(item, depth + 1))
+            for key, item in islice(value.items(), MAX_COLLECTION_ITEMS)
+        )
+        if len(value) > MAX_COLLECTION_ITEMS:
+            items['_truncated'] = len(value) - MAX_COLLECTION_ITEMS
+        return items
+    if isinstance(value, (list, tuple, range)):
+        if len(value) <= MAX_COLLECTION_ITEMS:
+            return [bounded(item, depth + 1) for item in value]
+        step = len(value) / MAX_COLLECTION_ITEMS
+        return {
+            '_total': len(value),
+            '_sample': [bounded(value[int(i * step)], depth + 1) for i in range(MAX_COLLECTION_ITEMS)],
+        }
+    if isinstance(value, (set, frozenset)):
+        items = [bounded(item, depth + 1) for item in islice(value, MAX_COLLECTION_ITEMS)]
+        return items if len(value) <= MAX_COLLECTION_ITEMS else {'_total': len(value), '_sample': items}
+    return bounded(str(value), depth)
+
+def record_extras(record) -> dict:
+    """The ``extra`` fields of ``record``, bounded."""
+    return {
+        key: bounded(value)
+        for key, value in vars(record).items()
+        if key not in RECORD_ATTRIBUTES and not key.startswith('_')
+    }
 
-        message = f"{self.formatTime(record)} - {record.levelname} - {record.getMessage()}"
+class StructuredFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message and every
+    ``extra`` field, bounded by ``bounded`` and serialized once. A line that
+    still exceeds ``MAX_LINE_LENGTH`` keeps its message and drops the extras.
+    """
 
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': bounded(record.getMessage()),
+            **record_extras(record),
+        }
+        line = json.dumps(entry, default=str, ensure_ascii=False)
+        if len(line) > MAX_LINE_LENGTH:
+            entry = {key: entry[key] for key in ('time', 'level', 'logger', 'message')}
+            entry['_truncated'] = 'extra fields exceeded the line size limit'
+            line = json.dumps(entry, default=str, ensure_ascii=False)
+        return line
 
-        etl_fields = [
-            ('component', 'Component'),
-            ('action', 'Action'),
-            ('job_id', 'Job ID'),
-            ('model', 'Model'),
-            ('file_path', 'File Path'),
-            ('chunk_size', 'Chunk Size'),
-            ('chunk_index', 'Chunk Index'),
-            ('row_count', 'Row Count'),
-            ('records_created', 'Records Created'),
-            ('records_failed', 'Records Failed'),
-            ('validation_failed_count', 'Validation Failed Count'),
-            ('validation_errors', 'Validation Errors'),
-            ('statistics', 'Statistics'),
-            ('error', 'Error')
-        ]
+class CustomFormatter(logging.Formatter):
+    """Human readable console format, with the same caps as ``StructuredFormatter``."""
+
+    etl_fields = [
+        ('component', 'Component'),
+        ('action', 'Action'),
+        ('job_id', 'Job ID'),
+        ('model', 'Model'),
+        ('file_path', 'File Path'),
+        ('chunk_size', 'Chunk Size'),
+        ('chunk_index', 'Chunk Index'),
+        ('row_count', 'Row Count'),
+        ('records_created', 'Records Created'),
+        ('records_failed', 'Records Failed'),
+        ('validation_failed_count', 'Validation Failed Count'),
+        ('validation_errors', 'Validation Errors'),
+        ('statistics', 'Statistics'),
+        ('error', 'Error')
+    ]
 
+    def format(self, record):
+        message = f"{self.formatTime(record)} - {record.levelname} - {bounded(record.getMessage())}"
 
-        for field, label in etl_fields:
+        for field, label in self.etl_fields:
             if hasattr(record, field):
-                value = getattr(record, field)
+                value = bounded(getattr(record, field))
                 if isinstance(value, (dict, list)):
                     message += f"\n{label}: {json.dumps(value, indent=2, default=str)}"
                 else:
@@ -38,6 +121,53 @@ class CustomFormatter(logging.Formatter):
 
         return message
 
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hand records to a background writer through a bounded queue.
+
+    When the queue is full, the ``drop`` policy discards the record and counts
+    it in ``dropped``, so callers never wait on log I/O; the ``block`` policy
+    waits for room instead, so no record is lost.
+    """
+
+    def __init__(self, maxsize: int, policy: str = 'drop'):
+        if policy not in ('drop', 'block'):
+            raise ValueError(f"Unknown log queue policy '{policy}'")
+        super().__init__(queue.Queue(maxsize))
+        self.policy = policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Queue a detached snapshot: the standard fields, the merged message
+        # and the bounded ``record_extras``. Formatting is left to the writer
+        # thread, but it never sees caller objects (which may change after
+        # the call) and a huge extra never sits in the queue. The traceback
+        # is released since it is never written.
+        attributes = {key: value for key, value in vars(record).items() if key in RECORD_ATTRIBUTES}
+        attributes.update(record_extras(record))
+        attributes.update(msg=bounded(record.getMessage()), args=None, exc_info=None, exc_text=None)
+        return logging.makeLogRecord(attributes)
+
+    def enqueue(self, record):
+        if self.policy == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def stats(self) -> dict:
+        return {'dropped': self.dropped, 'depth': self.queue.qsize(), 'capacity': self.queue.maxsize}
+
+def start_listener(queue_handler, handlers):
+    """Start the writer thread draining ``queue_handler`` into ``handlers``."""
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
 def setup_logger():
     log_directory = os.path.join(settings.BASE_DIR, 'logs')
     os.makedirs(log_directory, exist_ok=True)
@@ -93,11 +223,30 @@ def setup_logger():
     handlers['console'].setLevel(logging.INFO)
 
 
-    formatter = CustomFormatter(datefmt='%Y-%m-%d %H:%M:%S')
-    for handler in handlers.values():
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+    # Files get JSON lines for log tooling; the console stays human readable.
+    structured_formatter = StructuredFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+    for name in ('info', 'warning', 'error'):
+        handlers[name].setFormatter(structured_formatter)
+    handlers['console'].setFormatter(CustomFormatter(datefmt='%Y-%m-%d %H:%M:%S'))
+
+    # Callers only enqueue; formatting and file/console I/O (including
+    # rollovers) happen on the listener thread.
+    queue_handler = BoundedQueueHandler(settings.LOG_QUEUE_SIZE, settings.LOG_QUEUE_POLICY)
+    logger.addHandler(queue_handler)
+    listener = start_listener(queue_handler, handlers.values())
+
+    def restart_listener():
+        # A forked child (gunicorn or Celery worker) inherits the queue but
+        # not the writer thread, and the queue's locks may have been held by
+        # it at fork time, so the child gets a fresh queue and thread.
+        nonlocal listener
+        queue_handler.queue = queue.Queue(queue_handler.queue.maxsize)
+        listener = start_listener(queue_handler, handlers.values())
+
+    os.register_at_fork(after_in_child=restart_listener)
+    # Flush whatever is still queued when the process exits.
+    atexit.register(lambda: listener.stop())
 
-    return logger
+    return logger, queue_handler
 
-logger = setup_logger()
\ No newline at end of file
+logger, log_queue = setup_logger()
@@ -0,0 +1,168 @@
+"""
+Counters kept in the shared cache and histograms kept in Redis hashes, so API
+and Celery workers report into the same totals, rendered in the Prometheus
+text format by ``core.views.metrics``.
+
+Log queue figures are per process and labelled with its pid.
+"""
+import os
+import time
+from contextlib import contextmanager
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from core.logging import log_queue, logger
+
+METRIC_KEY = 'metrics:{}'
+HISTOGRAM_KEY = 'metrics:histogram:{}'
+
+COUNTERS = {
+    'response_cache_hits_total': 'Responses served from the response cache',
+    'response_cache_misses_total': 'Cacheable responses computed from the database',
+    'response_cache_saved_milliseconds_total': 'Request latency avoided by response cache hits',
+}
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Name -> (help, upper bounds). Each observation costs one bucket, sum and
+# count increment; cumulative buckets are only built when rendering.
+HISTOGRAMS = {
+    'http_request_duration_seconds': ('Request latency by view', SECONDS_BUCKETS),
+    'http_request_queries': ('SQL queries run per request', (0, 1, 2, 5, 10, 20, 50, 100)),
+    'http_request_query_duration_seconds': ('Time spent in SQL per request', SECONDS_BUCKETS),
+    'http_response_render_duration_seconds': ('Time spent rendering the response body', SECONDS_BUCKETS),
+    'http_response_size_bytes': ('Response body size', (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)),
+    'etl_stage_duration_seconds': ('ETL stage duration', (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)),
+}
+
+_redis = None
+
+
+def increment(name: str, amount: int = 1):
+    key = METRIC_KEY.format(name)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, amount)
+
+
+def snapshot() -> dict:
+    """Current value of every counter."""
+    values = cache.get_many([METRIC_KEY.format(name) for name in COUNTERS])
+    return {name: values.get(METRIC_KEY.format(name), 0) for name in COUNTERS}
+
+
+def redis_client():
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.METRICS_REDIS_URL, socket_timeout=0.1, socket_connect_timeout=0.1)
+    return _redis
+
+
+def _labels(labels: dict) -> str:
+    return ','.join(f'{name}="{value}"' for name, value in sorted(labels.items()))
+
+
+def observe_many(observations):
+    """
+    Record ``(name, value, labels)`` observations in one Redis round trip.
+
+    Nothing is recorded when ``METRICS_REDIS_URL`` is empty or Redis is down,
+    so instrumentation never fails the request or job it measures.
+    """
+    if not settings.METRICS_REDIS_URL:
+        return
+    pipe = redis_client().pipeline(transaction=False)
+    for name, value, labels in observations:
+        buckets = HISTOGRAMS[name][1]
+        label_text = _labels(labels)
+        index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+        key = HISTOGRAM_KEY.format(name)
+        pipe.hincrby(key, f'{label_text}|{index}', 1)
+        pipe.hincrbyfloat(key, f'{label_text}|sum', value)
+        pipe.hincrby(key, f'{label_text}|count', 1)
+    try:
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Metrics not recorded", extra={
+            'component': 'metrics',
+            'action': 'redis_unavailable',
+            'error': str(e)
+        })
+
+
+def observe(name: str, value: float, **labels):
+    observe_many([(name, value, labels)])
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """Observe the duration of the ``with`` block in seconds, also when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def _render_histograms() -> list:
+    if not settings.METRICS_REDIS_URL:
+        return []
+    pipe = redis_client().pipeline(transaction=False)
+    for name in HISTOGRAMS:
+        pipe.hgetall(HISTOGRAM_KEY.format(name))
+    try:
+        stored = pipe.execute()
+    except redis.RedisError:
+        return []
+
+    lines = []
+    for (name, (help_text, buckets)), fields in zip(HISTOGRAMS.items(), stored):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        series = {}
+        for field, value in fields.items():
+            label_text, _, part = field.decode().rpartition('|')
+            series.setdefault(label_text, {})[part] = value.decode()
+
+        for label_text, parts in sorted(series.items()):
+            prefix = f'{label_text},' if label_text else ''
+            cumulative = 0
+            for index, bound in enumerate(buckets):
+                cumulative += int(parts.get(str(index), 0))
+                lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            count = parts.get('count', '0')
+            selector = f'{{{label_text}}}' if label_text else ''
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{selector} {float(parts.get("sum", 0)):.6f}')
+            lines.append(f'{name}_count{selector} {count}')
+    return lines
+
+
+def render() -> str:
+    """Render all counters and histograms, the cache hit ratio and this process's log queue figures as Prometheus text."""
+    values = snapshot()
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter', f'{name} {values[name]}']
+
+    lookups = values['response_cache_hits_total'] + values['response_cache_misses_total']
+    hit_ratio = values['response_cache_hits_total'] / lookups if lookups else 0
+    lines += [
+        '# HELP response_cache_hit_ratio Share of cacheable responses served from the cache',
+        '# TYPE response_cache_hit_ratio gauge',
+        f'response_cache_hit_ratio {hit_ratio:.6f}',
+    ]
+
+    queue_stats = log_queue.stats()
+    pid = os.getpid()
+    lines += [
+        '# HELP log_records_dropped_total Log records dropped because the log queue was full',
+        '# TYPE log_records_dropped_total counter',
+        f'log_records_dropped_total{{pid="{pid}"}} {queue_stats["dropped"]}',
+        '# HELP log_queue_depth Log records waiting for the writer thread',
+        '# TYPE log_queue_depth gauge',
+        f'log_queue_depth{{pid="{pid}"}} {queue_stats["depth"]}',
+    ]
+    lines += _render_histograms()
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,122 @@
+import time
+from django.conf import settings
+from django.db import connection
+from core import metrics
+from core.logging import logger
+from core.models import SlowQueryPlan
+from core.query_plans import SlowQueryRecorder
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts the queries run through it and their total duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+class RequestMetricsMiddleware:
+    """
+    Record per-view latency, SQL query count and time, render time and
+    response size into the shared histograms served on ``/metrics``.
+
+    All observations of a request are sent in one Redis round trip. Latency
+    is measured up to the point the response leaves the middleware, so for
+    streaming responses it excludes producing the body, whose size is
+    recorded once the stream is exhausted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryTimer()
+        request._render_seconds = None
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        labels = {'view': match.view_name if match else 'unmatched', 'method': request.method}
+        observations = [
+            ('http_request_duration_seconds', duration, {**labels, 'status': response.status_code}),
+            ('http_request_queries', queries.count, labels),
+            ('http_request_query_duration_seconds', queries.seconds, labels),
+        ]
+        if request._render_seconds is not None:
+            observations.append(('http_response_render_duration_seconds', request._render_seconds, labels))
+
+        if response.streaming:
+            response.streaming_content = self._measure_stream(response.streaming_content, labels)
+        else:
+            observations.append(('http_response_size_bytes', len(response.content), labels))
+        metrics.observe_many(observations)
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before ``response.render()``; post-render callbacks run
+        # right after it, so together they bracket the renderer.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._render_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def _measure_stream(content, labels):
+        size = 0
+        for chunk in content:
+            size += len(chunk)
+            yield chunk
+        metrics.observe('http_response_size_bytes', size, **labels)
+
+
+class SlowQueryPlanMiddleware:
+    """
+    Explain the queries ``SlowQueryRecorder`` picks during a request and store
+    the plans, tagged with the view's URL name, pruning plans older than
+    ``SLOW_QUERY_PLAN_RETENTION_DAYS``. Does nothing unless
+    ``SLOW_QUERY_PLAN_THRESHOLD_MS`` is set.
+
+    Installed before ``RequestMetricsMiddleware``, so the EXPLAINs run after
+    that middleware has recorded the request and stay out of its metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SLOW_QUERY_PLAN_THRESHOLD_MS:
+            return self.get_response(request)
+
+        recorder = SlowQueryRecorder.from_settings(connection)
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        recorder.explain()
+        if recorder.plans:
+            match = request.resolver_match
+            endpoint = match.view_name if match else request.path
+            SlowQueryPlan.objects.bulk_create([SlowQueryPlan(endpoint=endpoint, **plan) for plan in recorder.plans])
+            SlowQueryPlan.prune(settings.SLOW_QUERY_PLAN_RETENTION_DAYS)
+            for plan in recorder.plans:
+                logger.info("Slow query plan captured", extra={
+                    'component': 'slow_query_plans',
+                    'action': 'plan_captured',
+                    'endpoint': endpoint,
+                    'fingerprint': plan['fingerprint'],
+                    'duration_ms': round(plan['duration_ms'], 2),
+                    'relations_scanned': plan['relations_scanned']
+                })
+        return response
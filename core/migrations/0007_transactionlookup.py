@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_etljob_job_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionLookup',
+            fields=[
+                ('transaction_id', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('partition_year', models.IntegerField()),
+            ],
+        ),
+        migrations.RunSQL(
+            sql="""
+            -- Backfill existing ids; on cross-partition duplicates the oldest row wins.
+            INSERT INTO core_transactionlookup (transaction_id, partition_year)
+            SELECT DISTINCT ON (transaction_id)
+                transaction_id,
+                (EXTRACT(YEAR FROM (transaction_date AT TIME ZONE 'UTC'))::INTEGER)
+            FROM core_transaction
+            ORDER BY transaction_id, created_at
+            ON CONFLICT (transaction_id) DO NOTHING;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+from core.partitioning import configured_client_buckets, subpartition_sql, unsplit_sql
+
+
+def _is_split(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = 'transactions_historical'")
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def split_by_client(apps, schema_editor):
+    buckets = configured_client_buckets()
+    if buckets <= 1 or _is_split(schema_editor):
+        return
+    for statement in subpartition_sql(buckets):
+        schema_editor.execute(statement, params=None)
+
+
+def merge_client_buckets(apps, schema_editor):
+    if not _is_split(schema_editor):
+        return
+    for statement in unsplit_sql():
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+    """
+    Sub-partitions every yearly range of ``core_transaction`` by
+    HASH(client_id) into ``settings.TRANSACTION_CLIENT_BUCKETS`` buckets.
+    With a single bucket the layout from 0004 is left untouched.
+    """
+
+    dependencies = [
+        ('core', '0007_transactionlookup'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_by_client, merge_client_buckets),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_transaction_client_subpartitions'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            # Created on the partitioned parent so every partition (and every
+            # client bucket) gets its own copy; serves keyset pagination of a
+            # client's transactions ordered by (transaction_date, transaction_id).
+            sql="""
+            CREATE INDEX idx_transactions_client_date
+            ON core_transaction (client_id, transaction_date, transaction_id);
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS idx_transactions_client_date;
+            """
+        ),
+    ]
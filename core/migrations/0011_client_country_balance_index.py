@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:37
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_client_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=django.contrib.postgres.indexes.BTreeIndex(fields=['country', 'account_balance'], name='core_client_country_dd8487_btree'),
+        ),
+    ]
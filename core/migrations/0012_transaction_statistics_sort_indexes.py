@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_client_country_balance_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            # Serve /api/statistics/ sorted by either total with a keyset
+            # cursor; client_id breaks ties so the order is total.
+            sql="""
+            CREATE INDEX transaction_statistics_total_spent_idx
+            ON transaction_statistics (total_spent, client_id);
+
+            CREATE INDEX transaction_statistics_total_gained_idx
+            ON transaction_statistics (total_gained, client_id);
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS transaction_statistics_total_spent_idx;
+            DROP INDEX IF EXISTS transaction_statistics_total_gained_idx;
+            """
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:41
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_transaction_statistics_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_id', models.CharField(max_length=50)),
+                ('currency', models.CharField(max_length=3)),
+                ('transaction_type', models.CharField(max_length=4)),
+                ('transaction_count', models.BigIntegerField()),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=25)),
+                ('day', models.DateField()),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.BTreeIndex(fields=['day'], name='core_transa_day_633024_btree')],
+                'constraints': [models.UniqueConstraint(fields=('client_id', 'day', 'currency', 'transaction_type'), name='unique_daily_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TransactionMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_id', models.CharField(max_length=50)),
+                ('currency', models.CharField(max_length=3)),
+                ('transaction_type', models.CharField(max_length=4)),
+                ('transaction_count', models.BigIntegerField()),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=25)),
+                ('month', models.DateField(help_text='First day of the month')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.BTreeIndex(fields=['month'], name='core_transa_month_635b1c_btree')],
+                'constraints': [models.UniqueConstraint(fields=('client_id', 'month', 'currency', 'transaction_type'), name='unique_monthly_rollup')],
+            },
+        ),
+        migrations.RunSQL(
+            # Backfill from the transactions loaded so far; new loads keep the
+            # rollups up to date from then on.
+            sql="""
+            INSERT INTO core_transactiondailyrollup
+                (client_id, day, currency, transaction_type, transaction_count, total_amount)
+            SELECT client_id, (transaction_date AT TIME ZONE 'UTC')::date, currency, transaction_type,
+                   COUNT(*), SUM(amount)
+            FROM core_transaction
+            GROUP BY 1, 2, 3, 4;
+
+            INSERT INTO core_transactionmonthlyrollup
+                (client_id, month, currency, transaction_type, transaction_count, total_amount)
+            SELECT client_id, date_trunc('month', day)::date, currency, transaction_type,
+                   SUM(transaction_count), SUM(total_amount)
+            FROM core_transactiondailyrollup
+            GROUP BY 1, 2, 3, 4;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
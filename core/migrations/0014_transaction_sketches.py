@@ -0,0 +1,75 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:45
+
+from datetime import timezone as dt_timezone
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from core.sketches import HyperLogLog, KLLSketch
+
+
+def backfill_sketches(apps, schema_editor):
+    """Build the monthly sketches of the transactions loaded so far, one client at a time."""
+    Transaction = apps.get_model('core', 'Transaction')
+    TransactionSketch = apps.get_model('core', 'TransactionSketch')
+
+    def new_sketch():
+        return [0, KLLSketch(), HyperLogLog(), HyperLogLog()]
+
+    def rows(client_id, months):
+        return [
+            TransactionSketch(
+                client_id=client_id,
+                month=month,
+                transaction_count=count,
+                amounts=amounts.to_bytes(),
+                currencies=currencies.to_bytes(),
+                clients=clients.to_bytes() if client_id == '' else b'',
+            )
+            for month, (count, amounts, currencies, clients) in months.items()
+        ]
+
+    all_clients = {}
+    current_client, client_months = None, {}
+    transactions = Transaction.objects.order_by('client_id').values_list(
+        'client_id', 'transaction_date', 'amount', 'currency'
+    )
+    for client_id, transaction_date, amount, currency in transactions.iterator(chunk_size=10000):
+        if client_id != current_client:
+            TransactionSketch.objects.bulk_create(rows(current_client, client_months))
+            current_client, client_months = client_id, {}
+
+        month = transaction_date.astimezone(dt_timezone.utc).date().replace(day=1)
+        for sketch in (client_months.setdefault(month, new_sketch()), all_clients.setdefault(month, new_sketch())):
+            sketch[0] += 1
+            sketch[1].update(abs(float(amount)))
+            sketch[2].update(currency)
+            sketch[3].update(client_id)
+
+    TransactionSketch.objects.bulk_create(rows(current_client, client_months))
+    TransactionSketch.objects.bulk_create(rows('', all_clients))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_transaction_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('client_id', models.CharField(blank=True, max_length=50)),
+                ('transaction_count', models.BigIntegerField(default=0)),
+                ('amounts', models.BinaryField(default=b'')),
+                ('currencies', models.BinaryField(default=b'')),
+                ('clients', models.BinaryField(default=b'')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.BTreeIndex(fields=['month'], name='core_transa_month_27dde7_btree')],
+                'constraints': [models.UniqueConstraint(fields=('client_id', 'month'), name='unique_transaction_sketch')],
+            },
+        ),
+        migrations.RunPython(backfill_sketches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:49
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_transaction_sketches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('transaction_id', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('client_id', models.CharField(max_length=50)),
+                ('transaction_date', models.DateTimeField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('running_total', models.DecimalField(decimal_places=2, max_digits=25)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.BTreeIndex(fields=['client_id', 'transaction_date', 'transaction_id'], name='core_ledger_position')],
+            },
+        ),
+        migrations.RunSQL(
+            # Backfill from the transactions loaded so far; new loads extend
+            # the ledgers from then on.
+            sql="""
+            INSERT INTO core_ledgerentry (transaction_id, client_id, transaction_date, amount, running_total)
+            SELECT transaction_id, client_id, transaction_date, amount,
+                   SUM(amount) OVER (PARTITION BY client_id ORDER BY transaction_date, transaction_id)
+            FROM core_transaction
+            ON CONFLICT (transaction_id) DO NOTHING;
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
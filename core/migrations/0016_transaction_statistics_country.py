@@ -0,0 +1,86 @@
+from django.db import migrations
+
+STATISTICS_SQL = """
+    CREATE MATERIALIZED VIEW transaction_statistics AS
+    SELECT
+        s.client_id,
+        c.country,
+        s.total_transactions,
+        s.total_spent,
+        s.total_gained
+    FROM (
+        SELECT
+            t.client_id,
+            COUNT(*) as total_transactions,
+            SUM(CASE
+                WHEN transaction_type = 'BUY' THEN amount
+                ELSE 0
+            END) as total_spent,
+            SUM(CASE
+                WHEN transaction_type = 'SELL' THEN ABS(amount)
+                ELSE 0
+            END) as total_gained
+        FROM core_transaction t
+        GROUP BY t.client_id
+    ) s
+    LEFT JOIN core_client c ON c.client_id = s.client_id;
+
+    CREATE UNIQUE INDEX transaction_statistics_client_id_idx
+    ON transaction_statistics (client_id);
+
+    CREATE INDEX transaction_statistics_total_spent_idx
+    ON transaction_statistics (total_spent, client_id);
+
+    CREATE INDEX transaction_statistics_total_gained_idx
+    ON transaction_statistics (total_gained, client_id);
+
+    CREATE INDEX transaction_statistics_country_spent_idx
+    ON transaction_statistics (country, total_spent, client_id);
+
+    CREATE INDEX transaction_statistics_country_gained_idx
+    ON transaction_statistics (country, total_gained, client_id);
+"""
+
+PREVIOUS_STATISTICS_SQL = """
+    CREATE MATERIALIZED VIEW transaction_statistics AS
+    SELECT
+        t.client_id,
+        COUNT(*) as total_transactions,
+        SUM(CASE
+            WHEN transaction_type = 'BUY' THEN amount
+            ELSE 0
+        END) as total_spent,
+        SUM(CASE
+            WHEN transaction_type = 'SELL' THEN ABS(amount)
+            ELSE 0
+        END) as total_gained
+    FROM core_transaction t
+    GROUP BY t.client_id;
+
+    CREATE UNIQUE INDEX transaction_statistics_client_id_idx
+    ON transaction_statistics (client_id);
+
+    CREATE INDEX transaction_statistics_total_spent_idx
+    ON transaction_statistics (total_spent, client_id);
+
+    CREATE INDEX transaction_statistics_total_gained_idx
+    ON transaction_statistics (total_gained, client_id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_ledger_entries'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            # Denormalize the client's country so leaderboards per country
+            # are index scans on (country, total, client_id) instead of a
+            # join with core_client and a sort. Totals are aggregated before
+            # the join to keep the aggregate partitionwise.
+            sql="DROP MATERIALIZED VIEW transaction_statistics;" + STATISTICS_SQL,
+            reverse_sql="DROP MATERIALIZED VIEW transaction_statistics;" + PREVIOUS_STATISTICS_SQL
+        ),
+    ]
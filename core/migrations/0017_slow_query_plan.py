@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_transaction_statistics_country'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQueryPlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(help_text='URL name of the view that ran the query', max_length=200)),
+                ('fingerprint', models.CharField(help_text='SHA-256 of the normalized SQL', max_length=64)),
+                ('sql', models.TextField(help_text='Normalized SQL, literals and parameters replaced by ?')),
+                ('duration_ms', models.FloatField(help_text='Duration of the original execution')),
+                ('plan', models.JSONField()),
+                ('relations_scanned', models.JSONField(default=list, help_text='Tables and partitions the plan actually read')),
+                ('captured_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-duration_ms'],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:51
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_slow_query_plan'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='transactionsketch',
+            name='unique_transaction_sketch',
+        ),
+        migrations.AddIndex(
+            model_name='transactionsketch',
+            index=django.contrib.postgres.indexes.BTreeIndex(fields=['client_id', 'month'], name='core_transa_client__5460be_btree'),
+        ),
+    ]
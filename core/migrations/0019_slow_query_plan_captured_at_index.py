@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-19 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_transaction_sketch_deltas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='slowqueryplan',
+            index=models.Index(fields=['captured_at'], name='core_slowqu_capture_bf8adb_idx'),
+        ),
+    ]
@@ -1,5 +1,21 @@
 from .client import Client
 from .transaction import Transaction
+from .transaction_lookup import TransactionLookup
 from .transaction_statistics_view import TransactionStatistics
+from .transaction_rollup import TransactionDailyRollup, TransactionMonthlyRollup, update_rollups
+from .transaction_sketch import TransactionSketch
+from .ledger_entry import LedgerEntry
+from .slow_query_plan import SlowQueryPlan
 
-__all__ = ['Client', 'Transaction', 'TransactionStatistics']
\ No newline at end of file
+__all__ = [
+    'Client',
+    'Transaction',
+    'TransactionLookup',
+    'TransactionStatistics',
+    'TransactionDailyRollup',
+    'TransactionMonthlyRollup',
+    'update_rollups',
+    'TransactionSketch',
+    'LedgerEntry',
+    'SlowQueryPlan',
+]
@@ -1,5 +1,6 @@
 from django.db import models
-from django.contrib.postgres.indexes import BTreeIndex
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import BTreeIndex, GinIndex, OpClass
 
 class Client(models.Model):
     client_id = models.CharField(max_length=50, primary_key=True)
@@ -14,6 +15,11 @@ class Client(models.Model):
     class Meta:
         indexes = [
             BTreeIndex(fields=['email']),
+            BTreeIndex(fields=['country', 'account_balance']),
+            # Trigram indexes on UPPER(...), the expression Django compares in
+            # icontains lookups, so substring and similarity searches use them.
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='core_client_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='core_client_email_trgm'),
         ]
 
     def __str__(self):
@@ -0,0 +1,164 @@
+from decimal import Decimal
+from django.db import connection, models
+from django.contrib.postgres.indexes import BTreeIndex
+
+
+class LedgerEntry(models.Model):
+    """
+    One transaction in its client's ledger, with the cumulative sum of the
+    client's amounts up to and including it.
+
+    Entries are ordered per client by ``(transaction_date, transaction_id)``
+    and ``running_total`` sums amounts as stored (SELL amounts are negative),
+    so the balance at any time is the opening ``Client.account_balance`` minus
+    the ``running_total`` of the last entry before it (a BUY spends money): one
+    index seek instead of replaying the client's history.
+    """
+    transaction_id = models.CharField(max_length=50, primary_key=True)
+    client_id = models.CharField(max_length=50)
+    transaction_date = models.DateTimeField()
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+    running_total = models.DecimalField(max_digits=25, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            BTreeIndex(fields=['client_id', 'transaction_date', 'transaction_id'], name='core_ledger_position'),
+        ]
+
+    @classmethod
+    def extend(cls, records):
+        """
+        Append the transactions in ``records`` to their clients' ledgers.
+
+        New entries get a window sum over the new rows, seeded with the total
+        of the existing entry just before each one (an index seek). Existing
+        entries sorting after a new one, which only happens for transactions
+        older than the client's latest entry, are shifted by the new amounts
+        before them; in the usual ETL case of newer transactions nothing else
+        is touched.
+        """
+        if not records:
+            return
+
+        table = cls._meta.db_table
+        client_ids = [record['client_id'] for record in records]
+        transaction_dates = [record['transaction_date'] for record in records]
+        transaction_ids = [record['transaction_id'] for record in records]
+        amounts = [record['amount'] for record in records]
+        with connection.cursor() as cursor:
+            # Loads touching the same client are serialized, in a fixed order
+            # so that they cannot deadlock.
+            cursor.execute(
+                """
+                SELECT pg_advisory_xact_lock(hashtextextended(client_id, 0))
+                FROM (SELECT DISTINCT unnest(%s::varchar[]) AS client_id ORDER BY 1) AS clients
+                """,
+                [client_ids]
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (transaction_id, client_id, transaction_date, amount, running_total)
+                SELECT new.transaction_id, new.client_id, new.transaction_date, new.amount,
+                       COALESCE(previous.running_total, 0) + SUM(new.amount) OVER (
+                           PARTITION BY new.client_id
+                           ORDER BY new.transaction_date, new.transaction_id
+                       )
+                FROM unnest(%s::varchar[], %s::varchar[], %s::timestamptz[], %s::numeric[])
+                    AS new (transaction_id, client_id, transaction_date, amount)
+                LEFT JOIN LATERAL (
+                    SELECT running_total FROM {table}
+                    WHERE client_id = new.client_id
+                      AND (transaction_date, transaction_id) < (new.transaction_date, new.transaction_id)
+                    ORDER BY transaction_date DESC, transaction_id DESC
+                    LIMIT 1
+                ) AS previous ON TRUE
+                """,
+                [transaction_ids, client_ids, transaction_dates, amounts]
+            )
+            cursor.execute(
+                f"""
+                WITH new AS (
+                    SELECT * FROM unnest(%s::varchar[], %s::timestamptz[], %s::varchar[], %s::numeric[])
+                        AS new (client_id, transaction_date, transaction_id, amount)
+                ),
+                starts AS (
+                    SELECT DISTINCT ON (client_id) client_id, transaction_date, transaction_id
+                    FROM new
+                    ORDER BY client_id, transaction_date, transaction_id
+                )
+                UPDATE {table} AS entry
+                SET running_total = entry.running_total + (
+                    SELECT SUM(new.amount) FROM new
+                    WHERE new.client_id = entry.client_id
+                      AND (new.transaction_date, new.transaction_id) < (entry.transaction_date, entry.transaction_id)
+                )
+                FROM starts
+                WHERE entry.client_id = starts.client_id
+                  AND (entry.transaction_date, entry.transaction_id) > (starts.transaction_date, starts.transaction_id)
+                  AND entry.transaction_id <> ALL(%s::varchar[])
+                """,
+                [client_ids, transaction_dates, transaction_ids, amounts, transaction_ids]
+            )
+
+    @classmethod
+    def remove(cls, records):
+        """
+        Drop the transactions in ``records`` from their clients' ledgers and
+        shift the entries after each one back by its amount.
+        """
+        if not records:
+            return
+
+        table = cls._meta.db_table
+        client_ids = [record['client_id'] for record in records]
+        transaction_ids = [record['transaction_id'] for record in records]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT pg_advisory_xact_lock(hashtextextended(client_id, 0))
+                FROM (SELECT DISTINCT unnest(%s::varchar[]) AS client_id ORDER BY 1) AS clients
+                """,
+                [client_ids]
+            )
+            # The UPDATE sees the entries as they were before the DELETE in
+            # the same statement, so the removed ones are excluded explicitly.
+            cursor.execute(
+                f"""
+                WITH removed AS (
+                    DELETE FROM {table} WHERE transaction_id = ANY(%s::varchar[])
+                    RETURNING client_id, transaction_date, transaction_id, amount
+                ),
+                starts AS (
+                    SELECT DISTINCT ON (client_id) client_id, transaction_date, transaction_id
+                    FROM removed
+                    ORDER BY client_id, transaction_date, transaction_id
+                )
+                UPDATE {table} AS entry
+                SET running_total = entry.running_total - (
+                    SELECT SUM(removed.amount) FROM removed
+                    WHERE removed.client_id = entry.client_id
+                      AND (removed.transaction_date, removed.transaction_id) < (entry.transaction_date, entry.transaction_id)
+                )
+                FROM starts
+                WHERE entry.client_id = starts.client_id
+                  AND (entry.transaction_date, entry.transaction_id) > (starts.transaction_date, starts.transaction_id)
+                  AND entry.transaction_id <> ALL(%s::varchar[])
+                """,
+                [transaction_ids, transaction_ids]
+            )
+
+    @classmethod
+    def total_before(cls, client_id, moment=None, inclusive=False):
+        """
+        Return the client's running total just before ``moment`` (at it when
+        ``inclusive``), or after its last entry when ``moment`` is None; 0
+        before the first entry.
+        """
+        entries = cls.objects.filter(client_id=client_id)
+        if moment is not None:
+            entries = entries.filter(**{'transaction_date__lte' if inclusive else 'transaction_date__lt': moment})
+        total = entries.order_by('-transaction_date', '-transaction_id').values_list('running_total', flat=True).first()
+        return total if total is not None else Decimal(0)
+
+    def __str__(self):
+        return f"{self.client_id} {self.transaction_date} {self.transaction_id}"
@@ -0,0 +1,29 @@
+from datetime import timedelta
+from django.db import models
+from django.utils import timezone
+
+
+class SlowQueryPlan(models.Model):
+    """``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` of a query that exceeded ``SLOW_QUERY_PLAN_THRESHOLD_MS``."""
+    endpoint = models.CharField(max_length=200, help_text="URL name of the view that ran the query")
+    fingerprint = models.CharField(max_length=64, help_text="SHA-256 of the normalized SQL")
+    sql = models.TextField(help_text="Normalized SQL, literals and parameters replaced by ?")
+    duration_ms = models.FloatField(help_text="Duration of the original execution")
+    plan = models.JSONField()
+    relations_scanned = models.JSONField(default=list, help_text="Tables and partitions the plan actually read")
+    captured_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-duration_ms']
+        indexes = [
+            models.Index(fields=['captured_at']),
+        ]
+
+    @classmethod
+    def prune(cls, retention_days: int) -> int:
+        """Delete plans captured more than ``retention_days`` ago and return how many."""
+        deleted, _ = cls.objects.filter(captured_at__lt=timezone.now() - timedelta(days=retention_days)).delete()
+        return deleted
+
+    def __str__(self):
+        return f"{self.endpoint} - {self.duration_ms:.0f} ms"
@@ -1,6 +1,126 @@
-from django.db import models
+from datetime import datetime, time
+from django.db import connection, models, transaction as db_transaction
+from django.db.models.expressions import RawSQL
 from django.contrib.postgres.indexes import BTreeIndex
+from django.utils import timezone
+from core import partitioning, versioning
+from core.partitioning import PARTITION_YEAR_SQL, partition_year
 from .client import Client
+from .transaction_lookup import TransactionLookup
+from .transaction_rollup import remove_from_rollups, update_rollups
+
+RECORD_FIELDS = ['transaction_id', 'client_id', 'transaction_date', 'currency', 'transaction_type', 'amount']
+
+
+def _utc_year(value) -> int:
+    if not isinstance(value, datetime):
+        value = timezone.make_aware(datetime.combine(value, time.min))
+    return partition_year(value)
+
+
+def _bump_on_commit(records) -> None:
+    client_ids = {record['client_id'] for record in records}
+    db_transaction.on_commit(lambda: versioning.bump_client_generations(client_ids))
+
+
+class TransactionQuerySet(models.QuerySet):
+    def in_partition_year(self, year):
+        """Restrict the query to the partition holding ``year``."""
+        return self.filter(RawSQL(f"{PARTITION_YEAR_SQL} = %s", [year], output_field=models.BooleanField()))
+
+    def in_partition_years(self, start_year=None, end_year=None):
+        """Restrict the query to the partitions covering ``start_year``..``end_year``."""
+        queryset = self
+        if start_year is not None:
+            queryset = queryset.filter(RawSQL(f"{PARTITION_YEAR_SQL} >= %s", [start_year], output_field=models.BooleanField()))
+        if end_year is not None:
+            queryset = queryset.filter(RawSQL(f"{PARTITION_YEAR_SQL} <= %s", [end_year], output_field=models.BooleanField()))
+        return queryset
+
+    def in_date_range(self, start_date=None, end_date=None):
+        """Filter on ``transaction_date`` and prune partitions outside the range."""
+        queryset = self
+        if start_date:
+            queryset = queryset.filter(transaction_date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(transaction_date__lte=end_date)
+        return queryset.in_partition_years(
+            _utc_year(start_date) if start_date else None,
+            _utc_year(end_date) if end_date else None
+        )
+
+    def for_clients(self, client_ids):
+        """
+        Filter on ``client_id = ANY(%s)`` with the ids bound as one array.
+
+        Unlike ``client_id__in`` the statement stays the same for any number
+        of ids, and the planner can still prune hash sub-partitions.
+        """
+        return self.filter(RawSQL(
+            "client_id = ANY(%s::varchar[])",
+            [list(client_ids)],
+            output_field=models.BooleanField()
+        ))
+
+    def after(self, transaction_date, transaction_id):
+        """Keyset filter: rows sorting after (transaction_date, transaction_id)."""
+        return self.filter(RawSQL(
+            "(transaction_date, transaction_id) > (%s, %s)",
+            [transaction_date, transaction_id],
+            output_field=models.BooleanField()
+        ))
+
+    def delete(self):
+        """
+        Delete the transactions, release their ids in ``TransactionLookup``,
+        take them back out of the rollups and ledgers and invalidate their
+        clients' cached responses once committed.
+        """
+        with db_transaction.atomic():
+            records = list(self.values(*RECORD_FIELDS))
+            remove_from_rollups(records)
+            _bump_on_commit(records)
+            TransactionLookup.objects.filter(pk__in=self.values('transaction_id')).delete()
+            return super().delete()
+
+    delete.queryset_only = True
+
+    def bulk_create_in_partitions(self, records) -> None:
+        """
+        Insert validated records straight into their leaf partitions.
+
+        When the range partitions are hash sub-partitioned by client, rows are
+        grouped per leaf and written with one array-bound INSERT each, which
+        skips tuple routing through the parent. Otherwise this falls back to
+        a regular ``bulk_create``.
+        """
+        modulus = partitioning.client_bucket_modulus()
+        if not modulus:
+            self.bulk_create([self.model(**record) for record in records])
+            return
+
+        buckets = partitioning.client_buckets([record['client_id'] for record in records], modulus)
+        leaves = {}
+        for record in records:
+            range_table = partitioning.range_partition(partition_year(record['transaction_date']))
+            leaf = partitioning.leaf_partition(range_table, buckets[record['client_id']])
+            leaves.setdefault(leaf, []).append(record)
+
+        created_at = timezone.now()
+        columns = ['transaction_id', 'client_id', 'transaction_type', 'transaction_date', 'amount', 'currency']
+        with connection.cursor() as cursor:
+            for leaf, leaf_records in leaves.items():
+                cursor.execute(
+                    f"""
+                    INSERT INTO {leaf} ({', '.join(columns)}, created_at)
+                    SELECT *, %s FROM unnest(
+                        %s::varchar[], %s::varchar[], %s::varchar[],
+                        %s::timestamptz[], %s::numeric[], %s::varchar[]
+                    )
+                    """,
+                    [created_at] + [[record[column] for record in leaf_records] for column in columns]
+                )
+
 
 class Transaction(models.Model):
     TRANSACTION_TYPES = [
@@ -16,10 +136,48 @@ class Transaction(models.Model):
     currency = models.CharField(max_length=3)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = TransactionQuerySet.as_manager()
+
     class Meta:
         indexes = [
             BTreeIndex(fields=['client']),
         ]
 
+    def as_record(self) -> dict:
+        return {field: getattr(self, field) for field in RECORD_FIELDS}
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            # Re-derive the rollups and ledger from the stored and the new
+            # values; sketches keep the old values (see remove_from_rollups).
+            with db_transaction.atomic():
+                stored = list(Transaction.objects.filter(pk=self.pk).values(*RECORD_FIELDS))
+                remove_from_rollups(stored)
+                # post_save bumps the new client; a moved row also changes the old one.
+                _bump_on_commit(stored)
+                super().save(*args, **kwargs)
+                TransactionLookup.objects.filter(pk=self.pk).update(partition_year=partition_year(self.transaction_date))
+                update_rollups([self.as_record()], sketches=False)
+            return
+
+        # Claim the id globally first; a duplicate from another partition
+        # raises IntegrityError and rolls the insert back.
+        with db_transaction.atomic():
+            TransactionLookup.objects.create(
+                transaction_id=self.transaction_id,
+                partition_year=partition_year(self.transaction_date)
+            )
+            super().save(*args, **kwargs)
+            update_rollups([self.as_record()])
+
+    def delete(self, *args, **kwargs):
+        with db_transaction.atomic():
+            stored = list(Transaction.objects.filter(pk=self.pk).values(*RECORD_FIELDS))
+            remove_from_rollups(stored)
+            _bump_on_commit(stored)
+            # Release the id, so that it can be loaded again.
+            TransactionLookup.objects.filter(pk=self.transaction_id).delete()
+            return super().delete(*args, **kwargs)
+
     def __str__(self):
         return f"{self.transaction_id} - {self.client.name} ({self.transaction_type})"
@@ -0,0 +1,48 @@
+from django.db import connection, models
+from core.partitioning import partition_year
+
+
+class TransactionLookup(models.Model):
+    """
+    Global index of transaction ids.
+
+    ``core_transaction`` can only enforce uniqueness per partition, so every
+    transaction id is registered here together with its partition key. A
+    single primary key probe tells whether an id exists and which partition
+    holds it.
+    """
+    transaction_id = models.CharField(max_length=50, primary_key=True)
+    partition_year = models.IntegerField()
+
+    @classmethod
+    def claim(cls, records) -> set:
+        """
+        Register the transactions in ``records`` and return the ids that were
+        not known yet. Ids already claimed, either by an earlier load or by a
+        previous record of the same batch, are left untouched.
+        """
+        if not records:
+            return set()
+
+        transaction_ids = [record['transaction_id'] for record in records]
+        years = [partition_year(record['transaction_date']) for record in records]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {cls._meta.db_table} (transaction_id, partition_year)
+                SELECT * FROM unnest(%s::varchar[], %s::integer[])
+                ON CONFLICT (transaction_id) DO NOTHING
+                RETURNING transaction_id
+                """,
+                [transaction_ids, years]
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    @classmethod
+    def resolve(cls, transaction_id):
+        """Return the partition year holding ``transaction_id``, or None."""
+        return cls.objects.filter(pk=transaction_id).values_list('partition_year', flat=True).first()
+
+    def __str__(self):
+        return f"{self.transaction_id} ({self.partition_year})"
@@ -0,0 +1,188 @@
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from django.db import connection, models
+from django.contrib.postgres.indexes import BTreeIndex
+from .ledger_entry import LedgerEntry
+from .transaction_sketch import TransactionSketch
+
+
+def utc_day(transaction_date):
+    return transaction_date.astimezone(dt_timezone.utc).date()
+
+
+def utc_month(transaction_date):
+    return utc_day(transaction_date).replace(day=1)
+
+
+class TransactionRollup(models.Model):
+    """
+    Transaction counts and amount totals per client, currency, type and
+    time bucket.
+
+    Rows are upserted in the same database transaction that inserts,
+    updates or deletes the transactions, so a rollup always matches the
+    committed data. Amounts are summed as stored (SELL amounts are negative).
+    Concrete rollups name their bucket column in ``BUCKET_FIELD`` and set
+    ``bucket_of`` to the function mapping a transaction date to its bucket.
+    """
+
+    client_id = models.CharField(max_length=50)
+    currency = models.CharField(max_length=3)
+    transaction_type = models.CharField(max_length=4)
+    transaction_count = models.BigIntegerField()
+    total_amount = models.DecimalField(max_digits=25, decimal_places=2)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def _totals(cls, records) -> dict:
+        totals = {}
+        for record in records:
+            key = (
+                record['client_id'],
+                cls.bucket_of(record['transaction_date']),
+                record['currency'],
+                record['transaction_type'],
+            )
+            amount = record['amount']
+            if not isinstance(amount, Decimal):
+                amount = Decimal(str(amount))
+            count, total = totals.get(key, (0, Decimal(0)))
+            totals[key] = (count + 1, total + amount)
+        return totals
+
+    @classmethod
+    def apply(cls, records):
+        """Add the transactions in ``records`` to their buckets."""
+        totals = cls._totals(records)
+        if not totals:
+            return
+
+        # Sorted so concurrent loads lock the same rows in the same order.
+        keys = sorted(totals)
+        table, bucket = cls._meta.db_table, cls.BUCKET_FIELD
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (client_id, {bucket}, currency, transaction_type, transaction_count, total_amount)
+                SELECT * FROM unnest(
+                    %s::varchar[], %s::date[], %s::varchar[], %s::varchar[], %s::bigint[], %s::numeric[]
+                )
+                ON CONFLICT (client_id, {bucket}, currency, transaction_type) DO UPDATE SET
+                    transaction_count = {table}.transaction_count + EXCLUDED.transaction_count,
+                    total_amount = {table}.total_amount + EXCLUDED.total_amount
+                """,
+                [[key[i] for key in keys] for i in range(4)] + [
+                    [totals[key][0] for key in keys],
+                    [totals[key][1] for key in keys],
+                ]
+            )
+
+
+    @classmethod
+    def remove(cls, records):
+        """Take the transactions in ``records`` back out of their buckets, dropping buckets left empty."""
+        totals = cls._totals(records)
+        if not totals:
+            return
+
+        keys = sorted(totals)
+        table, bucket = cls._meta.db_table, cls.BUCKET_FIELD
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH removed AS (
+                    SELECT * FROM unnest(
+                        %s::varchar[], %s::date[], %s::varchar[], %s::varchar[], %s::bigint[], %s::numeric[]
+                    ) AS removed (client_id, bucket, currency, transaction_type, transaction_count, total_amount)
+                )
+                UPDATE {table} AS rollup SET
+                    transaction_count = rollup.transaction_count - removed.transaction_count,
+                    total_amount = rollup.total_amount - removed.total_amount
+                FROM removed
+                WHERE rollup.client_id = removed.client_id AND rollup.{bucket} = removed.bucket
+                  AND rollup.currency = removed.currency AND rollup.transaction_type = removed.transaction_type
+                """,
+                [[key[i] for key in keys] for i in range(4)] + [
+                    [totals[key][0] for key in keys],
+                    [totals[key][1] for key in keys],
+                ]
+            )
+            cursor.execute(
+                f"DELETE FROM {table} WHERE client_id = ANY(%s::varchar[]) AND transaction_count <= 0",
+                [sorted({key[0] for key in keys})]
+            )
+
+
+class TransactionDailyRollup(TransactionRollup):
+    BUCKET_FIELD = 'day'
+
+    day = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['client_id', 'day', 'currency', 'transaction_type'],
+                name='unique_daily_rollup'
+            ),
+        ]
+        indexes = [
+            BTreeIndex(fields=['day']),
+        ]
+
+    bucket_of = staticmethod(utc_day)
+
+    def __str__(self):
+        return f"{self.client_id} {self.day} {self.currency} {self.transaction_type}"
+
+
+class TransactionMonthlyRollup(TransactionRollup):
+    BUCKET_FIELD = 'month'
+
+    month = models.DateField(help_text="First day of the month")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['client_id', 'month', 'currency', 'transaction_type'],
+                name='unique_monthly_rollup'
+            ),
+        ]
+        indexes = [
+            BTreeIndex(fields=['month']),
+        ]
+
+    bucket_of = staticmethod(utc_month)
+
+    def __str__(self):
+        return f"{self.client_id} {self.month:%Y-%m} {self.currency} {self.transaction_type}"
+
+
+def update_rollups(records, sketches=True):
+    """Add ``records`` to the daily and monthly rollups, the monthly sketches and the client ledgers."""
+    TransactionDailyRollup.apply(records)
+    TransactionMonthlyRollup.apply(records)
+    if sketches:
+        TransactionSketch.apply(records)
+    LedgerEntry.extend(records)
+
+
+def remove_from_rollups(records):
+    """
+    Take ``records`` back out of the daily and monthly rollups and the client
+    ledgers. Sketches cannot forget a value, so they keep counting removed or
+    updated transactions: approximate analytics drift until rebuilt.
+    """
+    TransactionDailyRollup.remove(records)
+    TransactionMonthlyRollup.remove(records)
+    LedgerEntry.remove(records)
+
+
+def forget_clients(client_ids):
+    """Drop the rollups, ledgers and per-client sketches of deleted clients."""
+    client_ids = list(client_ids)
+    TransactionDailyRollup.objects.filter(client_id__in=client_ids).delete()
+    TransactionMonthlyRollup.objects.filter(client_id__in=client_ids).delete()
+    TransactionSketch.objects.filter(client_id__in=client_ids).delete()
+    LedgerEntry.objects.filter(client_id__in=client_ids).delete()
@@ -0,0 +1,137 @@
+from datetime import timezone as dt_timezone
+from django.db import connection, models, transaction
+from django.contrib.postgres.indexes import BTreeIndex
+from core.sketches import HyperLogLog, KLLSketch
+
+# ``client_id`` of the rows summarizing all clients of a month.
+ALL_CLIENTS = ''
+
+
+class TransactionSketch(models.Model):
+    """
+    Mergeable sketches of one month of transactions, for one client or for
+    all clients (``client_id`` = ``ALL_CLIENTS``).
+
+    ``amounts`` is a KLL sketch of absolute amounts, ``currencies`` and
+    ``clients`` are HyperLogLog sketches of currency codes and client ids.
+    Months are the unit of merging: any range of whole months is answered by
+    merging its rows, which are small and independent of transaction volume.
+
+    A month may hold several rows per client: each load inserts its own and
+    ``compact`` folds them together later. Readers merge every row of the
+    range anyway, so answers do not depend on whether it ran.
+    """
+    month = models.DateField(help_text="First day of the month")
+    client_id = models.CharField(max_length=50, blank=True)
+    transaction_count = models.BigIntegerField(default=0)
+    amounts = models.BinaryField(default=b'')
+    currencies = models.BinaryField(default=b'')
+    clients = models.BinaryField(default=b'')
+
+    class Meta:
+        indexes = [
+            BTreeIndex(fields=['month']),
+            BTreeIndex(fields=['client_id', 'month']),
+        ]
+
+    @classmethod
+    def apply(cls, records):
+        """
+        Add the transactions in ``records`` as new rows, one per client and
+        month plus one all-clients row per month.
+
+        Nothing existing is read or locked, so concurrent loads never queue
+        on the shared all-clients rows and the cost only depends on the size
+        of ``records``.
+        """
+        groups = {}
+        for record in records:
+            month = record['transaction_date'].astimezone(dt_timezone.utc).date().replace(day=1)
+            for client_id in (record['client_id'], ALL_CLIENTS):
+                groups.setdefault((client_id, month), []).append(record)
+
+        sketches = []
+        for (client_id, month), group in sorted(groups.items()):
+            sketch = cls(client_id=client_id, month=month)
+            sketch.add(group)
+            sketches.append(sketch)
+        cls.objects.bulk_create(sketches)
+
+    @classmethod
+    def compact(cls, batch_size: int = 1000) -> int:
+        """
+        Merge the rows of each client and month into one and return how many
+        rows were folded away.
+
+        Rows are locked with ``SKIP LOCKED``, so loads inserting new rows are
+        never blocked and concurrent compactions split the work.
+        """
+        removed = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT id FROM {cls._meta.db_table}
+                    WHERE (client_id, month) IN (
+                        SELECT client_id, month FROM {cls._meta.db_table}
+                        GROUP BY client_id, month
+                        HAVING COUNT(*) > 1
+                        LIMIT %s
+                    )
+                    ORDER BY client_id, month, id
+                    FOR UPDATE SKIP LOCKED
+                    """,
+                    [batch_size]
+                )
+                ids = [row[0] for row in cursor.fetchall()]
+
+                groups = {}
+                for sketch in cls.objects.filter(id__in=ids).order_by('id'):
+                    groups.setdefault((sketch.client_id, sketch.month), []).append(sketch)
+                survivors, folded = [], []
+                for kept, *others in groups.values():
+                    if others:
+                        kept.merge(others)
+                        survivors.append(kept)
+                        folded.extend(sketch.id for sketch in others)
+                if not folded:
+                    return removed
+
+                cls.objects.bulk_update(survivors, ['transaction_count', 'amounts', 'currencies', 'clients'])
+                cls.objects.filter(id__in=folded).delete()
+                removed += len(folded)
+
+    def add(self, records):
+        amounts = KLLSketch.from_bytes(bytes(self.amounts))
+        currencies = HyperLogLog.from_bytes(bytes(self.currencies))
+        clients = HyperLogLog.from_bytes(bytes(self.clients)) if self.client_id == ALL_CLIENTS else None
+        for record in records:
+            amounts.update(abs(float(record['amount'])))
+            currencies.update(record['currency'])
+            if clients is not None:
+                clients.update(record['client_id'])
+
+        self.transaction_count += len(records)
+        self.amounts = amounts.to_bytes()
+        self.currencies = currencies.to_bytes()
+        if clients is not None:
+            self.clients = clients.to_bytes()
+
+    def merge(self, others):
+        """Fold the sketches of ``others``, rows of the same client and month, into this one."""
+        amounts = KLLSketch.from_bytes(bytes(self.amounts))
+        currencies = HyperLogLog.from_bytes(bytes(self.currencies))
+        clients = HyperLogLog.from_bytes(bytes(self.clients))
+        for other in others:
+            self.transaction_count += other.transaction_count
+            amounts.merge(KLLSketch.from_bytes(bytes(other.amounts)))
+            currencies.merge(HyperLogLog.from_bytes(bytes(other.currencies)))
+            clients.merge(HyperLogLog.from_bytes(bytes(other.clients)))
+
+        self.amounts = amounts.to_bytes()
+        self.currencies = currencies.to_bytes()
+        if self.client_id == ALL_CLIENTS:
+            self.clients = clients.to_bytes()
+
+    def __str__(self):
+        return f"{self.client_id or 'all clients'} {self.month:%Y-%m}"
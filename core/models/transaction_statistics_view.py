@@ -1,10 +1,15 @@
-from django.db import connection, models
+from django.db import connection, models, transaction
 from django.utils import timezone
+from core import versioning
 from core.models.view import MaterializedViewRefresh
 
 
 class TransactionStatistics(models.Model):
+    # Versioning scope bumped by every successful refresh.
+    VERSION_SCOPE = versioning.table_scope('transaction_statistics')
+
     client_id = models.CharField(max_length=50, primary_key=True)
+    country = models.CharField(max_length=100, null=True, help_text="Copied from core_client at refresh time")
     total_transactions = models.IntegerField()
     total_spent = models.DecimalField(max_digits=25, decimal_places=2)
     total_gained = models.DecimalField(max_digits=25, decimal_places=2)
@@ -13,6 +18,13 @@ class TransactionStatistics(models.Model):
         managed = False
         db_table = 'transaction_statistics'
 
+    @classmethod
+    def last_refreshed_at(cls):
+        """Completion time of the last successful refresh, or None."""
+        return MaterializedViewRefresh.objects.filter(
+            view_name='transaction_statistics', success=True
+        ).order_by('-completed_at').values_list('completed_at', flat=True).first()
+
     @classmethod
     def refresh(cls):
         refresh_record = MaterializedViewRefresh.objects.create(
@@ -21,7 +33,10 @@ class TransactionStatistics(models.Model):
         )
         try:
             start_time = timezone.now()
-            with connection.cursor() as cursor:
+            with transaction.atomic(), connection.cursor() as cursor:
+                # GROUP BY client_id matches the client hash sub-partitions, so
+                # each bucket can be aggregated on its own under a Parallel Append.
+                cursor.execute("SET LOCAL enable_partitionwise_aggregate = on")
                 cursor.execute("REFRESH MATERIALIZED VIEW transaction_statistics")
 
             duration = (timezone.now() - start_time).total_seconds()
@@ -30,6 +45,7 @@ class TransactionStatistics(models.Model):
             refresh_record.success = True
             refresh_record.duration_seconds = duration
             refresh_record.save()
+            versioning.bump([cls.VERSION_SCOPE])
 
         except Exception as e:
             refresh_record.completed_at = timezone.now()
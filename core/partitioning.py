@@ -0,0 +1,155 @@
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+import sqlparse
+from django.conf import settings
+from django.db import connection
+
+# Partition key expression of ``core_transaction`` (see 0004_transaction_partitioning).
+# Filters must repeat it verbatim for Postgres to prune partitions.
+PARTITION_YEAR_SQL = "(EXTRACT(YEAR FROM (transaction_date AT TIME ZONE 'UTC'))::INTEGER)"
+
+# Range partitions of ``core_transaction`` as (table, from_year, to_year);
+# None stands for MINVALUE / MAXVALUE.
+RANGE_PARTITIONS = [
+    ('transactions_historical', None, 2010),
+    ('transactions_2010_2014', 2010, 2015),
+    ('transactions_2015_2019', 2015, 2020),
+    ('transactions_2020_2024', 2020, 2025),
+    ('transactions_2025_2029', 2025, 2030),
+    ('transactions_future', 2030, None),
+]
+
+
+def partition_year(transaction_date) -> int:
+    """Return the partition key value for a transaction date."""
+    return transaction_date.astimezone(dt_timezone.utc).year
+
+
+def range_partition(year: int) -> str:
+    """Return the range partition holding ``year``."""
+    for table, from_year, to_year in RANGE_PARTITIONS:
+        if (from_year is None or year >= from_year) and (to_year is None or year < to_year):
+            return table
+    raise ValueError(f"No partition for year {year}")
+
+
+def leaf_partition(range_table: str, bucket: int) -> str:
+    """Return the name of the client hash bucket ``bucket`` of ``range_table``."""
+    return f"{range_table}_b{bucket}"
+
+
+def configured_client_buckets() -> int:
+    """Number of client hash buckets the migrations create per range partition."""
+    return max(getattr(settings, 'TRANSACTION_CLIENT_BUCKETS', 1), 1)
+
+
+@lru_cache(maxsize=None)
+def client_bucket_modulus():
+    """
+    Return the number of client hash buckets the range partitions are split
+    into, or None when they are plain tables.
+
+    The layout is read from the catalog rather than from settings so that the
+    loader always matches the schema the migrations actually built.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT parent.relname, COUNT(i.inhrelid)
+            FROM pg_class parent
+            JOIN pg_partitioned_table pt ON pt.partrelid = parent.oid AND pt.partstrat = 'h'
+            JOIN pg_inherits i ON i.inhparent = parent.oid
+            WHERE parent.relname = ANY(%s)
+            GROUP BY parent.relname
+            """,
+            [[table for table, _, _ in RANGE_PARTITIONS]]
+        )
+        rows = cursor.fetchall()
+
+    moduli = {count for _, count in rows}
+    if len(rows) != len(RANGE_PARTITIONS) or len(moduli) != 1:
+        return None
+    return moduli.pop()
+
+
+def client_buckets(client_ids, modulus: int) -> dict:
+    """
+    Map each client id to its hash bucket.
+
+    Postgres' own ``satisfies_hash_partition`` is used so the result always
+    agrees with tuple routing. The hash only depends on the value and the key
+    type, which all range partitions share.
+    """
+    client_ids = list(set(client_ids))
+    if not client_ids:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.client_id, b.bucket
+            FROM unnest(%s::varchar[]) AS c(client_id)
+            CROSS JOIN LATERAL (
+                SELECT bucket FROM generate_series(0, %s - 1) AS bucket
+                WHERE satisfies_hash_partition(%s::regclass::oid, %s, bucket, c.client_id)
+            ) b
+            """,
+            [client_ids, modulus, RANGE_PARTITIONS[0][0], modulus]
+        )
+        return dict(cursor.fetchall())
+
+
+def _bound(value, unbounded):
+    return unbounded if value is None else str(value)
+
+
+def subpartition_sql(buckets: int) -> list:
+    """
+    SQL statements splitting every range partition into ``buckets`` hash
+    partitions on ``client_id``. Existing rows are copied into the new leaves.
+    """
+    statements = []
+    for table, from_year, to_year in RANGE_PARTITIONS:
+        statements.append(f"""
+            ALTER TABLE core_transaction DETACH PARTITION {table};
+            ALTER TABLE {table} RENAME TO {table}_unsplit;
+
+            CREATE TABLE {table} PARTITION OF core_transaction
+                FOR VALUES FROM ({_bound(from_year, 'MINVALUE')}) TO ({_bound(to_year, 'MAXVALUE')})
+                PARTITION BY HASH (client_id);
+        """)
+        for bucket in range(buckets):
+            leaf = leaf_partition(table, bucket)
+            statements.append(f"""
+            CREATE TABLE {leaf} PARTITION OF {table}
+                FOR VALUES WITH (MODULUS {buckets}, REMAINDER {bucket});
+            CREATE UNIQUE INDEX idx_{leaf}_transaction_id ON {leaf}(transaction_id);
+            CREATE INDEX idx_{leaf}_client ON {leaf}(client_id);
+            CREATE INDEX idx_{leaf}_date ON {leaf} USING btree(transaction_date);
+            """)
+        statements.append(f"""
+            INSERT INTO {table} SELECT * FROM {table}_unsplit;
+            DROP TABLE {table}_unsplit;
+        """)
+    return [statement for block in statements for statement in sqlparse.split(block)]
+
+
+def unsplit_sql() -> list:
+    """SQL statements folding hash sub-partitioned range partitions back into plain tables."""
+    statements = []
+    for table, from_year, to_year in RANGE_PARTITIONS:
+        suffix = table.replace('transactions_', '', 1)
+        statements.append(f"""
+            ALTER TABLE core_transaction DETACH PARTITION {table};
+            ALTER TABLE {table} RENAME TO {table}_split;
+
+            CREATE TABLE {table} PARTITION OF core_transaction
+                FOR VALUES FROM ({_bound(from_year, 'MINVALUE')}) TO ({_bound(to_year, 'MAXVALUE')});
+            CREATE UNIQUE INDEX idx_{suffix}_transaction_id ON {table}(transaction_id);
+            CREATE INDEX idx_{table}_client ON {table}(client_id);
+            CREATE INDEX idx_{table}_date ON {table} USING btree(transaction_date);
+
+            INSERT INTO {table} SELECT * FROM {table}_split;
+            DROP TABLE {table}_split CASCADE;
+        """)
+    return [statement for block in statements for statement in sqlparse.split(block)]
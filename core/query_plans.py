@@ -0,0 +1,127 @@
+"""
+Opt-in capture of ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` for slow
+queries, installed per request by ``core.middleware.SlowQueryPlanMiddleware``.
+"""
+import hashlib
+import json
+import random
+import re
+import time
+from django.conf import settings
+from django.core.cache import cache
+from core.logging import logger
+
+PLAN_RATE_LIMIT_KEY = 'slow_query_plan:{}'
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|%\(\w+\)s')
+_VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(sql: str) -> str:
+    """``sql`` with literals and parameters replaced by ``?`` and ``IN`` lists collapsed, so similar queries match."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _VALUE_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha256(normalized_sql.encode()).hexdigest()
+
+
+def relations_scanned(plan) -> list:
+    """Relations (tables and partitions) read by plan nodes that actually ran, in plan order."""
+    relations = []
+
+    def walk(node):
+        if node.get('Relation Name') and node.get('Actual Loops', 1) > 0 and node['Relation Name'] not in relations:
+            relations.append(node['Relation Name'])
+        for child in node.get('Plans', []):
+            walk(child)
+
+    for statement in plan:
+        walk(statement['Plan'])
+    return relations
+
+
+class SlowQueryRecorder:
+    """
+    ``execute_wrapper`` that picks sampled SELECTs slower than the threshold
+    for explaining.
+
+    The wrapper only notes the query; ``explain`` re-runs the picked queries
+    later, once the middleware has the response and the request's metrics
+    are recorded, so the extra execution never counts in the request latency
+    or query time. It runs on the raw driver cursor inside a savepoint, so it
+    bypasses the wrappers and a failure cannot abort a transaction. Captured
+    plans are kept in ``plans`` for the middleware to save.
+    """
+
+    def __init__(self, connection, threshold_ms: float, sample_rate: float, interval: int):
+        self.connection = connection
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.pending = []
+        self.plans = []
+
+    @classmethod
+    def from_settings(cls, connection):
+        return cls(
+            connection,
+            settings.SLOW_QUERY_PLAN_THRESHOLD_MS,
+            settings.SLOW_QUERY_PLAN_SAMPLE_RATE,
+            settings.SLOW_QUERY_PLAN_INTERVAL
+        )
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if (duration_ms >= self.threshold_ms and not many and sql.lstrip()[:6].upper() == 'SELECT'
+                and random.random() < self.sample_rate):
+            self.pick(sql, params, duration_ms)
+        return result
+
+    def pick(self, sql, params, duration_ms: float):
+        normalized_sql = normalize(sql)
+        sql_fingerprint = fingerprint(normalized_sql)
+        # Cluster-wide: one plan per fingerprint per interval, whichever worker sees it first.
+        if cache.add(PLAN_RATE_LIMIT_KEY.format(sql_fingerprint), 1, timeout=self.interval):
+            self.pending.append((sql, params, duration_ms, normalized_sql, sql_fingerprint))
+
+    def explain(self):
+        """Run ``EXPLAIN ANALYZE`` for the queries picked so far and add their plans to ``plans``."""
+        pending, self.pending = self.pending, []
+        for sql, params, duration_ms, normalized_sql, sql_fingerprint in pending:
+            self.capture(sql, params, duration_ms, normalized_sql, sql_fingerprint)
+
+    def capture(self, sql, params, duration_ms: float, normalized_sql: str, sql_fingerprint: str):
+        try:
+            raw = self.connection.connection
+            with raw.transaction(), raw.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+        except Exception as e:
+            logger.warning("Slow query plan capture failed", extra={
+                'component': 'slow_query_plans',
+                'action': 'explain_failed',
+                'fingerprint': sql_fingerprint,
+                'error': str(e)
+            })
+            return
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        self.plans.append({
+            'fingerprint': sql_fingerprint,
+            'sql': normalized_sql,
+            'duration_ms': duration_ms,
+            'plan': plan,
+            'relations_scanned': relations_scanned(plan),
+        })
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.db import transaction
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from core import versioning
+from core.authentication import invalidate_tokens
+from core.models import Client, Transaction, TransactionLookup
+from core.models.transaction_rollup import forget_clients
+
+
+# Generations are bumped once committed, so that a reader racing the write
+# cannot cache the old rows under the new generation.
+@receiver(post_save, sender=Transaction)
+def transaction_saved(sender, instance, **kwargs):
+    client_ids = [instance.client_id]
+    transaction.on_commit(lambda: versioning.bump_client_generations(client_ids))
+
+
+@receiver(post_save, sender=Client)
+def client_saved(sender, instance, **kwargs):
+    scopes = [versioning.table_scope(Client._meta.db_table)]
+    transaction.on_commit(lambda: versioning.bump(scopes))
+
+
+# Connected on Client rather than Transaction: a delete receiver on
+# Transaction would stop Django from fast-deleting a client's transactions,
+# and that fast delete bypasses Transaction.delete. The client's derived
+# rows are dropped and its transaction ids released here instead.
+@receiver(pre_delete, sender=Client)
+def client_deleting(sender, instance, **kwargs):
+    forget_clients([instance.client_id])
+    transaction_ids = Transaction.objects.filter(client_id=instance.client_id).values('transaction_id')
+    TransactionLookup.objects.filter(pk__in=transaction_ids).delete()
+
+
+@receiver(post_delete, sender=Client)
+def client_deleted(sender, instance, **kwargs):
+    scopes = [versioning.client_scope(instance.client_id), versioning.table_scope(Client._meta.db_table)]
+    transaction.on_commit(lambda: versioning.bump(scopes))
+
+
+# Invalidated once committed: a request racing the change would otherwise
+# re-cache the old state read before the commit.
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    keys = [instance.key]  # Read now: the key is the pk, which the delete then clears.
+    transaction.on_commit(lambda: invalidate_tokens(keys))
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the cache does not hold.
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    keys = list(Token.objects.filter(user=instance).values_list('key', flat=True))
+    transaction.on_commit(lambda: invalidate_tokens(keys))
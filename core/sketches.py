@@ -0,0 +1,183 @@
+"""
+Mergeable sketches for approximate analytics.
+
+``KLLSketch`` estimates quantiles and ``HyperLogLog`` counts distinct values.
+Both can be built independently per partition (or per month and client),
+serialized to bytes, and merged later into a sketch of the union with the
+same error guarantees as if it had been built in one pass.
+"""
+import hashlib
+import math
+import random
+import struct
+from array import array
+
+KLL_DEFAULT_K = 200
+# Normalized rank error of a KLL sketch with k=200 at 99% confidence,
+# as published for the reference implementation (Apache DataSketches).
+KLL_RANK_ERROR = 0.0165
+
+HLL_PRECISION = 12
+# Standard error of the HyperLogLog estimate: 1.04 / sqrt(2 ** precision).
+HLL_RELATIVE_ERROR = 1.04 / math.sqrt(2 ** HLL_PRECISION)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Items are kept in a hierarchy of compactors; level ``h`` items carry a
+    weight of ``2 ** h``. A full compactor sorts itself and promotes every
+    other item to the next level, so space stays O(k) while the rank error
+    of any quantile is about ``KLL_RANK_ERROR`` of ``n``.
+    """
+
+    def __init__(self, k: int = KLL_DEFAULT_K, rng=None):
+        self.k = k
+        self.n = 0
+        self.compactors = []
+        self.rng = rng or random.Random()
+        self._grow()
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil((2 / 3) ** depth * self.k)) + 1
+
+    def _size(self) -> int:
+        return sum(len(compactor) for compactor in self.compactors)
+
+    def update(self, value: float):
+        self.compactors[0].append(value)
+        self.n += 1
+        if self._size() >= self.max_size:
+            self._compress()
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            compactor = self.compactors[level]
+            if len(compactor) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+                compactor.sort()
+                # An odd item out stays behind so total weight is preserved.
+                keep = [compactor.pop()] if len(compactor) % 2 else []
+                self.compactors[level + 1].extend(compactor[self.rng.randint(0, 1)::2])
+                self.compactors[level] = keep
+                if self._size() < self.max_size:
+                    break
+
+    def merge(self, other: 'KLLSketch'):
+        """Fold ``other`` into this sketch."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        while self._size() >= self.max_size:
+            self._compress()
+
+    def quantiles(self, fractions):
+        """Return the estimated value at each fraction in [0, 1], or None when empty."""
+        weighted = sorted(
+            (value, 1 << level) for level, compactor in enumerate(self.compactors) for value in compactor
+        )
+        if not weighted:
+            return [None for _ in fractions]
+
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for fraction in fractions:
+            target = fraction * total
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    break
+            results.append(value)
+        return results
+
+    def to_bytes(self) -> bytes:
+        parts = [struct.pack('<HHQ', self.k, len(self.compactors), self.n)]
+        for compactor in self.compactors:
+            parts.append(struct.pack('<I', len(compactor)))
+            parts.append(array('d', compactor).tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, rng=None) -> 'KLLSketch':
+        sketch = cls(rng=rng)
+        if not data:
+            return sketch
+
+        sketch.k, levels, sketch.n = struct.unpack_from('<HHQ', data)
+        offset = struct.calcsize('<HHQ')
+        sketch.compactors = []
+        for _ in range(levels):
+            size, = struct.unpack_from('<I', data, offset)
+            offset += 4
+            values = array('d')
+            values.frombytes(data[offset:offset + 8 * size])
+            offset += 8 * size
+            sketch.compactors.append(values.tolist())
+        sketch.max_size = sum(sketch._capacity(level) for level in range(len(sketch.compactors)))
+        return sketch
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter (Flajolet et al. 2007) over 64-bit hashes,
+    with linear counting for small cardinalities.
+
+    Registers are serialized sparsely while few are set, so sketches of a
+    handful of values (e.g. one client's currencies) stay a few bytes long.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def update(self, value: str):
+        hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog'):
+        """Fold ``other`` into this sketch."""
+        self.registers = bytearray(max(pair) for pair in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        zeros = self.registers.count(0)
+        if zeros == m:
+            return 0
+
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        used = [(index, rank) for index, rank in enumerate(self.registers) if rank]
+        if len(used) * 3 < len(self.registers):
+            return b'S' + b''.join(struct.pack('<HB', index, rank) for index, rank in used)
+        return b'D' + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        sketch = cls()
+        if not data:
+            return sketch
+        if data[:1] == b'D':
+            sketch.registers = bytearray(data[1:])
+        else:
+            for index, rank in struct.iter_unpack('<HB', data[1:]):
+                sketch.registers[index] = rank
+        return sketch
@@ -0,0 +1,35 @@
+"""
+Test helpers.
+
+Tests that clear the cache would otherwise wipe the shared Redis database,
+along with the throttle buckets, metrics histograms and data generations of
+anything else using it. ``isolated_cache`` points all of them at
+``TEST_REDIS_URL`` instead.
+"""
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.test import override_settings
+from core import metrics, throttle
+
+
+def isolated_cache():
+    """``override_settings`` moving the cache, throttle and metrics to the test database."""
+    if settings.TEST_REDIS_URL:
+        cache = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': settings.TEST_REDIS_URL}
+    else:
+        cache = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}
+    return override_settings(
+        CACHES={'default': cache},
+        THROTTLE_REDIS_URL=settings.TEST_REDIS_URL,
+        METRICS_REDIS_URL=settings.TEST_REDIS_URL,
+    )
+
+
+@receiver(setting_changed)
+def reset_redis_clients(setting, **kwargs):
+    # The clients are created once per process from the URL settings.
+    if setting == 'THROTTLE_REDIS_URL':
+        throttle._script = None
+    elif setting == 'METRICS_REDIS_URL':
+        metrics._redis = None
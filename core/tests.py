@@ -1,3 +1,156 @@
-from django.test import TestCase
+import json
+import logging
+import threading
+import time
+from django.test import SimpleTestCase
+from core import metrics
+from core.query_plans import normalize, relations_scanned
+from core.logging import (
+    MAX_COLLECTION_ITEMS,
+    MAX_LINE_LENGTH,
+    MAX_STRING_LENGTH,
+    BoundedQueueHandler,
+    CustomFormatter,
+    StructuredFormatter,
+    start_listener
+)
 
-# Create your tests here.
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class BoundedQueueHandlerTests(SimpleTestCase):
+    def make_logger(self, handler):
+        logger = logging.getLogger(f'test.{self._testMethodName}')
+        logger.handlers = [handler]
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        return logger
+
+    def test_records_are_written_by_the_listener(self):
+        queue_handler = BoundedQueueHandler(100)
+        output = ListHandler()
+        output.setFormatter(CustomFormatter())
+        listener = start_listener(queue_handler, [output])
+
+        self.make_logger(queue_handler).info("Chunk %s loaded", 3, extra={'component': 'etl', 'job_id': 7})
+        listener.stop()
+
+        self.assertEqual(len(output.messages), 1)
+        self.assertIn('Chunk 3 loaded', output.messages[0])
+        self.assertIn('Component: etl\nJob ID: 7', output.messages[0])
+
+    def test_drop_policy_counts_dropped_records(self):
+        queue_handler = BoundedQueueHandler(2, 'drop')
+        logger = self.make_logger(queue_handler)
+        for i in range(5):
+            logger.info("record %s", i)
+
+        self.assertEqual(queue_handler.stats(), {'dropped': 3, 'depth': 2, 'capacity': 2})
+
+    def test_block_policy_waits_for_room(self):
+        queue_handler = BoundedQueueHandler(1, 'block')
+        logger = self.make_logger(queue_handler)
+        logger.info("first")
+
+        def drain_later():
+            time.sleep(0.05)
+            queue_handler.queue.get()
+        drain = threading.Thread(target=drain_later)
+        drain.start()
+        logger.info("second")
+        drain.join()
+
+        self.assertEqual(queue_handler.dropped, 0)
+        self.assertEqual(queue_handler.queue.get_nowait().getMessage(), 'second')
+
+    def test_queued_records_are_bounded_snapshots(self):
+        queue_handler = BoundedQueueHandler(10)
+        rows = [{'row': i} for i in range(1000)]
+        self.make_logger(queue_handler).info("Loaded %s", 'chunk', extra={'component': 'etl', 'rows': rows})
+        rows.clear()
+
+        record = queue_handler.queue.get_nowait()
+        self.assertEqual(record.getMessage(), 'Loaded chunk')
+        self.assertEqual(record.component, 'etl')
+        self.assertEqual(record.rows['_total'], 1000)
+        self.assertEqual(len(record.rows['_sample']), MAX_COLLECTION_ITEMS)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(1, 'spill')
+
+
+class StructuredFormatterTests(SimpleTestCase):
+    def format(self, **extra):
+        record = logging.LogRecord('neo_challenge', logging.WARNING, __file__, 1, "Validation failed for %s", ('chunk',), None)
+        record.__dict__.update(extra)
+        return StructuredFormatter(datefmt='%Y-%m-%d %H:%M:%S').format(record)
+
+    def test_one_json_line_with_extras(self):
+        line = self.format(component='etl', action='validate', job_id=3, query_params={'page_size': '10'})
+        self.assertNotIn('\n', line)
+        entry = json.loads(line)
+        self.assertEqual(entry['level'], 'WARNING')
+        self.assertEqual(entry['message'], 'Validation failed for chunk')
+        self.assertEqual((entry['component'], entry['action'], entry['job_id']), ('etl', 'validate', 3))
+        self.assertEqual(entry['query_params'], {'page_size': '10'})
+
+    def test_large_values_are_bounded(self):
+        validation_errors = [{'row': i, 'errors': {'amount': ['Invalid amount'] * 50}} for i in range(200000)]
+        started = time.perf_counter()
+        line = self.format(validation_errors=validation_errors, file_path='x' * 100000)
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+        self.assertLessEqual(len(line), MAX_LINE_LENGTH)
+        entry = json.loads(line)
+        self.assertEqual(entry['validation_errors']['_total'], 200000)
+        self.assertEqual(len(entry['validation_errors']['_sample']), MAX_COLLECTION_ITEMS)
+        self.assertEqual(entry['validation_errors']['_sample'][1]['row'], 10000)
+        self.assertEqual(entry['validation_errors']['_sample'][0]['errors']['amount']['_total'], 50)
+        self.assertTrue(entry['file_path'].endswith('...[98000 more chars]'))
+
+    def test_oversized_line_keeps_message(self):
+        extra = {f'field_{i}': 'y' * MAX_STRING_LENGTH for i in range(20)}
+        entry = json.loads(self.format(**extra))
+        self.assertEqual(entry['message'], 'Validation failed for chunk')
+        self.assertIn('_truncated', entry)
+        self.assertNotIn('field_0', entry)
+
+
+class HistogramTests(SimpleTestCase):
+    def test_observations_render_as_cumulative_buckets(self):
+        labels = {'view': self._testMethodName, 'method': 'GET'}
+        metrics.redis_client().delete(metrics.HISTOGRAM_KEY.format('http_request_queries'))
+        metrics.observe_many([('http_request_queries', count, labels) for count in (0, 3, 3, 500)])
+
+        text = metrics.render()
+        selector = f'method="GET",view="{self._testMethodName}"'
+        self.assertIn(f'http_request_queries_bucket{{{selector},le="0"}} 1', text)
+        self.assertIn(f'http_request_queries_bucket{{{selector},le="2"}} 1', text)
+        self.assertIn(f'http_request_queries_bucket{{{selector},le="5"}} 3', text)
+        self.assertIn(f'http_request_queries_bucket{{{selector},le="100"}} 3', text)
+        self.assertIn(f'http_request_queries_bucket{{{selector},le="+Inf"}} 4', text)
+        self.assertIn(f'http_request_queries_sum{{{selector}}} 506.000000', text)
+        self.assertIn(f'http_request_queries_count{{{selector}}} 4', text)
+
+
+class QueryPlanTests(SimpleTestCase):
+    def test_normalize_replaces_literals_and_parameters(self):
+        self.assertEqual(
+            normalize("SELECT * FROM t WHERE a = 'x''y' AND b IN (%s, %s,  %s)\n  LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?"
+        )
+
+    def test_relations_scanned_skips_pruned_partitions(self):
+        plan = [{'Plan': {'Node Type': 'Append', 'Plans': [
+            {'Node Type': 'Index Scan', 'Relation Name': 'transactions_2020_2024', 'Actual Loops': 1},
+            {'Node Type': 'Seq Scan', 'Relation Name': 'transactions_future', 'Actual Loops': 0},
+        ]}}]
+        self.assertEqual(relations_scanned(plan), ['transactions_2020_2024'])
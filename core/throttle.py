@@ -1,5 +1,133 @@
-from rest_framework.throttling import UserRateThrottle
+import redis
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+from core.logging import logger
 
+# Token buckets in one round trip: a request is allowed only if every bucket
+# in KEYS (with capacity and refill rate pairs in ARGV) has a token, and then
+# takes one from each. Redis runs scripts atomically, so every process and
+# node shares the buckets, and the server clock is used so that clock skew
+# between API hosts does not matter.
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
 
-class CustomRateThrottle(UserRateThrottle):
-    rate = '20/minute'
\ No newline at end of file
+local allowed = 1
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local refill_rate = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'updated_at')
+    local tokens = tonumber(state[1]) or capacity
+    local updated_at = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * refill_rate)
+    if tokens < 1 then
+        allowed = 0
+        wait = math.max(wait, (1 - tokens) / refill_rate)
+    end
+    levels[i] = tokens
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local refill_rate = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', levels[i] - allowed, 'updated_at', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / refill_rate * 1000))
+end
+return {allowed, tostring(wait)}
+"""
+
+THROTTLE_KEY = 'throttle:{}:{}'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_script = None
+
+
+def parse_rate(rate: str):
+    """Return ``(capacity, tokens per second)`` for a DRF style rate such as ``'20/minute'``."""
+    count, period = rate.split('/')
+    return int(count), int(count) / PERIODS[period[0]]
+
+
+def _token_bucket():
+    global _script
+    if _script is None:
+        client = redis.Redis.from_url(settings.THROTTLE_REDIS_URL, socket_timeout=0.1, socket_connect_timeout=0.1)
+        _script = client.register_script(TOKEN_BUCKET_SCRIPT)
+    return _script
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Cluster-wide rate limit with a token bucket per endpoint and client.
+
+    Rates come from ``settings.THROTTLE_RATES``: a ``default`` entry and
+    optional per-endpoint entries keyed by URL name, each mapping a tier
+    (``anon``, ``user`` or ``staff``) to a DRF style rate. Endpoints with
+    their own entry get their own bucket; all others share the default one.
+    On top of that, ``settings.THROTTLE_DAILY_RATES`` gives each client one
+    daily quota per tier, shared by every endpoint. Buckets live in Redis (``THROTTLE_REDIS_URL``) and each check is one
+    atomic script call covering both buckets. Requests are let through when Redis is unavailable
+    or not configured, so an outage degrades to no throttling rather than
+    failing the API.
+    """
+
+    def get_tier(self, request) -> str:
+        if not request.user or not request.user.is_authenticated:
+            return 'anon'
+        return 'staff' if request.user.is_staff else 'user'
+
+    def get_rate(self, request, view):
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        rates = settings.THROTTLE_RATES
+        tier = self.get_tier(request)
+        scope = url_name if tier in rates.get(url_name, {}) else 'default'
+        if tier not in rates.get(scope, {}):
+            raise ImproperlyConfigured(f"No throttle rate for tier '{tier}'")
+        return scope, tier, rates[scope][tier]
+
+    def get_cache_key(self, request, scope) -> str:
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return THROTTLE_KEY.format(scope, ident)
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        if not settings.THROTTLE_REDIS_URL:
+            return True
+
+        scope, tier, rate = self.get_rate(request, view)
+        keys, args = [self.get_cache_key(request, scope)], list(parse_rate(rate))
+        daily_rate = settings.THROTTLE_DAILY_RATES.get(tier)
+        if daily_rate:
+            keys.append(self.get_cache_key(request, 'daily'))
+            args.extend(parse_rate(daily_rate))
+        try:
+            allowed, wait = _token_bucket()(keys=keys, args=args)
+        except redis.RedisError as e:
+            logger.warning("Throttle check skipped", extra={
+                'component': 'throttle',
+                'action': 'redis_unavailable',
+                'scope': scope,
+                'error': str(e)
+            })
+            return True
+
+        if allowed:
+            return True
+        self.wait_seconds = float(wait)
+        logger.info("Request throttled", extra={
+            'component': 'throttle',
+            'action': 'throttled',
+            'scope': scope,
+            'tier': tier,
+            'keys': keys
+        })
+        return False
+
+    def wait(self):
+        return self.wait_seconds
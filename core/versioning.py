@@ -0,0 +1,83 @@
+"""
+Data versions used to invalidate cached API responses.
+
+Every scope (one client's transactions, or a whole table) has a generation
+number and a last-write watermark in the shared cache. Anything derived from
+a scope is cached or tagged with its version, so bumping the generation makes
+stale entries unreachable and they simply expire.
+"""
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+GENERATION_COUNTER_KEY = 'versioning:generation'
+GENERATION_KEY = 'versioning:{}:generation'
+WATERMARK_KEY = 'versioning:{}:watermark'
+
+
+def client_scope(client_id) -> str:
+    return f'client:{client_id}'
+
+
+def table_scope(table: str) -> str:
+    return f'table:{table}'
+
+
+def generation(scope: str) -> int:
+    """Current generation of ``scope``."""
+    key = GENERATION_KEY.format(scope)
+    value = cache.get(key)
+    if value is None:
+        # The generation may have been evicted; start a fresh one rather than
+        # fall back to a value older entries could still be keyed under.
+        cache.add(key, _next_generation(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+def client_generation(client_id) -> int:
+    """Current generation of ``client_id``'s transaction data."""
+    return generation(client_scope(client_id))
+
+
+def data_version(scope: str) -> str:
+    """Generation and last-write watermark of ``scope``, read in one round trip."""
+    keys = [GENERATION_KEY.format(scope), WATERMARK_KEY.format(scope)]
+    values = cache.get_many(keys)
+    current = values[keys[0]] if keys[0] in values else generation(scope)
+    return f'{current}.{values.get(keys[1], 0)}'
+
+
+def _next_generation() -> int:
+    # Seeded from the clock so generations keep increasing even if the
+    # counter is ever lost from the cache.
+    cache.add(GENERATION_COUNTER_KEY, time.time_ns() // 1000, timeout=None)
+    return cache.incr(GENERATION_COUNTER_KEY)
+
+
+def bump(scopes):
+    """
+    Invalidate cached data of ``scopes`` once the current transaction commits.
+
+    Bumping after the commit guarantees a reader can never cache pre-commit
+    data under the new generation.
+    """
+    scopes = set(scopes)
+    if not scopes:
+        return
+
+    def apply():
+        new_generation = _next_generation()
+        watermark = time.time_ns() // 1000
+        versions = {}
+        for scope in scopes:
+            versions[GENERATION_KEY.format(scope)] = new_generation
+            versions[WATERMARK_KEY.format(scope)] = watermark
+        cache.set_many(versions, timeout=None)
+
+    transaction.on_commit(apply)
+
+
+def bump_client_generations(client_ids):
+    """Invalidate cached transaction data of ``client_ids`` once the current transaction commits."""
+    bump(client_scope(client_id) for client_id in client_ids)
@@ -1,3 +1,9 @@
-from django.shortcuts import render
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from core import metrics as core_metrics
 
-# Create your views here.
+
+@require_GET
+def metrics(request):
+    """Expose the shared counters for Prometheus scraping."""
+    return HttpResponse(core_metrics.render(), content_type='text/plain; version=0.0.4')
@@ -0,0 +1,296 @@
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from core import partitioning
+from core.models import Client
+from core.models.etl_job import ETLJob
+from core.models.transaction_statistics_view import TransactionStatistics
+from etl import tasks
+
+STAGES = ['load', 'validate', 'insert', 'refresh_statistics', 'compact_sketches']
+CLIENT_COLUMNS = ['client_id', 'name', 'email', 'date_of_birth', 'country', 'account_balance']
+TRANSACTION_COLUMNS = ['transaction_id', 'client_id', 'transaction_type', 'transaction_date', 'amount', 'currency']
+COUNTRIES = ['France', 'Germany', 'Spain', 'Italy', 'USA', 'Canada', 'Japan', 'Brazil']
+CURRENCIES = ['USD', 'EUR', 'GBP', 'JPY']
+
+
+class RSSSampler(threading.Thread):
+    """
+    Sample this process's resident set size and keep the overall peak and
+    the peak per ``etl.tasks.current_stage``. Stages shorter than the
+    interval may get no sample and report no peak.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self.peaks = {}
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def rss_bytes() -> int:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except OSError:
+            # No procfs: fall back to the process-wide peak (KB on Linux, bytes on macOS).
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def sample(self):
+        stage, rss = tasks.current_stage, self.rss_bytes()
+        self.peak = max(self.peak, rss)
+        if stage and rss > self.peaks.get(stage, 0):
+            self.peaks[stage] = rss
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the ETL on generated files: rows/s and peak RSS per stage, stored for regression comparison'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Transaction rows to generate')
+        parser.add_argument('--clients', type=int, help='Client rows to generate (default: rows / 10)')
+        parser.add_argument('--dirty', type=float, default=0.05,
+                            help='Share of rows that fail validation (bad email, date, type, currency, amount sign)')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per insert chunk')
+        parser.add_argument('--engine', type=str, default='c', choices=['c', 'python', 'pyarrow'],
+                            help='pandas CSV engine used to read the files')
+        parser.add_argument('--label', type=str, help='Name of this configuration in the results (default: engine)')
+        parser.add_argument('--results', type=str, default='benchmarks/etl_results.jsonl',
+                            help='JSON lines file the run is appended to')
+        parser.add_argument('--compare-label', type=str,
+                            help='Compare with the latest stored run of this label (default: this label)')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Relative rows/s drop of a stage that counts as a regression')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error on a regression')
+        parser.add_argument('--in-place', action='store_true',
+                            help='Load into the configured database and delete the loaded rows afterwards, instead of '
+                                 'a scratch database created and dropped around the run')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data')
+
+    def write_clients(self, path, count, dirty, rng) -> list:
+        client_ids = []
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(CLIENT_COLUMNS)
+            for i in range(count):
+                client_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+                row = [client_id, f'Client {i}', f'client{i}@example.com',
+                       (datetime(1950, 1, 1) + timedelta(days=rng.randrange(20000))).date().isoformat(),
+                       rng.choice(COUNTRIES), f'{rng.uniform(0, 100000):.2f}']
+                if rng.random() < dirty:
+                    column, value = rng.choice([(2, 'not-an-email'), (3, 'not-a-date'), (5, 'not-a-number')])
+                    row[column] = value
+                else:
+                    client_ids.append(client_id)
+                writer.writerow(row)
+        return client_ids
+
+    def write_transactions(self, path, count, client_ids, dirty, rng):
+        start = datetime(2015, 1, 1)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(TRANSACTION_COLUMNS)
+            for _ in range(count):
+                transaction_type = rng.choice(['BUY', 'SELL'])
+                amount = rng.uniform(1, 5000) * (1 if transaction_type == 'BUY' else -1)
+                row = [str(uuid.UUID(int=rng.getrandbits(128), version=4)), rng.choice(client_ids), transaction_type,
+                       (start + timedelta(seconds=rng.randrange(10 * 365 * 86400))).isoformat(sep=' '),
+                       f'{amount:.2f}', rng.choice(CURRENCIES)]
+                if rng.random() < dirty:
+                    column, value = rng.choice([(2, 'HOLD'), (5, 'DOLLARS'), (4, f'{-amount:.2f}')])
+                    row[column] = value
+                writer.writerow(row)
+
+    def measure(self, process, path, options) -> dict:
+        sampler = RSSSampler()
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            result = process(path, chunk_size=options['chunk_size'], csv_engine=options['engine'])
+        finally:
+            elapsed = time.perf_counter() - started
+            sampler.stop()
+        peaks = sampler.peaks
+        if not result['success']:
+            raise CommandError(f"ETL failed on {path}: {result['error']}")
+
+        input_rows = result['total_rows']
+        stage_rows = {
+            'load': input_rows,
+            'validate': input_rows,
+            'insert': input_rows - result['validation_failed_count'],
+            'refresh_statistics': result['processed_count'],
+            'compact_sketches': result['processed_count'],
+        }
+        stages = {}
+        for name in STAGES:
+            if name not in result['stage_seconds']:
+                continue
+            seconds = result['stage_seconds'][name]
+            stages[name] = {
+                'rows': stage_rows[name],
+                'seconds': round(seconds, 4),
+                'rows_per_second': round(stage_rows[name] / seconds, 1) if seconds else None,
+                'peak_rss_mb': round(peaks[name] / 2 ** 20, 1) if name in peaks else None,
+            }
+        return {
+            'rows': input_rows,
+            'processed': result['processed_count'],
+            'failed': result['failed_count'],
+            'seconds': round(elapsed, 4),
+            'rows_per_second': round(input_rows / elapsed, 1),
+            'peak_rss_mb': round(sampler.peak / 2 ** 20, 1),
+            'stages': stages,
+        }
+
+    @contextmanager
+    def scratch_database(self):
+        """
+        Run against a freshly migrated copy of the schema, dropped afterwards.
+
+        Loads commit chunk by chunk exactly as in production, which a
+        rolled-back transaction around the run would not measure.
+        """
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        previous_test_name, name = test_settings.get('NAME'), connection.settings_dict['NAME']
+        test_settings['NAME'] = f'{name}_etl_benchmark'
+        partitioning.client_bucket_modulus.cache_clear()
+        self.stdout.write(f"Creating scratch database {test_settings['NAME']}")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(name, verbosity=0)
+            test_settings['NAME'] = previous_test_name
+            partitioning.client_bucket_modulus.cache_clear()
+
+    @staticmethod
+    def delete_loaded(client_ids, directory):
+        """Delete what the run loaded: its clients, with their transactions and derived rows, and its ETL jobs."""
+        Client.objects.filter(client_id__in=client_ids).delete()
+        ETLJob.objects.filter(job_name__contains=directory).delete()
+        TransactionStatistics.refresh()
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    @staticmethod
+    def load_baseline(path, label, run):
+        """Latest stored run of ``label`` on the same input size and dirtiness."""
+        if not os.path.exists(path):
+            return None
+        baseline = None
+        with open(path) as f:
+            for line in f:
+                stored = json.loads(line)
+                if (stored['label'], stored['rows'], stored['clients'], stored['dirty']) == \
+                        (label, run['rows'], run['clients'], run['dirty']):
+                    baseline = stored
+        return baseline
+
+    def compare(self, run, baseline, threshold) -> list:
+        regressions = []
+        for file_kind, current in run['files'].items():
+            for name, stage in current['stages'].items():
+                before = baseline['files'].get(file_kind, {}).get('stages', {}).get(name, {}).get('rows_per_second')
+                if not before or not stage['rows_per_second']:
+                    continue
+                change = stage['rows_per_second'] / before - 1
+                line = (f"{file_kind}/{name}: {stage['rows_per_second']:,.0f} rows/s "
+                        f"(baseline {before:,.0f}, {change:+.1%})")
+                if change < -threshold:
+                    regressions.append(line)
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+        return regressions
+
+    def run_files(self, run, clients_file, transactions_file, options):
+        run['files']['clients'] = self.measure(tasks.process_clients_file, clients_file, options)
+        run['files']['transactions'] = self.measure(tasks.process_transactions_file, transactions_file, options)
+
+    def handle(self, *args, **options):
+        rows, dirty = options['rows'], options['dirty']
+        clients = options['clients'] or max(rows // 10, 1)
+        if not 0 <= dirty < 1:
+            raise CommandError('--dirty must be in [0, 1)')
+        label = options['label'] or options['engine']
+        rng = random.Random(options['seed'])
+
+        run = {
+            'timestamp': timezone.now().isoformat(),
+            'label': label,
+            'git_commit': self.git_commit(),
+            'engine': options['engine'],
+            'rows': rows,
+            'clients': clients,
+            'dirty': dirty,
+            'chunk_size': options['chunk_size'],
+            'files': {},
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            clients_file = os.path.join(directory, 'clients.csv')
+            transactions_file = os.path.join(directory, 'transactions.csv')
+            client_ids = self.write_clients(clients_file, clients, dirty, rng)
+            if not client_ids:
+                raise CommandError('Every generated client is dirty; lower --dirty or raise --clients')
+            self.write_transactions(transactions_file, rows, client_ids, dirty, rng)
+
+            if options['in_place']:
+                try:
+                    self.run_files(run, clients_file, transactions_file, options)
+                finally:
+                    self.delete_loaded(client_ids, directory)
+            else:
+                with self.scratch_database():
+                    self.run_files(run, clients_file, transactions_file, options)
+
+        for file_kind, result in run['files'].items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{file_kind}: {result['rows']} rows in {result['seconds']:.2f}s "
+                f"({result['rows_per_second']:,.0f} rows/s, peak RSS {result['peak_rss_mb']} MB)"
+            ))
+            for name, stage in result['stages'].items():
+                self.stdout.write(
+                    f"  {name}: {stage['seconds']:.3f}s, {stage['rows_per_second'] or 0:,.0f} rows/s, "
+                    f"peak RSS {stage['peak_rss_mb']} MB"
+                )
+
+        baseline = self.load_baseline(options['results'], options['compare_label'] or label, run)
+        regressions = self.compare(run, baseline, options['threshold']) if baseline else []
+
+        os.makedirs(os.path.dirname(options['results']) or '.', exist_ok=True)
+        with open(options['results'], 'a') as f:
+            f.write(json.dumps(run) + '\n')
+
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} stage(s) regressed by more than {options["threshold"]:.0%}')
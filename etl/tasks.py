@@ -1,15 +1,58 @@
+import time
+from contextlib import contextmanager
 from django.utils import timezone
 from celery import shared_task
 from django.db import transaction
 import pandas as pd
-from core.models import Client, Transaction
+from core.models import Client, Transaction, TransactionLookup, TransactionSketch, update_rollups
 from core.models.transaction_statistics_view import TransactionStatistics
 from core.models.etl_job import ETLJob
+from core import metrics, versioning
 from .processors import ClientProcessor, DataProcessor, TransactionProcessor
 from core.logging import logger
 
+# Name of the stage ``process_file`` is running, for samplers such as the
+# ``benchmark_etl`` command; None between stages.
+current_stage = None
+
+
+@contextmanager
+def stage(stages: dict, name: str, model):
+    """Time an ETL stage into ``stages`` (seconds, summed over chunks) and the ``etl_stage_duration_seconds`` histogram."""
+    global current_stage
+    current_stage = name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        current_stage = None
+        stages[name] = stages.get(name, 0) + elapsed
+        metrics.observe('etl_stage_duration_seconds', elapsed, stage=name, model=model.__name__)
+
+def bulk_insert(model, records) -> int:
+    """Insert ``records`` skipping conflicting rows, and return how many were created."""
+    if model == Transaction:
+        # The global lookup decides which ids are new, so no partition has to
+        # be probed and the same id cannot land in two different partitions.
+        claimed = TransactionLookup.claim(records)
+        new_records = []
+        for record in records:
+            if record['transaction_id'] in claimed:
+                new_records.append(record)
+                claimed.discard(record['transaction_id'])
+        Transaction.objects.bulk_create_in_partitions(new_records)
+        update_rollups(new_records)
+        return len(new_records)
+
+    initial_count = model.objects.count()
+    model.objects.bulk_create([model(**record) for record in records], ignore_conflicts=True)
+    return model.objects.count() - initial_count
+
 @shared_task
-def process_file(file_path: str, model, processor: DataProcessor, single_row_processing=False, chunk_size=1000) -> dict:
+def process_file(file_path: str, model, processor: DataProcessor, single_row_processing=False, chunk_size=1000,
+                 csv_engine='c') -> dict:
+    stages = {}
     job = ETLJob.objects.create(
         job_name=f"Process {model.__name__} from {file_path}",
         status='running'
@@ -26,8 +69,9 @@ def process_file(file_path: str, model, processor: DataProcessor, single_row_pro
 
     try:
 
-        df = (pd.read_csv(file_path, engine='c') if file_path.endswith('.csv')
-              else pd.read_excel(file_path, engine='openpyxl'))
+        with stage(stages, 'load', model):
+            df = (pd.read_csv(file_path, engine=csv_engine) if file_path.endswith('.csv')
+                  else pd.read_excel(file_path, engine='openpyxl'))
         logger.info("File loaded successfully", extra={
             'component': 'etl_processor',
             'action': 'file_loaded',
@@ -36,7 +80,8 @@ def process_file(file_path: str, model, processor: DataProcessor, single_row_pro
         })
 
 
-        valid_records, validation_failed_count, validation_errors = processor.process_data(df)
+        with stage(stages, 'validate', model):
+            valid_records, validation_failed_count, validation_errors = processor.process_data(df)
 
         if validation_errors:
             logger.warning("Validation errors found during processing", extra={
@@ -63,13 +108,12 @@ def process_file(file_path: str, model, processor: DataProcessor, single_row_pro
             })
 
             try:
-                with transaction.atomic():
-                    initial_count = model.objects.count()
-                    instances = [model(**record) for record in chunk]
-                    model.objects.bulk_create(instances, ignore_conflicts=True)
-                    final_count = model.objects.count()
-
-                    actually_created = final_count - initial_count
+                with transaction.atomic(), stage(stages, 'insert', model):
+                    actually_created = bulk_insert(model, chunk)
+                    if model == Transaction:
+                        versioning.bump_client_generations(record['client_id'] for record in chunk)
+                    else:
+                        versioning.bump([versioning.table_scope(model._meta.db_table)])
                     failed_in_chunk = len(chunk) - actually_created
 
                     processed_count += actually_created
@@ -93,28 +137,33 @@ def process_file(file_path: str, model, processor: DataProcessor, single_row_pro
                     'error': str(e)
                 })
 
-                for record in chunk:
-                    try:
-                        with transaction.atomic():
-                            model.objects.create(**record)
-                            processed_count += 1
-                    except Exception as individual_error:
-                        db_failed_count += 1
-                        error_detail = {
-                            'row': record,
-                            'error': f'Individual insert error: {str(individual_error)}'
-                        }
-                        db_errors.append(error_detail)
-                        logger.error("Individual record insertion failed", extra={
-                            'component': 'etl_processor',
-                            'action': 'record_insert_failed',
-                            'job_id': job.id,
-                            'error': str(individual_error),
-                            'record': record
-                        })
+                with stage(stages, 'insert', model):
+                    for record in chunk:
+                        try:
+                            with transaction.atomic():
+                                model.objects.create(**record)
+                                processed_count += 1
+                        except Exception as individual_error:
+                            db_failed_count += 1
+                            error_detail = {
+                                'row': record,
+                                'error': f'Individual insert error: {str(individual_error)}'
+                            }
+                            db_errors.append(error_detail)
+                            logger.error("Individual record insertion failed", extra={
+                                'component': 'etl_processor',
+                                'action': 'record_insert_failed',
+                                'job_id': job.id,
+                                'error': str(individual_error),
+                                'record': record
+                            })
 
         if model == Transaction:
-            TransactionStatistics.refresh()
+            with stage(stages, 'refresh_statistics', model):
+                TransactionStatistics.refresh()
+            # Chunks only append sketch rows; fold them outside the chunk transactions.
+            with stage(stages, 'compact_sketches', model):
+                TransactionSketch.compact()
 
         total_failed_count = validation_failed_count + db_failed_count
 
@@ -147,6 +196,7 @@ def process_file(file_path: str, model, processor: DataProcessor, single_row_pro
             'db_failed_count': db_failed_count,
             'total_rows': processed_count + total_failed_count,
             'success_rate': (processed_count / (processed_count + total_failed_count) * 100) if (processed_count + total_failed_count) > 0 else 0,
+            'stage_seconds': stages,
             'errors': {
                 'validation_errors': validation_errors,
                 'database_errors': db_errors
@@ -183,11 +233,16 @@ def process_file(file_path: str, model, processor: DataProcessor, single_row_pro
         }
 
 @shared_task
-def process_clients_file(file_path: str, single_row_processing=False, chunk_size=1000) -> dict:
+def process_clients_file(file_path: str, single_row_processing=False, chunk_size=1000, csv_engine='c') -> dict:
     processor = ClientProcessor()
-    return process_file(file_path, Client, processor, single_row_processing, chunk_size)
+    return process_file(file_path, Client, processor, single_row_processing, chunk_size, csv_engine)
 
 @shared_task
-def process_transactions_file(file_path: str, single_row_processing=False, chunk_size=1000) -> dict:
+def process_transactions_file(file_path: str, single_row_processing=False, chunk_size=1000, csv_engine='c') -> dict:
     processor = TransactionProcessor()
-    return process_file(file_path, Transaction, processor, single_row_processing, chunk_size)
\ No newline at end of file
+    return process_file(file_path, Transaction, processor, single_row_processing, chunk_size, csv_engine)
+
+@shared_task
+def compact_transaction_sketches() -> int:
+    """Fold the sketch rows written since the last compaction, e.g. by transactions created through the API."""
+    return TransactionSketch.compact()
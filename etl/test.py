@@ -1,10 +1,16 @@
 from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+import io
+import json
 import uuid
 import pandas as pd
 from decimal import Decimal
+from itertools import accumulate
 from unittest.mock import patch
-from core.models import Client, Transaction
+from core.models import Client, LedgerEntry, Transaction, TransactionLookup, TransactionDailyRollup, TransactionMonthlyRollup
 from core.models.etl_job import ETLJob
+from core import metrics, partitioning, versioning
 from core.models.transaction_statistics_view import TransactionStatistics
 from etl.tasks import process_clients_file, process_transactions_file
 import tempfile
@@ -96,6 +102,10 @@ class ETLProcessTest(TestCase):
         self.assertEqual(client.name, 'John Doe')
         self.assertEqual(client.account_balance, Decimal('1000.50'))
 
+        text = metrics.render()
+        for stage in ('load', 'validate', 'insert'):
+            self.assertIn(f'etl_stage_duration_seconds_count{{model="Client",stage="{stage}"}}', text)
+
     def test_transaction_xlsx_processing(self):
         """Test processing of transaction XLSX file"""
         Client.objects.create(
@@ -119,6 +129,50 @@ class ETLProcessTest(TestCase):
         self.assertEqual(sell_tx.transaction_type, 'SELL')
         self.assertEqual(sell_tx.amount, Decimal('-250.25'))
 
+    def test_transaction_processing_bumps_client_generation(self):
+        """Test that loading transactions invalidates the touched clients' cached responses"""
+        Client.objects.create(
+            client_id=self.client_1_id,
+            name='John Doe',
+            email='john.doe@example.com',
+            date_of_birth='1990-01-01',
+            account_balance=Decimal('1000.50')
+        )
+        generation = versioning.client_generation(self.client_1_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            process_transactions_file(self.transactions_file)
+
+        self.assertGreater(versioning.client_generation(self.client_1_id), generation)
+
+    def test_transaction_processing_updates_rollups(self):
+        """Test loaded transactions are added to the rollups and the client ledger, once"""
+        Client.objects.create(
+            client_id=self.client_1_id,
+            name='John Doe',
+            email='john.doe@example.com',
+            date_of_birth='1990-01-01',
+            account_balance=Decimal('1000.50')
+        )
+        process_transactions_file(self.transactions_file)
+        process_transactions_file(self.transactions_file)
+
+        daily = TransactionDailyRollup.objects.get(client_id=self.client_1_id, currency='EUR')
+        self.assertEqual(str(daily.day), '2024-01-02')
+        self.assertEqual(daily.transaction_count, 1)
+        self.assertEqual(daily.total_amount, Decimal('-250.25'))
+
+        monthly = TransactionMonthlyRollup.objects.get(client_id=self.client_1_id, currency='USD')
+        self.assertEqual(str(monthly.month), '2024-01-01')
+        self.assertEqual((monthly.transaction_type, monthly.transaction_count), ('BUY', 1))
+
+        ledger = LedgerEntry.objects.filter(client_id=self.client_1_id).order_by('transaction_date')
+        self.assertEqual(ledger.count(), Transaction.objects.filter(client_id=self.client_1_id).count())
+        self.assertEqual(
+            [entry.running_total for entry in ledger],
+            list(accumulate(entry.amount for entry in ledger))
+        )
+
     def test_transaction_without_client(self):
         """Test transaction processing without existing client"""
         result = process_transactions_file(self.transactions_file)
@@ -465,6 +519,134 @@ class ETLProcessTest(TestCase):
         # Verify only one transaction was created
         self.assertEqual(Transaction.objects.count(), 1)
 
+    def test_duplicate_transaction_id_across_partitions(self):
+        """Test that a transaction id is rejected when reused in another partition"""
+        Client.objects.create(
+            client_id=self.client_1_id,
+            name='John Doe',
+            email='john.doe@example.com',
+            date_of_birth='1990-01-01',
+            account_balance=Decimal('1000.50')
+        )
+
+        transaction_id = str(uuid.uuid4())
+        duplicate_transactions = [
+            {
+                'transaction_id': transaction_id,
+                'client_id': self.client_1_id,
+                'transaction_type': 'BUY',
+                'transaction_date': '2012-01-01 12:00:00',
+                'amount': '100.00',
+                'currency': 'USD'
+            },
+            {
+                'transaction_id': transaction_id,  # Same ID, different partition
+                'client_id': self.client_1_id,
+                'transaction_type': 'BUY',
+                'transaction_date': '2024-01-01 12:00:00',
+                'amount': '100.00',
+                'currency': 'USD'
+            }
+        ]
+
+        test_file = os.path.join(self.temp_dir, 'duplicate_partition_transactions.xlsx')
+        pd.DataFrame(duplicate_transactions).to_excel(test_file, index=False)
+
+        result = process_transactions_file(test_file, chunk_size=1)
+
+        self.assertEqual(result['processed_count'], 1)
+        self.assertEqual(result['failed_count'], 1)
+        self.assertEqual(Transaction.objects.count(), 1)
+        self.assertEqual(TransactionLookup.resolve(transaction_id), 2012)
+
+    def test_deleted_transactions_can_be_loaded_again(self):
+        """Test that deleting a transaction, directly or with its client, releases its id"""
+        process_clients_file(self.clients_file)
+        process_transactions_file(self.transactions_file)
+
+        Transaction.objects.get(transaction_id=self.transaction_1_id).delete()
+        self.assertIsNone(TransactionLookup.resolve(self.transaction_1_id))
+        result = process_transactions_file(self.transactions_file)
+        self.assertEqual(result['processed_count'], 1)
+        self.assertTrue(Transaction.objects.filter(transaction_id=self.transaction_1_id).exists())
+
+        Client.objects.filter(client_id=self.client_1_id).delete()
+        self.assertFalse(TransactionLookup.objects.exists())
+        process_clients_file(self.clients_file)
+        result = process_transactions_file(self.transactions_file)
+        self.assertEqual(result['processed_count'], 2)
+        self.assertEqual(Transaction.objects.count(), 2)
+
+    def test_transactions_land_in_partition_for_year_and_client(self):
+        """Test that loaded transactions are stored in the partition matching their year and client"""
+        Client.objects.create(
+            client_id=self.client_1_id,
+            name='John Doe',
+            email='john.doe@example.com',
+            date_of_birth='1990-01-01',
+            account_balance=Decimal('1000.50')
+        )
+
+        process_transactions_file(self.transactions_file)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT transaction_id, tableoid::regclass::text FROM core_transaction")
+            tables = dict(cursor.fetchall())
+
+        expected = partitioning.range_partition(2024)
+        modulus = partitioning.client_bucket_modulus()
+        if modulus:
+            bucket = partitioning.client_buckets([self.client_1_id], modulus)[self.client_1_id]
+            expected = partitioning.leaf_partition(expected, bucket)
+
+        self.assertEqual(tables[self.transaction_1_id], expected)
+        self.assertEqual(tables[self.transaction_2_id], expected)
+
+    def test_split_layout_routes_rows_to_client_leaves(self):
+        """Test that with client hash buckets each row is written straight into its leaf partition"""
+        if not partitioning.client_bucket_modulus():
+            # Runs inside the test transaction, so the split is rolled back with it.
+            with connection.cursor() as cursor:
+                for statement in partitioning.subpartition_sql(4):
+                    cursor.execute(statement)
+        partitioning.client_bucket_modulus.cache_clear()
+        self.addCleanup(partitioning.client_bucket_modulus.cache_clear)
+        modulus = partitioning.client_bucket_modulus()
+        self.assertGreater(modulus, 1)
+
+        client_ids = [str(uuid.uuid4()) for _ in range(8)]
+        Client.objects.bulk_create([
+            Client(client_id=client_id, name=f'Client {i}', email=f'client{i}@example.com',
+                   date_of_birth='1990-01-01', account_balance=Decimal('0'))
+            for i, client_id in enumerate(client_ids)
+        ])
+        records = [
+            {
+                'transaction_id': str(uuid.uuid4()),
+                'client_id': client_id,
+                'transaction_type': 'buy',
+                'transaction_date': pd.Timestamp(f'{year}-06-01', tz='UTC').to_pydatetime(),
+                'amount': Decimal('10.00'),
+                'currency': 'USD'
+            }
+            for client_id in client_ids
+            for year in (2005, 2012, 2024, 2035)
+        ]
+        Transaction.objects.bulk_create_in_partitions(records)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT transaction_id, tableoid::regclass::text FROM core_transaction")
+            tables = dict(cursor.fetchall())
+
+        buckets = partitioning.client_buckets(client_ids, modulus)
+        self.assertEqual(tables, {
+            record['transaction_id']: partitioning.leaf_partition(
+                partitioning.range_partition(record['transaction_date'].year), buckets[record['client_id']]
+            )
+            for record in records
+        })
+        self.assertGreater(len(set(buckets.values())), 1)
+
     def test_chunk_retry_with_invalid_amounts(self):
         """Test chunk retry behavior with invalid transaction amounts"""
         # Create client
@@ -548,4 +730,31 @@ class ETLProcessTest(TestCase):
         self.assertEqual(result['failed_count'], 500)     # Half should fail
 
         # Verify performance is within acceptable limits
-        self.assertLess(processing_time, 30.0)  # Adjust threshold as needed
\ No newline at end of file
+        self.assertLess(processing_time, 30.0)  # Adjust threshold as needed
+
+    def test_benchmark_etl_records_stages_and_cleans_up(self):
+        # In place: the test database cannot create a scratch one inside the test transaction.
+        results = os.path.join(self.temp_dir, 'results.jsonl')
+        options = {'rows': 200, 'clients': 20, 'dirty': 0.1, 'results': results, 'in_place': True,
+                   'stdout': io.StringIO()}
+        call_command('benchmark_etl', **options)
+        call_command('benchmark_etl', **options)
+
+        with open(results) as f:
+            runs = [json.loads(line) for line in f]
+        self.assertEqual(len(runs), 2)
+        transactions = runs[0]['files']['transactions']
+        self.assertEqual(transactions['rows'], 200)
+        self.assertEqual(transactions['processed'] + transactions['failed'], 200)
+        self.assertEqual(set(transactions['stages']),
+                         {'load', 'validate', 'insert', 'refresh_statistics', 'compact_sketches'})
+        self.assertEqual(transactions['stages']['insert']['rows'], transactions['processed'])
+        self.assertTrue(all(stage['rows_per_second'] for stage in transactions['stages'].values()))
+        self.assertGreater(transactions['peak_rss_mb'], 0)
+        self.assertIn('transactions/insert:', options['stdout'].getvalue())
+
+        self.assertEqual(Client.objects.count(), 0)
+        self.assertEqual(Transaction.objects.count(), 0)
+        self.assertEqual(TransactionLookup.objects.count(), 0)
+        self.assertEqual(LedgerEntry.objects.count(), 0)
+        self.assertEqual(ETLJob.objects.count(), 0)
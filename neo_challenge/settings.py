@@ -53,12 +53,16 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework.authtoken',
     'rest_framework',
     'drf_yasg'
 ]
 
 MIDDLEWARE = [
+    # Outermost, so that EXPLAIN re-runs happen after the request metrics are recorded.
+    'core.middleware.SlowQueryPlanMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,14 +80,8 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.JSONParser',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'core.throttle.CustomRateThrottle',
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'core.throttle.TokenBucketThrottle',
     ],
-    'DEFAULT_THROTTLE_RATES': {
-        'anon': '100/day',
-        'user': '1000/day',
-    }
 }
 
 ROOT_URLCONF = 'neo_challenge.urls'
@@ -121,6 +119,72 @@ DATABASES = {
     }
 }
 
+# Number of HASH(client_id) sub-partitions per yearly range of core_transaction,
+# applied by core migration 0008. 1 keeps plain range partitions.
+TRANSACTION_CLIENT_BUCKETS = int(os.getenv('TRANSACTION_CLIENT_BUCKETS', '1'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Shared through Redis so the API and the ETL workers see the same data
+# generations; falls back to the local-memory cache when Redis is not set.
+
+REDIS_HOST = os.getenv('REDIS_HOST')
+REDIS_PORT = os.getenv('REDIS_PORT', '6379')
+
+if REDIS_HOST:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/1',
+        }
+    }
+
+# Token buckets share the cache database, so clearing the cache resets them.
+THROTTLE_REDIS_URL = os.getenv('THROTTLE_REDIS_URL', f'redis://{REDIS_HOST}:{REDIS_PORT}/1' if REDIS_HOST else '')
+
+# Request and ETL histograms for /metrics; recording is skipped when empty.
+METRICS_REDIS_URL = os.getenv('METRICS_REDIS_URL', f'redis://{REDIS_HOST}:{REDIS_PORT}/1' if REDIS_HOST else '')
+
+# Database the tests that clear the cache use instead of the shared one (see
+# core.testing.isolated_cache); the local-memory cache is used when empty.
+TEST_REDIS_URL = os.getenv('TEST_REDIS_URL', f'redis://{REDIS_HOST}:{REDIS_PORT}/15' if REDIS_HOST else '')
+
+# Per tier rates, with per-endpoint overrides keyed by URL name (each gets
+# its own bucket; other endpoints share the default one).
+THROTTLE_RATES = {
+    'default': {'anon': '10/minute', 'user': '20/minute', 'staff': '120/minute'},
+    'transactions-batch': {'user': '5/minute', 'staff': '30/minute'},
+}
+
+# Daily quota per tier, one bucket per client shared by every endpoint, so
+# sustained use stays bounded whatever the per-minute rates allow.
+THROTTLE_DAILY_RATES = {'anon': '100/day', 'user': '1000/day', 'staff': '10000/day'}
+
+# Seconds a cached API response is kept; entries are invalidated earlier by
+# bumping the owning client's generation.
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '3600'))
+
+# Resolved API tokens: shared cache timeout, and timeout/size of each
+# process's local tier (how long a revoked token may live in other workers).
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', '300'))
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_LOCAL_CACHE_TIMEOUT', '10'))
+AUTH_TOKEN_LOCAL_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_LOCAL_CACHE_SIZE', '1024'))
+
+# Log records waiting for the writer thread, and what to do when the queue is
+# full: 'drop' (counted in /metrics) or 'block' until there is room.
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_QUEUE_POLICY = os.getenv('LOG_QUEUE_POLICY', 'drop')
+
+# Opt-in EXPLAIN capture: SELECTs slower than the threshold (0 disables) are
+# sampled at SLOW_QUERY_PLAN_SAMPLE_RATE and re-run under EXPLAIN ANALYZE, at
+# most once per SQL fingerprint every SLOW_QUERY_PLAN_INTERVAL seconds. Plans
+# older than SLOW_QUERY_PLAN_RETENTION_DAYS are deleted as new ones arrive.
+SLOW_QUERY_PLAN_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_PLAN_THRESHOLD_MS', '0'))
+SLOW_QUERY_PLAN_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_PLAN_SAMPLE_RATE', '0.1'))
+SLOW_QUERY_PLAN_INTERVAL = int(os.getenv('SLOW_QUERY_PLAN_INTERVAL', '300'))
+SLOW_QUERY_PLAN_RETENTION_DAYS = int(os.getenv('SLOW_QUERY_PLAN_RETENTION_DAYS', '14'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators